@@ -7,6 +7,7 @@ streamlit run app.py
 
 import streamlit as st
 import anthropic
+import copy
 import json
 import os
 import re
@@ -20,13 +21,43 @@ _rfp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rfp_system"
 if os.path.exists(_rfp_dir):
     sys.path.insert(0, _rfp_dir)
     try:
-        from rfp_engine import generate_rfp, template_exists
+        from rfp_engine import submit_rfp_job, get_rfp_job, template_source
+        from claude_client import get_client as claude_client
         RFP_AVAILABLE = True
     except ImportError:
         RFP_AVAILABLE = False
 else:
     RFP_AVAILABLE = False
 
+# ── TELEMETRY ──────────────────────────────────────────────────
+# Spans and counters from rfp_system/telemetry.py (export is configured by
+# RFP_METRICS_FILE / RFP_METRICS_PORT). Without rfp_system/ the app runs
+# uninstrumented.
+try:
+    from telemetry import span, record, count
+except ImportError:
+    from contextlib import nullcontext
+    def span(name, **labels): return nullcontext()
+    def record(name, seconds, error=None, **labels): pass
+    def count(name, value=1, **labels): pass
+
+RUN_STARTED = time.perf_counter()
+
+# ── VENDOR SYSTEM ──────────────────────────────────────────────
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor_system"))
+from scoring import ScoreMatrix, DEFAULT_CRITERIA
+from catalogue import VendorCatalogue
+from name_index import NameIndex
+from providers import CatalogueScoringProvider, evaluate
+from claude_scoring import ClaudeScoringProvider
+from ranking import Ranking, SHORTLIST
+from results import ScoredResults
+from session_store import SessionStore, new_session_id, valid_session_id
+from result_cache import ResultCache
+from screening import screen, DEFAULT_RESTRICTIONS
+from snapshots import SnapshotStore, SNAPSHOT_PATH
+from vendor_grid import vendor_grid, selection, selection_checkbox
+
 # ── PAGE CONFIG ────────────────────────────────────────────────
 st.set_page_config(
     page_title="VendorIQ — Healthcare",
@@ -35,291 +66,39 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ── CUSTOM CSS ─────────────────────────────────────────────────
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=DM+Serif+Display:ital@0;1&family=DM+Sans:wght@300;400;500;600&display=swap');
-
-/* ── Base ── */
-html, body, [class*="css"] {
-    font-family: 'DM Sans', sans-serif;
-}
-.stApp {
-    background: #f7f6f3;
-}
-
-/* ── Sidebar ── */
-section[data-testid="stSidebar"] {
-    background: #0f1923;
-    border-right: none;
-}
-section[data-testid="stSidebar"] * {
-    color: #e8e4d9 !important;
-}
-section[data-testid="stSidebar"] .stSlider label,
-section[data-testid="stSidebar"] .stSelectbox label {
-    color: #a09880 !important;
-    font-size: 0.78rem !important;
-    text-transform: uppercase;
-    letter-spacing: 0.08em;
-}
-section[data-testid="stSidebar"] hr {
-    border-color: #2a3540 !important;
-}
-
-/* ── Header ── */
-.vendoriq-header {
-    background: #0f1923;
-    color: #f0ebe0;
-    padding: 2.5rem 3rem;
-    border-radius: 16px;
-    margin-bottom: 2rem;
-    position: relative;
-    overflow: hidden;
-}
-.vendoriq-header::before {
-    content: '';
-    position: absolute;
-    top: -60px; right: -60px;
-    width: 240px; height: 240px;
-    background: radial-gradient(circle, #2dd4a820 0%, transparent 70%);
-    border-radius: 50%;
-}
-.vendoriq-header h1 {
-    font-family: 'DM Serif Display', serif;
-    font-size: 2.6rem;
-    margin: 0;
-    letter-spacing: -0.02em;
-    color: #f0ebe0;
-}
-.vendoriq-header p {
-    color: #8a9ba8;
-    margin: 0.4rem 0 0;
-    font-size: 1rem;
-    font-weight: 300;
-}
-.vendoriq-badge {
-    display: inline-block;
-    background: #2dd4a815;
-    border: 1px solid #2dd4a840;
-    color: #2dd4a8;
-    padding: 0.2rem 0.75rem;
-    border-radius: 20px;
-    font-size: 0.72rem;
-    font-weight: 600;
-    letter-spacing: 0.1em;
-    text-transform: uppercase;
-    margin-bottom: 1rem;
-}
-
-/* ── Step cards ── */
-.step-card {
-    background: white;
-    border: 1px solid #e8e4da;
-    border-radius: 12px;
-    padding: 1.6rem 2rem;
-    margin-bottom: 1.2rem;
-    box-shadow: 0 1px 4px rgba(0,0,0,0.04);
-}
-.step-card h3 {
-    font-family: 'DM Serif Display', serif;
-    font-size: 1.25rem;
-    color: #1a2330;
-    margin: 0 0 0.3rem;
-}
-.step-card p {
-    color: #6b7a87;
-    font-size: 0.88rem;
-    margin: 0;
-}
-
-/* ── Vendor cards ── */
-.vendor-card {
-    background: white;
-    border: 1px solid #e8e4da;
-    border-left: 4px solid #2dd4a8;
-    border-radius: 10px;
-    padding: 1.2rem 1.5rem;
-    margin-bottom: 0.8rem;
-}
-.vendor-rank {
-    font-family: 'DM Serif Display', serif;
-    font-size: 2rem;
-    color: #e8e4da;
-    float: right;
-    line-height: 1;
-}
-.vendor-name {
-    font-weight: 600;
-    font-size: 1.05rem;
-    color: #1a2330;
-}
-.vendor-score {
-    font-size: 0.85rem;
-    color: #2dd4a8;
-    font-weight: 600;
-}
-.vendor-note {
-    font-size: 0.82rem;
-    color: #8a9ba8;
-    margin-top: 0.3rem;
-}
-
-/* ── Score bar ── */
-.score-bar-wrap {
-    background: #f0ebe0;
-    border-radius: 4px;
-    height: 6px;
-    margin-top: 0.6rem;
-    overflow: hidden;
-}
-.score-bar-fill {
-    height: 6px;
-    border-radius: 4px;
-    background: linear-gradient(90deg, #2dd4a8, #0fa8c8);
-    transition: width 0.8s ease;
-}
-
-/* ── Status pills ── */
-.pill {
-    display: inline-block;
-    padding: 0.2rem 0.8rem;
-    border-radius: 20px;
-    font-size: 0.75rem;
-    font-weight: 600;
-    letter-spacing: 0.05em;
-}
-.pill-green  { background:#dcfce7; color:#166534; }
-.pill-amber  { background:#fef9c3; color:#854d0e; }
-.pill-blue   { background:#dbeafe; color:#1e40af; }
-.pill-slate  { background:#f1f5f9; color:#475569; }
-
-/* ── Metric tiles ── */
-.metric-tile {
-    background: white;
-    border: 1px solid #e8e4da;
-    border-radius: 12px;
-    padding: 1.2rem;
-    text-align: center;
-}
-.metric-tile .val {
-    font-family: 'DM Serif Display', serif;
-    font-size: 2.2rem;
-    color: #1a2330;
-    line-height: 1;
-}
-.metric-tile .lbl {
-    font-size: 0.78rem;
-    color: #8a9ba8;
-    text-transform: uppercase;
-    letter-spacing: 0.08em;
-    margin-top: 0.3rem;
-}
-
-/* ── Buttons ── */
-.stButton > button {
-    background: #0f1923;
-    color: #f0ebe0;
-    border: none;
-    border-radius: 8px;
-    font-family: 'DM Sans', sans-serif;
-    font-weight: 500;
-    padding: 0.55rem 1.5rem;
-    cursor: pointer;
-    transition: background 0.2s;
-}
-.stButton > button:hover {
-    background: #1e3040;
-    color: #f0ebe0;
-}
-
-/* ── Checkpoint banner ── */
-.checkpoint-banner {
-    background: linear-gradient(135deg, #0f1923, #1e3040);
-    border: 1px solid #2a3f50;
-    border-radius: 12px;
-    padding: 1.5rem 2rem;
-    margin: 1.5rem 0;
-    color: #f0ebe0;
-}
-.checkpoint-banner h4 {
-    font-family: 'DM Serif Display', serif;
-    font-size: 1.2rem;
-    margin: 0 0 0.4rem;
-    color: #2dd4a8;
-}
-.checkpoint-banner p {
-    margin: 0;
-    color: #8a9ba8;
-    font-size: 0.88rem;
-}
-
-/* ── Log box ── */
-.log-box {
-    background: #0f1923;
-    color: #7dd3b8;
-    font-family: 'Courier New', monospace;
-    font-size: 0.8rem;
-    border-radius: 8px;
-    padding: 1rem 1.2rem;
-    height: 180px;
-    overflow-y: auto;
-    line-height: 1.7;
-}
-
-/* ── Dividers ── */
-.section-label {
-    font-size: 0.72rem;
-    font-weight: 600;
-    letter-spacing: 0.12em;
-    text-transform: uppercase;
-    color: #8a9ba8;
-    margin: 1.8rem 0 0.8rem;
-}
-
-/* ── Restriction tag ── */
-.restriction-tag {
-    display: inline-block;
-    background: #fff7ed;
-    border: 1px solid #fed7aa;
-    color: #9a3412;
-    border-radius: 6px;
-    padding: 0.2rem 0.65rem;
-    font-size: 0.76rem;
-    margin: 0.2rem 0.2rem 0.2rem 0;
-}
-
-/* ── Hide streamlit chrome ── */
-#MainMenu, footer, header { visibility: hidden; }
-.block-container { padding-top: 2rem; }
-</style>
-""", unsafe_allow_html=True)
+# ── THEME ──────────────────────────────────────────────────────
+# static/vendoriq.css is served by Streamlit's static file server
+# (enableStaticServing in .streamlit/config.toml), so each rerun sends a
+# <link> tag instead of the whole stylesheet.
+_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+_THEME_CSS  = os.path.join(_STATIC_DIR, "vendoriq.css")
+
+@st.cache_resource
+def theme_tag(mtime):
+    """<link> to the stylesheet, or the inlined CSS when static serving is off."""
+    if st.get_option("server.enableStaticServing"):
+        return f'<link rel="stylesheet" href="app/static/vendoriq.css?v={int(mtime)}">'
+    with open(_THEME_CSS, "r") as f:
+        return f"<style>{f.read()}</style>"
+
+st.markdown(theme_tag(os.path.getmtime(_THEME_CSS)), unsafe_allow_html=True)
 
 # ── SESSION STATE ──────────────────────────────────────────────
 def init_state():
     defaults = {
         "step": 1,
-        "criteria": {
-            "HIPAA Compliance":     {"weight": 25, "desc": "Full HIPAA/HITECH compliance, BAA availability"},
-            "Data Security":        {"weight": 20, "desc": "Encryption, access controls, SOC2/ISO 27001"},
-            "EHR Integration":      {"weight": 15, "desc": "Epic, Cerner, Allscripts, HL7 FHIR"},
-            "Pricing & TCO":        {"weight": 15, "desc": "Transparent pricing, ROI potential"},
-            "Customer Support":     {"weight": 10, "desc": "24/7 healthcare-specific SLA"},
-            "Scalability":          {"weight": 10, "desc": "Growth & enterprise readiness"},
-            "Implementation Time":  {"weight": 5,  "desc": "Time to go-live & onboarding"},
-        },
-        "restrictions": [
-            "Must be HIPAA compliant with signed BAA",
-            "Must have 3+ years healthcare experience",
-            "Must support HL7 FHIR standards",
-            "No vendors under active FDA warning letters",
-        ],
+        "criteria": copy.deepcopy(DEFAULT_CRITERIA),
+        "restrictions": list(DEFAULT_RESTRICTIONS),
         "category": "",
         "org_name": "",
         "discovered": [],
         "approved_vendors": [],
         "scored": [],
+        "ranking": None,
         "excluded": [],
+        "strict_screening": False,
+        "screening": {"unverified": {}, "unparsed": []},
+        "notes": {},
         "final_report": None,
         "log": [],
         "running": False,
@@ -327,6 +106,66 @@ def init_state():
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
+    if "session_id" not in st.session_state:
+        session_id = st.query_params.get("session")
+        if not (session_id and resume_session(session_id)):
+            st.session_state.session_id = new_session_id()
+            st.query_params["session"] = st.session_state.session_id
+
+# Workflow state snapshotted server-side; widget state is rebuilt from it
+SESSION_KEYS = [
+    "step", "criteria", "restrictions", "category", "org_name",
+    "discovered", "approved_vendors", "scored", "ranking", "excluded",
+    "notes", "final_report", "log", "longlist_selection", "keep_selection",
+    "strict_screening", "screening",
+]
+
+@st.cache_resource
+def load_session_store():
+    store = SessionStore()
+    store.prune()
+    return store
+
+SESSION_STORE = load_session_store()
+
+def save_session():
+    """Snapshot the workflow; only keys whose content changed are written."""
+    with span("session_save"):
+        written = SESSION_STORE.save(st.session_state.session_id, st.session_state, SESSION_KEYS)
+    count("session_keys_written_total", written)
+
+def record_step():
+    """Time this script run as a workflow_step span — at the end of the script, or before a step change reruns it."""
+    global RUN_STARTED
+    if RUN_STARTED is not None:
+        record("workflow_step", time.perf_counter() - RUN_STARTED, step=st.session_state.get("step", 1))
+        RUN_STARTED = None
+
+def resume_session(session_id):
+    """Replace the current state with a stored session. False if there is none."""
+    state = SESSION_STORE.load(session_id) if valid_session_id(session_id) else None
+    if state is None:
+        return False
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    for key, value in state.items():
+        st.session_state[key] = value
+    st.session_state.session_id = session_id
+    st.query_params["session"]  = session_id
+    return True
+
+def reset_session():
+    record_step()
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    st.query_params.clear()
+    st.rerun()
+
+def goto_step(step):
+    record_step()
+    st.session_state.step = step
+    save_session()
+    st.rerun()
 
 init_state()
 
@@ -343,97 +182,115 @@ def score_color(score):
     if score >= 60: return "#f59e0b"
     return "#ef4444"
 
-# ── SIMULATED VENDOR DATA ─────────────────────────────────────
-VENDOR_DB = {
-    "EHR / Electronic Health Records": [
-        {"name": "Epic Systems",         "desc": "Market leader in EHR for large health systems"},
-        {"name": "Oracle Health (Cerner)","desc": "Enterprise EHR with strong analytics"},
-        {"name": "Meditech",             "desc": "EHR for community & critical access hospitals"},
-        {"name": "athenahealth",         "desc": "Cloud-native EHR & revenue cycle"},
-        {"name": "eClinicalWorks",       "desc": "Ambulatory EHR & population health"},
-        {"name": "Allscripts",           "desc": "EHR and practice management platform"},
-        {"name": "NextGen Healthcare",   "desc": "Specialty-focused EHR & PM"},
-        {"name": "DrChrono",             "desc": "Mobile-first EHR for independent practices"},
-        {"name": "Kareo",                "desc": "Cloud EHR for small practices"},
-        {"name": "AdvancedMD",           "desc": "Integrated EHR, billing & telemedicine"},
-    ],
-    "Medical Billing & Revenue Cycle": [
-        {"name": "Waystar",              "desc": "End-to-end revenue cycle automation"},
-        {"name": "Experian Health",      "desc": "Patient access & revenue cycle"},
-        {"name": "Change Healthcare",    "desc": "Clearinghouse & RCM solutions"},
-        {"name": "Availity",             "desc": "Real-time insurance eligibility & claims"},
-        {"name": "nThrive",              "desc": "Revenue cycle management & analytics"},
-        {"name": "Optum360",             "desc": "Coding, billing & AR management"},
-        {"name": "R1 RCM",               "desc": "Tech-enabled RCM for health systems"},
-        {"name": "Ensemble Health",      "desc": "Outsourced RCM services"},
-        {"name": "MedAssets",            "desc": "Supply chain & revenue cycle"},
-        {"name": "MedBridge",            "desc": "Billing for rehabilitation practices"},
-    ],
-    "Telemedicine / Virtual Care Platform": [
-        {"name": "Teladoc Health",       "desc": "Global telehealth & virtual primary care"},
-        {"name": "Amwell",               "desc": "Enterprise telehealth platform"},
-        {"name": "Doxy.me",              "desc": "HIPAA-compliant video visits"},
-        {"name": "Zoom for Healthcare",  "desc": "HIPAA-enabled video for care teams"},
-        {"name": "MDLive",               "desc": "On-demand telehealth services"},
-        {"name": "Spruce Health",        "desc": "Patient communication & telehealth"},
-        {"name": "Mend",                 "desc": "Telehealth with AI-driven scheduling"},
-        {"name": "Klara",                "desc": "Patient messaging & virtual care"},
-        {"name": "Updox",                "desc": "Healthcare communication platform"},
-        {"name": "SimplePractice",       "desc": "Telehealth for mental & behavioral health"},
-    ],
-    "Healthcare Analytics & AI": [
-        {"name": "Health Catalyst",      "desc": "Data & analytics platform for health systems"},
-        {"name": "Innovaccer",           "desc": "Unified health data platform & AI"},
-        {"name": "IBM Watson Health",    "desc": "AI-driven clinical & operational analytics"},
-        {"name": "Optum Analytics",      "desc": "Population health & claims analytics"},
-        {"name": "Arcadia",              "desc": "Population health management platform"},
-        {"name": "Dimensional Insight",  "desc": "Healthcare BI & data analytics"},
-        {"name": "Philips HealthSuite",  "desc": "Connected care & analytics cloud"},
-        {"name": "Nuvolo",               "desc": "Connected workplace for healthcare ops"},
-        {"name": "Apixio",               "desc": "AI-powered clinical insights from data"},
-        {"name": "Jvion",                "desc": "AI clinical success machine"},
-    ],
-    "Medical Device Software": [
-        {"name": "Greenway Health",      "desc": "EHR with device integration"},
-        {"name": "Imprivata",            "desc": "Identity & access for medical devices"},
-        {"name": "Medidata",             "desc": "Clinical trial & device data platform"},
-        {"name": "MedaSystems",          "desc": "Medical device lifecycle management"},
-        {"name": "Axway",                "desc": "Healthcare data exchange & APIs"},
-        {"name": "Stryker Software",     "desc": "Connected OR & device analytics"},
-        {"name": "GE Healthcare Digital","desc": "Imaging & device data platform"},
-        {"name": "Philips IntelliSpace", "desc": "Radiology & device analytics"},
-        {"name": "Siemens Healthineers", "desc": "Digital health & device software"},
-        {"name": "Capsule Technologies", "desc": "Medical device integration engine"},
-    ],
-}
-
-VENDOR_SCORES_DB = {
-    "Epic Systems":          {"HIPAA Compliance":9,"Data Security":9,"EHR Integration":10,"Pricing & TCO":5,"Customer Support":8,"Scalability":10,"Implementation Time":4},
-    "Oracle Health (Cerner)":{"HIPAA Compliance":9,"Data Security":8,"EHR Integration":9,"Pricing & TCO":5,"Customer Support":7,"Scalability":9,"Implementation Time":5},
-    "Meditech":              {"HIPAA Compliance":9,"Data Security":8,"EHR Integration":8,"Pricing & TCO":7,"Customer Support":8,"Scalability":7,"Implementation Time":6},
-    "athenahealth":          {"HIPAA Compliance":9,"Data Security":8,"EHR Integration":8,"Pricing & TCO":7,"Customer Support":8,"Scalability":8,"Implementation Time":7},
-    "eClinicalWorks":        {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":8,"Pricing & TCO":8,"Customer Support":7,"Scalability":7,"Implementation Time":8},
-    "Allscripts":            {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":8,"Pricing & TCO":7,"Customer Support":6,"Scalability":7,"Implementation Time":7},
-    "NextGen Healthcare":    {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":7,"Pricing & TCO":7,"Customer Support":7,"Scalability":6,"Implementation Time":7},
-    "DrChrono":              {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":6,"Pricing & TCO":8,"Customer Support":7,"Scalability":5,"Implementation Time":9},
-    "Kareo":                 {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":6,"Pricing & TCO":9,"Customer Support":7,"Scalability":5,"Implementation Time":9},
-    "AdvancedMD":            {"HIPAA Compliance":8,"Data Security":7,"EHR Integration":7,"Pricing & TCO":7,"Customer Support":7,"Scalability":6,"Implementation Time":8},
-    "default":               {"HIPAA Compliance":7,"Data Security":7,"EHR Integration":6,"Pricing & TCO":7,"Customer Support":7,"Scalability":6,"Implementation Time":7},
-}
-
-def get_scores(vendor_name):
-    return VENDOR_SCORES_DB.get(vendor_name, VENDOR_SCORES_DB["default"])
-
-def compute_weighted_score(vendor_name, scores):
-    total = 0
-    breakdown = {}
-    for crit, info in st.session_state.criteria.items():
-        raw = scores.get(crit, 5)
-        w   = info["weight"]
-        ws  = (raw / 10) * w
-        total += ws
-        breakdown[crit] = {"raw": raw, "weight": w, "weighted": round(ws, 2)}
-    return round(total, 1), breakdown
+@st.fragment(run_every=1.0)
+def rfp_job_progress(job_id, has_template):
+    """Poll a background RFP job without rerunning the page; rerun it once the job ends."""
+    job = get_rfp_job(job_id)
+    if job is None or job["status"] in ("done", "failed"):
+        st.rerun()
+    if job["status"] == "queued":
+        label = "Waiting for a free RFP worker..."
+    elif has_template:
+        label = f"Building RFP document for {job['category']}..."
+    else:
+        label = f"Asking Claude to generate RFP questions for {job['category']}..."
+    with st.status(label, expanded=not has_template):
+        for sec in job["sections"]:
+            st.write(f"✓ **{sec.get('number', '')}** {sec.get('title', '')} "
+                     f"— {len(sec.get('questions', []))} questions")
+
+# ── VENDOR CATALOGUE ──────────────────────────────────────────
+@st.cache_resource
+def load_catalogue():
+    """One SQLite-backed catalogue per process, seeded from vendor_system/catalogue_seed.json."""
+    return VendorCatalogue()
+
+@st.cache_resource
+def load_name_index(catalogue_version):
+    """Trigram index over catalogue vendor names, rebuilt when the catalogue changes."""
+    return NameIndex(CATALOGUE.names())
+
+@st.cache_resource
+def load_result_cache():
+    """Discovery and score results shared by every session in this process."""
+    return ResultCache()
+
+@st.cache_resource
+def load_snapshots(mtime):
+    """Precomputed rankings (vendor_system/snapshots.py), reloaded when the file is rebuilt."""
+    return SnapshotStore.load(SNAPSHOT_PATH)
+
+CATALOGUE    = load_catalogue()
+NAME_INDEX   = load_name_index(CATALOGUE.version)
+RESULT_CACHE = load_result_cache()
+RESULT_CACHE.sync(CATALOGUE.version)
+SNAPSHOTS    = load_snapshots(os.path.getmtime(SNAPSHOT_PATH) if os.path.exists(SNAPSHOT_PATH) else 0)
+
+# VENDOR_SCORING_PROVIDER=claude scores with Claude, several vendors per request
+# (see vendor_system/claude_scoring.py); by default scores come from the catalogue.
+SCORING_BACKEND = os.environ.get("VENDOR_SCORING_PROVIDER", "catalogue").lower()
+
+def catalogue_description(vendor_name):
+    entry = CATALOGUE.lookup(vendor_name)
+    return entry["desc"] if entry else ""
+
+if SCORING_BACKEND == "claude":
+    SCORING_PROVIDER = ClaudeScoringProvider(st.session_state.restrictions, describe=catalogue_description,
+                                             client=claude_client() if RFP_AVAILABLE else None)
+else:
+    SCORING_PROVIDER = CatalogueScoringProvider(CATALOGUE, NAME_INDEX)
+
+def screen_longlist(vendor_names):
+    """
+    Apply the hard restrictions to catalogue attributes before scoring. Sets
+    st.session_state.excluded to [{"name", "reasons"}] and returns the vendors
+    that passed.
+    """
+    with span("screening"):
+        result = screen(vendor_names, CATALOGUE.attributes(vendor_names),
+                        st.session_state.restrictions, strict=st.session_state.strict_screening)
+    st.session_state.excluded  = result.excluded_records()
+    st.session_state.screening = {"unverified": result.unverified, "unparsed": result.unparsed}
+    count("screened_vendors_total", len(result.passed), result="passed")
+    count("screened_vendors_total", len(result.excluded), result="excluded")
+    for name, reasons in result.excluded.items():
+        log(f"Excluded {name}: {'; '.join(reasons)}")
+    if result.unparsed:
+        log(f"{len(result.unparsed)} restriction(s) need manual review: {'; '.join(result.unparsed)}")
+    return result.passed
+
+def snapshot_scores(vendor_names):
+    """Raw scores from a precomputed snapshot matching this session's configuration, or None."""
+    snapshot = SNAPSHOTS.find(st.session_state.category, st.session_state.criteria,
+                              st.session_state.restrictions, st.session_state.strict_screening,
+                              SCORING_PROVIDER.fingerprint or SCORING_PROVIDER.name, CATALOGUE.fingerprint)
+    return snapshot.scores_for(vendor_names) if snapshot else None
+
+def time_get_scores(vendor_names, seconds, error):
+    """evaluate() timing hook — one get_scores span per provider call, from the worker thread."""
+    record("get_scores", seconds, error=type(error).__name__ if error else None,
+           provider=SCORING_PROVIDER.name, batched=str(len(vendor_names) > 1).lower())
+
+def score_vendors(vendor_names, raw_scores):
+    """
+    Load raw scores into a ScoreMatrix and rank every vendor in one pass.
+    Returns the shortlist; the rest of the order is read lazily from the ranking.
+    """
+    matrix = ScoreMatrix(st.session_state.criteria)
+    for name in vendor_names:
+        matrix.add(name, raw_scores[name])
+    st.session_state.ranking = Ranking(matrix, st.session_state.criteria, SHORTLIST)
+    return ScoredResults.from_ranking(st.session_state.ranking, SHORTLIST)
+
+def sync_ranking():
+    """Re-rank in place when sidebar weights have moved since the last rerun."""
+    ranking = st.session_state.ranking
+    if ranking is None or not st.session_state.scored:
+        return
+    changed = ranking.update(st.session_state.criteria)
+    if changed:
+        st.session_state.scored = ScoredResults.from_ranking(ranking, SHORTLIST)
+        log(f"Re-ranked for new weights: {', '.join(changed)}")
 
 # ── SIDEBAR ───────────────────────────────────────────────────
 with st.sidebar:
@@ -449,10 +306,12 @@ with st.sidebar:
     # Progress
     steps = ["Configure", "Discover", "Review", "Score", "Rank", "Report"]
     current = st.session_state.step
+    step_html = []
     for i, s in enumerate(steps, 1):
         icon  = "✓" if i < current else ("▶" if i == current else "○")
         color = "#2dd4a8" if i < current else ("#f0ebe0" if i == current else "#2a3540")
-        st.markdown(f"<div style='color:{color}; font-size:0.82rem; padding:0.3rem 0;'>{icon} {i}. {s}</div>", unsafe_allow_html=True)
+        step_html.append(f"<div style='color:{color}; font-size:0.82rem; padding:0.3rem 0;'>{icon} {i}. {s}</div>")
+    st.markdown("".join(step_html), unsafe_allow_html=True)
 
     st.markdown("---")
     st.markdown("<div style='font-size:0.72rem; color:#4a6070; text-transform:uppercase; letter-spacing:0.1em; margin-bottom:0.8rem;'>Criteria Weights</div>", unsafe_allow_html=True)
@@ -472,9 +331,16 @@ with st.sidebar:
 
     st.markdown("---")
     if st.button("🔄 Reset All", use_container_width=True):
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
-        st.rerun()
+        reset_session()
+
+    with st.expander("Resume a saved session"):
+        st.markdown(f"<div style='font-size:0.75rem; color:#8a9ba8;'>This session: <code>{st.session_state.session_id}</code></div>", unsafe_allow_html=True)
+        resume_id = st.text_input("Session ID", key="resume_id", placeholder="Session ID", label_visibility="collapsed")
+        if st.button("Resume", use_container_width=True):
+            if resume_session(resume_id.strip()):
+                log(f"Resumed session {st.session_state.session_id}")
+                st.rerun()
+            st.error("No saved session with that ID.")
 
 # ── MAIN CONTENT ──────────────────────────────────────────────
 
@@ -498,7 +364,7 @@ if st.session_state.step == 1:
     with col1:
         st.markdown('<div class="step-card"><h3>Organisation Details</h3><p>Tell us about your organisation so we can tailor results.</p></div>', unsafe_allow_html=True)
         org = st.text_input("Organisation name", placeholder="e.g. St. Mary's Hospital Network")
-        category = st.selectbox("Vendor category you need", list(VENDOR_DB.keys()))
+        category = st.selectbox("Vendor category you need", CATALOGUE.categories())
 
         st.markdown('<div class="section-label">Hard Restrictions</div>', unsafe_allow_html=True)
         st.markdown("Vendors failing any restriction are automatically excluded.")
@@ -508,6 +374,17 @@ if st.session_state.step == 1:
             height=120,
             label_visibility="collapsed"
         )
+        strict = st.checkbox("Also exclude vendors whose compliance data is unknown",
+                             value=st.session_state.strict_screening,
+                             help="By default a vendor is only excluded when the catalogue shows it fails a restriction.")
+        preview_names = [v["name"] for v in CATALOGUE.vendors(category)] if category else []
+        preview = screen(preview_names, CATALOGUE.attributes(preview_names),
+                         restrictions_text.split("\n"), strict=strict)
+        if preview_names and not preview.passed:
+            lenient = strict and screen(preview_names, CATALOGUE.attributes(preview_names),
+                                        restrictions_text.split("\n")).passed
+            st.warning(f"⚠️ These restrictions exclude all {len(preview_names)} catalogue vendors in this category"
+                       + (f" — {len(lenient)} pass without strict screening." if lenient else "."))
 
     with col2:
         st.markdown('<div class="step-card"><h3>Scoring Criteria</h3><p>Adjust weights in the sidebar. They must total 100%.</p></div>', unsafe_allow_html=True)
@@ -539,9 +416,9 @@ if st.session_state.step == 1:
         st.session_state.org_name = org.strip()
         st.session_state.category = category
         st.session_state.restrictions = [r.strip() for r in restrictions_text.strip().split("\n") if r.strip()]
-        st.session_state.step = 2
+        st.session_state.strict_screening = strict
         log(f"Session started for {org} — Category: {category}")
-        st.rerun()
+        goto_step(2)
 
 # ════════════════════════════════════════
 # STEP 2 — DISCOVER
@@ -558,8 +435,8 @@ elif st.session_state.step == 2:
 
     if not st.session_state.discovered:
         with st.spinner("Discovering vendors..."):
-            time.sleep(1.5)  # simulate API call
-            vendors = VENDOR_DB.get(st.session_state.category, [])
+            with span("discovery"):
+                vendors = RESULT_CACHE.discover(st.session_state.category, CATALOGUE.vendors)
             st.session_state.discovered = vendors
             log(f"Discovered {len(vendors)} vendors in {st.session_state.category}")
 
@@ -573,15 +450,19 @@ elif st.session_state.step == 2:
         st.markdown(f'<div class="metric-tile"><div class="val">{len(st.session_state.criteria)}</div><div class="lbl">Scoring Criteria</div></div>', unsafe_allow_html=True)
 
     st.markdown('<div class="section-label">Vendors Discovered</div>', unsafe_allow_html=True)
-    cols = st.columns(2)
-    for i, v in enumerate(vendors):
-        with cols[i % 2]:
-            st.markdown(f"""
-            <div class="vendor-card" style='border-left-color: #94a3b8;'>
-                <div class="vendor-name">{v['name']}</div>
-                <div class="vendor-note">{v['desc']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+
+    def render_discovered(rows, start):
+        cols = st.columns(2)
+        for c, col in enumerate(cols):
+            with col:
+                st.markdown("".join(
+                    f"<div class='vendor-card' style='border-left-color: #94a3b8;'>"
+                    f"<div class='vendor-name'>{v['name']}</div>"
+                    f"<div class='vendor-note'>{v['desc']}</div></div>"
+                    for v in rows[c::2]), unsafe_allow_html=True)
+
+    vendor_grid("discovered", vendors, render_discovered,
+                sorts={"Discovery order": None, "Name A–Z": lambda v: v["name"].casefold()})
 
     st.markdown('<div class="section-label">Add a Vendor Manually</div>', unsafe_allow_html=True)
     c1, c2 = st.columns([3, 1])
@@ -593,18 +474,31 @@ elif st.session_state.step == 2:
             log(f"Manually added vendor: {manual_vendor.strip()}")
             st.rerun()
 
+    if manual_vendor.strip():
+        listed      = {v["name"] for v in st.session_state.discovered}
+        suggestions = [name for name, _ in NAME_INDEX.search(manual_vendor) if name not in listed]
+        if suggestions:
+            st.markdown("<div style='font-size:0.8rem; color:#6b7a87; margin:0.3rem 0;'>Matching catalogue vendors:</div>", unsafe_allow_html=True)
+            for col, name in zip(st.columns(len(suggestions)), suggestions):
+                with col:
+                    if st.button(name, key=f"suggest_{name}"):
+                        entry = CATALOGUE.lookup(name)
+                        st.session_state.discovered.append({"name": entry["name"], "desc": entry["desc"] or "Manually added"})
+                        log(f"Manually added vendor: {entry['name']} (matched \"{manual_vendor.strip()}\")")
+                        st.rerun()
+
     st.markdown("---")
     col_a, col_b = st.columns([1, 1])
     with col_a:
         if st.button("← Back"):
-            st.session_state.step = 1
-            st.rerun()
+            goto_step(1)
     with col_b:
         if st.button("Review Vendor Longlist →"):
-            st.session_state.approved_vendors = [v["name"] for v in st.session_state.discovered]
-            st.session_state.step = 3
-            log("Moved to vendor review checkpoint")
-            st.rerun()
+            passed = screen_longlist([v["name"] for v in st.session_state.discovered])
+            st.session_state.approved_vendors = passed
+            log(f"Moved to vendor review checkpoint — {len(passed)} passed screening, "
+                f"{len(st.session_state.excluded)} excluded")
+            goto_step(3)
 
 # ════════════════════════════════════════
 # STEP 3 — HUMAN CHECKPOINT: REVIEW LONGLIST
@@ -625,30 +519,55 @@ elif st.session_state.step == 3:
 
     st.markdown('<div class="section-label">Select Vendors to Evaluate</div>', unsafe_allow_html=True)
 
-    approved = []
-    cols = st.columns(2)
-    for i, v in enumerate(st.session_state.discovered):
-        name = v["name"] if isinstance(v, dict) else v
-        desc = v.get("desc", "") if isinstance(v, dict) else ""
-        with cols[i % 2]:
-            checked = st.checkbox(f"**{name}**  \n{desc}", value=True, key=f"chk_{name}")
-            if checked:
-                approved.append(name)
-
-    st.markdown(f"<div style='font-size:0.85rem; color:#6b7a87; margin-top:1rem;'>✓ {len(approved)} vendors selected for evaluation</div>", unsafe_allow_html=True)
+    excluded = {e["name"] for e in st.session_state.excluded}
+    longlist = [v if isinstance(v, dict) else {"name": v, "desc": ""} for v in st.session_state.discovered]
+    longlist = [v for v in longlist if v["name"] not in excluded]
+    names    = [v["name"] for v in longlist]
+    chosen   = selection("longlist")
+    if excluded and not longlist:
+        st.warning("⚠️ Every vendor was excluded by the restrictions"
+                   + (" (strict screening counts unknown data as a failure)" if st.session_state.strict_screening else "")
+                   + ". Go back to adjust them, or add vendors manually in step 2.")
+
+    def render_longlist(rows, start):
+        st.markdown(f"<div style='font-size:0.85rem; color:#6b7a87; margin-bottom:0.5rem;'>✓ {chosen.count(names)} of {len(names)} vendors selected for evaluation</div>", unsafe_allow_html=True)
+        cols = st.columns(2)
+        for i, v in enumerate(rows):
+            with cols[i % 2]:
+                selection_checkbox(chosen, v["name"], f"**{v['name']}**  \n{v.get('desc', '')}", key="longlist")
+
+    vendor_grid("longlist", longlist, render_longlist,
+                sorts={"Discovery order": None, "Name A–Z": lambda v: v["name"].casefold()})
+
+    screening = st.session_state.screening
+    if st.session_state.excluded:
+        with st.expander(f"🚫 Excluded by restrictions ({len(st.session_state.excluded)})"):
+            st.markdown("".join(
+                f"<div class='vendor-card' style='border-left-color: #ef4444;'>"
+                f"<div class='vendor-name'>{e['name']}</div>"
+                f"<div class='vendor-note'>{' · '.join(e['reasons'])}</div></div>"
+                for e in st.session_state.excluded), unsafe_allow_html=True)
+    if screening["unverified"]:
+        st.caption(f"{len(screening['unverified'])} selected vendor(s) have no catalogue data for some "
+                   f"restrictions and were kept — check them before scoring.")
+    if screening["unparsed"]:
+        st.info("These restrictions could not be checked automatically — review vendors against them by hand: "
+                + "; ".join(screening["unparsed"]))
     st.markdown("---")
 
     col_a, col_b = st.columns([1, 1])
     with col_a:
         if st.button("← Back"):
-            st.session_state.step = 2
-            st.rerun()
+            goto_step(2)
     with col_b:
-        if st.button(f"Score {len(approved)} Vendors →", disabled=len(approved) == 0):
-            st.session_state.approved_vendors = approved
-            st.session_state.step = 4
-            log(f"Human approved {len(approved)} vendors for scoring")
-            st.rerun()
+        if st.button("Score Selected Vendors →"):
+            approved = chosen.selected(names)
+            if not approved:
+                st.warning("Select at least one vendor to score.")
+            else:
+                st.session_state.approved_vendors = approved
+                log(f"Human approved {len(approved)} vendors for scoring")
+                goto_step(4)
 
 # ════════════════════════════════════════
 # STEP 4 — SCORING
@@ -668,55 +587,76 @@ elif st.session_state.step == 4:
         status_area  = st.empty()
         vendors      = st.session_state.approved_vendors
 
-        scored = []
-        for i, vendor_name in enumerate(vendors):
-            status_area.markdown(f"<div style='font-size:0.88rem; color:#6b7a87;'>Evaluating <strong>{vendor_name}</strong>...</div>", unsafe_allow_html=True)
-            time.sleep(0.6)
+        status_area.markdown(f"<div style='font-size:0.88rem; color:#6b7a87;'>Evaluating {len(vendors)} vendors...</div>", unsafe_allow_html=True)
 
-            raw_scores = get_scores(vendor_name)
-            total, breakdown = compute_weighted_score(vendor_name, raw_scores)
-
-            scored.append({
-                "name":      vendor_name,
-                "total":     total,
-                "breakdown": breakdown,
-            })
-            log(f"Scored {vendor_name}: {total}/100")
-            progress_bar.progress((i + 1) / len(vendors))
+        raw_scores = snapshot_scores(vendors)
+        count("snapshot_total", result="hit" if raw_scores is not None else "miss")
+        if raw_scores is not None:
+            log(f"Served {len(vendors)} vendor scores from a precomputed ranking snapshot")
+            progress_bar.progress(1.0)
+        else:
+            raw_scores, pending = RESULT_CACHE.cached_scores(vendors, st.session_state.criteria,
+                                                             SCORING_PROVIDER.fingerprint)
+            count("score_cache_total", len(raw_scores), result="hit")
+            count("score_cache_total", len(pending), result="miss")
+            if raw_scores:
+                log(f"Reused cached scores for {len(raw_scores)} vendors")
+                progress_bar.progress(len(raw_scores) / len(vendors))
+            results = evaluate(SCORING_PROVIDER, pending, st.session_state.criteria,
+                               on_timing=time_get_scores)
+            for i, (vendor_name, scores, error) in enumerate(results, len(raw_scores) + 1):
+                if error:
+                    raw_scores[vendor_name] = CATALOGUE.default_scores()
+                    log(f"⚠️ Could not score {vendor_name} ({error}) — using the catalogue's default scores")
+                else:
+                    raw_scores[vendor_name] = scores
+                    RESULT_CACHE.store_scores(vendor_name, st.session_state.criteria, scores,
+                                              SCORING_PROVIDER.fingerprint)
+                status_area.markdown(f"<div style='font-size:0.88rem; color:#6b7a87;'>Evaluated <strong>{vendor_name}</strong> ({i}/{len(vendors)})</div>", unsafe_allow_html=True)
+                progress_bar.progress(i / len(vendors))
+
+            usage = getattr(SCORING_PROVIDER, "usage", None)
+            if usage and usage["requests"]:
+                log(f"Claude scoring: {usage['requests']} requests, {usage['input_tokens']} input tokens "
+                    f"+ {usage['cache_read_input_tokens']} from cache, {usage['output_tokens']} output tokens")
+
+        scored = score_vendors(vendors, raw_scores)
+        for vendor_name in vendors:
+            log(f"Scored {vendor_name}: {st.session_state.ranking.total(vendor_name)}/100")
 
         status_area.empty()
-        st.session_state.scored = sorted(scored, key=lambda x: x["total"], reverse=True)
+        st.session_state.scored = scored
         log("All vendors scored. Ready for human review.")
+        save_session()
 
-    scored = st.session_state.scored
+    sync_ranking()
     st.markdown('<div class="section-label">Scoring Complete</div>', unsafe_allow_html=True)
 
-    for i, v in enumerate(scored, 1):
-        score = v["total"]
-        bar_w = int(score)
-        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-        st.markdown(f"""
-        <div class="vendor-card">
-            <span class="vendor-rank">#{i}</span>
-            <div class="vendor-name">{medal} {v['name']}</div>
-            <div class="vendor-score">{score}/100</div>
-            <div class="score-bar-wrap">
-                <div class="score-bar-fill" style='width:{bar_w}%; background:{score_color(score)};'></div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    def render_scored(rows, start):
+        cards = []
+        for v in rows:
+            i, score = v["rank"], v["total"]
+            medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+            cards.append(
+                f"<div class='vendor-card'><span class='vendor-rank'>#{i}</span>"
+                f"<div class='vendor-name'>{medal} {v['name']}</div>"
+                f"<div class='vendor-score'>{score}/100</div>"
+                f"<div class='score-bar-wrap'><div class='score-bar-fill' style='width:{int(score)}%; background:{score_color(score)};'></div></div></div>")
+        st.markdown("".join(cards), unsafe_allow_html=True)
+
+    vendor_grid("scored", st.session_state.ranking.rows(), render_scored,
+                sorts={"Rank": None, "Name A–Z": lambda v: v["name"].casefold()}, fields=("name",))
 
     st.markdown("---")
     col_a, col_b = st.columns([1, 1])
     with col_a:
         if st.button("← Back"):
-            st.session_state.scored = []
-            st.session_state.step = 3
-            st.rerun()
+            st.session_state.scored  = []
+            st.session_state.ranking = None
+            goto_step(3)
     with col_b:
         if st.button("Review & Override Rankings →"):
-            st.session_state.step = 5
-            st.rerun()
+            goto_step(5)
 
 # ════════════════════════════════════════
 # STEP 5 — HUMAN CHECKPOINT: OVERRIDE
@@ -731,12 +671,19 @@ elif st.session_state.step == 5:
     </div>
     """, unsafe_allow_html=True)
 
+    sync_ranking()
     scored = st.session_state.scored
-    top7   = scored[:7]
-    rest   = scored[7:]
+    top7   = scored[:SHORTLIST]
+    rest   = st.session_state.ranking.rows(start=len(top7))
 
     st.markdown('<div class="section-label">Top 7 — Final Candidates</div>', unsafe_allow_html=True)
 
+    keep  = selection("keep")
+    notes = st.session_state.notes
+
+    def save_note(name):
+        notes[name] = st.session_state[f"note_{name}"]
+
     final_selection = []
     for i, v in enumerate(top7, 1):
         c1, c2, c3 = st.columns([3, 1, 1])
@@ -749,24 +696,31 @@ elif st.session_state.step == 5:
             </div>
             """, unsafe_allow_html=True)
         with c2:
-            keep = st.checkbox("Include", value=True, key=f"keep_{v['name']}")
+            selection_checkbox(keep, v["name"], "Include", key="keep")
         with c3:
-            note = st.text_input("Note", placeholder="Optional", key=f"note_{v['name']}", label_visibility="collapsed")
-        if keep:
-            v["note"] = note
-            final_selection.append(v)
+            st.text_input("Note", value=notes.get(v["name"], ""), placeholder="Optional",
+                          key=f"note_{v['name']}", label_visibility="collapsed",
+                          on_change=save_note, args=(v["name"],))
+        if v["name"] in keep:
+            final_selection.append(v["name"])
 
     if rest:
         st.markdown('<div class="section-label">Outside Top 7 — Promote if needed</div>', unsafe_allow_html=True)
-        for v in rest:
-            c1, c2 = st.columns([4, 1])
-            with c1:
-                st.markdown(f"<span style='color:#6b7a87; font-size:0.88rem;'>{v['name']} — {v['total']}/100</span>", unsafe_allow_html=True)
-            with c2:
-                if st.button("Promote", key=f"promote_{v['name']}"):
-                    st.session_state.scored = [v] + [x for x in scored if x["name"] != v["name"]]
-                    log(f"Human promoted: {v['name']}")
-                    st.rerun()
+
+        def render_rest(rows, start):
+            for v in rows:
+                c1, c2 = st.columns([4, 1])
+                with c1:
+                    st.markdown(f"<span style='color:#6b7a87; font-size:0.88rem;'>{v['name']} — {v['total']}/100</span>", unsafe_allow_html=True)
+                with c2:
+                    if st.button("Promote", key=f"promote_{v['name']}"):
+                        st.session_state.ranking.promote(v["name"])
+                        st.session_state.scored = ScoredResults.from_ranking(st.session_state.ranking, SHORTLIST)
+                        log(f"Human promoted: {v['name']}")
+                        st.rerun()
+
+        vendor_grid("outside", rest, render_rest,
+                    sorts={"Score": None, "Name A–Z": lambda v: v["name"].casefold()}, fields=("name",))
 
     st.markdown(f"<div style='margin-top:1rem; font-size:0.85rem; color:#6b7a87;'>Final report will include {len(final_selection)} vendors.</div>", unsafe_allow_html=True)
     st.markdown("---")
@@ -774,14 +728,12 @@ elif st.session_state.step == 5:
     col_a, col_b = st.columns([1, 1])
     with col_a:
         if st.button("← Back to Scores"):
-            st.session_state.step = 4
-            st.rerun()
+            goto_step(4)
     with col_b:
         if st.button("Generate Final Report →", disabled=len(final_selection) == 0):
-            st.session_state.final_report = final_selection
-            st.session_state.step = 6
+            st.session_state.final_report = top7.select(final_selection, notes)
             log(f"Final report generated with {len(final_selection)} vendors")
-            st.rerun()
+            goto_step(6)
 
 # ════════════════════════════════════════
 # STEP 6 — FINAL REPORT
@@ -867,8 +819,9 @@ elif st.session_state.step == 6:
         "organisation":   org,
         "category":       cat,
         "generated":      now,
-        "top_vendors":    report,
+        "top_vendors":    report.to_records() if report else [],
         "restrictions":   st.session_state.restrictions,
+        "excluded":       st.session_state.excluded,
         "criteria":       st.session_state.criteria,
     }
     col_a, col_b, col_c = st.columns([2, 1, 1])
@@ -881,13 +834,10 @@ elif st.session_state.step == 6:
         )
     with col_b:
         if st.button("🔄 Start New Search"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
-            st.rerun()
+            reset_session()
     with col_c:
         if st.button("← Edit Rankings"):
-            st.session_state.step = 5
-            st.rerun()
+            goto_step(5)
 
     # ── RFP GENERATION ───────────────────────────────────────────
     st.markdown("---")
@@ -897,15 +847,23 @@ elif st.session_state.step == 6:
     if not RFP_AVAILABLE:
         st.info("ℹ️ RFP generation is not available — make sure the `rfp_system/` folder is in the same directory as `app.py`.")
     else:
-        has_template = template_exists(cat)
+        tpl_source   = template_source(cat, st.session_state.criteria, st.session_state.restrictions)
+        has_template = tpl_source != "ai"
 
-        if has_template:
+        if tpl_source == "template":
             st.markdown(f"""
             <div style="background:#f0fdf4; border:1px solid #bbf7d0; border-radius:8px;
                         padding:0.8rem 1.2rem; font-size:0.88rem; color:#166534; margin-bottom:1rem;">
                 ✅ <strong>Pre-built template found</strong> for <em>{cat}</em> —
                 RFP will use curated, category-specific questions.
             </div>""", unsafe_allow_html=True)
+        elif tpl_source == "cached":
+            st.markdown(f"""
+            <div style="background:#f0fdf4; border:1px solid #bbf7d0; border-radius:8px;
+                        padding:0.8rem 1.2rem; font-size:0.88rem; color:#166534; margin-bottom:1rem;">
+                ♻️ <strong>Cached AI template found</strong> for <em>{cat}</em> —
+                RFP will reuse questions Claude generated for these criteria and restrictions.
+            </div>""", unsafe_allow_html=True)
         else:
             st.markdown(f"""
             <div style="background:#fffbeb; border:1px solid #fde68a; border-radius:8px;
@@ -931,44 +889,66 @@ elif st.session_state.step == 6:
 
         if st.button("📄 Generate RFP Word Document", use_container_width=True):
             top_vendor_names = [v["name"] for v in (st.session_state.final_report or [])[:7]]
-            spinner_msg = (
-                f"Loading template for {cat}..."
-                if has_template
-                else f"Asking Claude to generate RFP questions for {cat}..."
+            st.session_state.rfp_job_args = dict(
+                category       = cat,
+                org_name       = rfp_org or org,
+                top_vendors    = top_vendor_names,
+                criteria       = copy.deepcopy(st.session_state.criteria),
+                restrictions   = list(st.session_state.restrictions),
+                output_dir     = "/tmp/rfp_outputs/",
+                deadline_weeks = rfp_deadline
             )
-            with st.spinner(spinner_msg):
+            try:
+                st.session_state.rfp_job = submit_rfp_job(**st.session_state.rfp_job_args)
+                st.session_state.rfp_job_source = tpl_source
+                log(f"RFP generation queued for {cat}")
+            except RuntimeError as e:
+                st.warning(f"⏳ {e}")
+
+        rfp_job   = get_rfp_job(st.session_state.rfp_job) if st.session_state.get("rfp_job") else None
+        rfp_bytes = None
+        if rfp_job and rfp_job["status"] == "done":
+            try:
+                with span("file_read"), open(rfp_job["path"], "rb") as f:
+                    rfp_bytes = f.read()
+            except FileNotFoundError:
+                # The document cache pruned the file since the job finished — build it again
+                log(f"RFP document for {cat} was evicted from the cache — regenerating")
                 try:
-                    rfp_path = generate_rfp(
-                        category       = cat,
-                        org_name       = rfp_org or org,
-                        top_vendors    = top_vendor_names,
-                        criteria       = st.session_state.criteria,
-                        restrictions   = st.session_state.restrictions,
-                        output_dir     = "/tmp/rfp_outputs/",
-                        deadline_weeks = rfp_deadline
-                    )
-                    with open(rfp_path, "rb") as f:
-                        rfp_bytes = f.read()
-
-                    safe_cat = re.sub(r'[^a-zA-Z0-9]', '_', cat)
-                    rfp_filename = f"RFP_{safe_cat}.docx"
-                    source_label = "from template" if has_template else "by Claude AI"
-
-                    st.success(f"✅ RFP generated {source_label} — ready to download")
-                    st.download_button(
-                        label     = f"⬇ Download RFP — {cat}",
-                        data      = rfp_bytes,
-                        file_name = rfp_filename,
-                        mime      = "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key       = "download_rfp_docx"
-                    )
-                    log(f"RFP generated {source_label} for {cat}")
-                except Exception as e:
-                    st.error(f"RFP generation failed: {str(e)}")
-                    st.info("Check that your ANTHROPIC_API_KEY is set in Streamlit Secrets and `rfp_system/` is present.")
+                    st.session_state.rfp_job = submit_rfp_job(**st.session_state.rfp_job_args)
+                except RuntimeError as e:
+                    st.session_state.rfp_job = None
+                    st.warning(f"⏳ {e}")
+                else:
+                    st.rerun()
+
+        if rfp_job and rfp_job["status"] in ("queued", "running"):
+            rfp_job_progress(rfp_job["id"], has_template)
+        elif rfp_bytes is not None:
+            safe_cat = re.sub(r'[^a-zA-Z0-9]', '_', cat)
+            rfp_filename = f"RFP_{safe_cat}.docx"
+            source_label = {"template": "from template", "cached": "from cached AI template"}.get(
+                st.session_state.get("rfp_job_source"), "by Claude AI")
+
+            st.success(f"✅ RFP generated {source_label} — ready to download")
+            st.download_button(
+                label     = f"⬇ Download RFP — {cat}",
+                data      = rfp_bytes,
+                file_name = rfp_filename,
+                mime      = "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                key       = "download_rfp_docx"
+            )
+            if st.session_state.get("rfp_job_logged") != rfp_job["id"]:
+                st.session_state.rfp_job_logged = rfp_job["id"]
+                log(f"RFP generated {source_label} for {cat}")
+        elif rfp_job and rfp_job["status"] == "failed":
+            st.error(f"RFP generation failed: {rfp_job['error']}")
+            st.info("Check that your ANTHROPIC_API_KEY is set in Streamlit Secrets and `rfp_system/` is present.")
 
     # ── Activity log ─────────────────────────────────────────────
     if st.session_state.log:
         with st.expander("📋 Activity Log"):
             log_html = "<br>".join(st.session_state.log)
             st.markdown(f'<div class="log-box">{log_html}</div>', unsafe_allow_html=True)
+
+record_step()
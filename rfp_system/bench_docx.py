@@ -0,0 +1,523 @@
+"""
+bench_docx.py — DOCX Renderer Benchmark
+========================================
+Compares the legacy code-generation renderer (_render_js) with the
+data-driven docx_renderer.js on synthetic templates of 7, 50 and 500 questions.
+
+Usage:
+    python bench_docx.py
+    python bench_docx.py --repeat 10 --sizes 7 50 500 2000
+    python bench_docx.py --no-node          # Python-side cost only
+
+Columns:
+    prepare   Python time to build what is handed to node
+              (codegen: the JS program · data: the JSON payload)
+    payload   size of that program / payload
+    oneshot   end-to-end `node` run per document (codegen program vs docx_renderer.js)
+    pool      end-to-end render through the persistent worker pool (data only)
+
+Node columns are skipped when node or docx-js is not installed.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx_builder import _build_oneshot
+from node_pool import get_pool, node_env
+
+CONTEXT = {
+    "org_name":       "St. Mary's Hospital",
+    "category":       "EHR / Electronic Health Records",
+    "top_vendors":    ["Epic Systems", "Oracle Health (Cerner)", "Meditech"],
+    "criteria": {
+        "HIPAA Compliance":    {"weight": 25, "desc": "Full HIPAA/HITECH compliance, BAA availability"},
+        "Data Security":       {"weight": 20, "desc": "Encryption, access controls, SOC2/ISO 27001"},
+        "EHR Integration":     {"weight": 15, "desc": "Epic, Cerner, HL7 FHIR support"},
+        "Pricing & TCO":       {"weight": 15, "desc": "Transparent pricing, ROI potential"},
+        "Customer Support":    {"weight": 10, "desc": "24/7 healthcare-specific SLA"},
+        "Scalability":         {"weight": 10, "desc": "Growth and enterprise readiness"},
+        "Implementation Time": {"weight": 5,  "desc": "Time to go-live and onboarding"},
+    },
+    "restrictions":   ["Must be HIPAA compliant with signed BAA", "Must support HL7 FHIR standards"],
+    "deadline_weeks": "2-4",
+    "issue_date":     "January 01, 2026",
+    "ref_number":     "RFP-EHR-2026-001",
+    "source":         "template",
+}
+
+
+def make_template(n_questions: int, n_sections: int = 7) -> dict:
+    sections = [
+        {"number": f"{i + 1:02d}", "title": f"Section {i + 1}",
+         "description": "Vendors must answer every question in this section.", "questions": []}
+        for i in range(n_sections)
+    ]
+    for q in range(n_questions):
+        sections[q % n_sections]["questions"].append(
+            f"Question {q + 1}: describe how your platform handles requirement #{q + 1}, "
+            f"including HL7/FHIR interfaces, audit logging and $-denominated costs."
+        )
+    return {"short_description": "Benchmark RFP", "mandatory_requirements": [], "sections": sections}
+
+
+# ── LEGACY CODEGEN RENDERER ───────────────────────────────────
+# The original renderer, which generated a complete docx-js program per
+# document. docx_builder no longer uses it; it lives here only as the
+# baseline the data-driven renderer is measured against.
+
+def _esc(text: str) -> str:
+    """Escape text for safe embedding in JS template literals."""
+    return (text or "").\
+        replace("\\", "\\\\").\
+        replace("`",  "\\`").\
+        replace("$",  "\\$").\
+        replace("\n", " ").\
+        replace('"',  '\\"')
+
+
+def _render_js(template: dict, context: dict) -> str:
+    """Render the full Node.js docx-generation script."""
+
+    category        = _esc(context["category"])
+    org_name        = _esc(context["org_name"])
+    issue_date      = _esc(context["issue_date"])
+    ref_number      = _esc(context["ref_number"])
+    deadline_weeks  = _esc(context["deadline_weeks"])
+    short_desc      = _esc(template.get("short_description", category))
+    source          = context.get("source", "template")
+    source_note     = "" if source == "template" else "AI-Generated Template"
+
+    # Top vendors list
+    vendors_js = json.dumps(context.get("top_vendors", []))
+
+    # Restrictions
+    restrictions_js = json.dumps(context.get("restrictions", []))
+
+    # Criteria rows for scoring table
+    criteria_rows = ""
+    for i, (crit, info) in enumerate(context.get("criteria", {}).items()):
+        w    = info.get("weight", 0)
+        desc = info.get("desc", "")
+        fill = "FFFFFF" if i % 2 == 0 else "F2F4F6"
+        criteria_rows += f"""
+    new TableRow({{ children: [
+      _cell({json.dumps(crit)},  4000, "{fill}", true,  "1B2E45"),
+      _cell("{w}%",              1200, "{fill}", true,  "0D7A6B", WD_CENTER),
+      _cell({json.dumps(desc)},  4160, "{fill}", false, "1A1A2E"),
+    ]}}),"""
+
+    # Mandatory requirements bullets
+    mandatory = template.get("mandatory_requirements", [])
+    mandatory_bullets = "\n".join(
+        f'    _bullet({json.dumps(r)}),' for r in mandatory
+    )
+
+    # Sections
+    sections_js = ""
+    for sec in template.get("sections", []):
+        num   = _esc(sec.get("number", ""))
+        title = _esc(sec.get("title", ""))
+        desc  = _esc(sec.get("description", ""))
+        questions = sec.get("questions", [])
+        q_rows = ""
+        for qi, q in enumerate(questions):
+            fill = "FFFFFF" if qi % 2 == 0 else "F2F4F6"
+            q_rows += f"""
+      new TableRow({{ children: [
+        _cell({json.dumps(q)}, 5500, "{fill}", false, "1A1A2E"),
+        _cell("",              3860, "{fill}", false, "1A1A2E"),
+      ]}}),"""
+
+        sections_js += f"""
+  // ── Section {num}: {title} ──
+  _pageBreak(),
+  _banner("{num}", "{title}"),
+  _spacer(160),
+  _para("{desc}", {{ size: 22 }}),
+  _spacer(120),
+  new Table({{
+    width: {{ size: 9360, type: WidthType.DXA }},
+    columnWidths: [5500, 3860],
+    rows: [
+      new TableRow({{ children: [
+        _headerCell("Question / Requirement", 5500),
+        _headerCell("Vendor Response",        3860),
+      ]}}),{q_rows}
+    ]
+  }}),"""
+
+    output_path_escaped = _esc(context.get("_output_path", "/tmp/rfp_output.docx"))
+
+    return f"""
+const {{
+  Document, Packer, Paragraph, TextRun, Table, TableRow, TableCell,
+  Header, Footer, AlignmentType, HeadingLevel, BorderStyle, WidthType,
+  ShadingType, VerticalAlign, PageBreak, LevelFormat,
+  TabStopType, TabStopPosition
+}} = require('docx');
+const fs = require('fs');
+
+const NAVY    = "1B2E45";
+const TEAL    = "0D7A6B";
+const LTGRAY  = "F2F4F6";
+const MIDGRAY = "D0D5DD";
+const WHITE   = "FFFFFF";
+const DKTEXT  = "1A1A2E";
+const WD_CENTER = AlignmentType.CENTER;
+const WD_RIGHT  = AlignmentType.RIGHT;
+
+const OUTPUT_PATH = {json.dumps(output_path_escaped)};
+
+// ── Helpers ───────────────────────────────────────────────────
+const _b  = (c="D0D5DD") => ({{ style: BorderStyle.SINGLE, size: 1, color: c }});
+const _ab = (c="D0D5DD") => ({{ top: _b(c), bottom: _b(c), left: _b(c), right: _b(c) }});
+const _nb = () => ({{ style: BorderStyle.NONE, size: 0, color: "FFFFFF" }});
+const _nbs = () => ({{ top: _nb(), bottom: _nb(), left: _nb(), right: _nb() }});
+
+function _para(text, opts={{}}) {{
+  return new Paragraph({{
+    alignment: opts.align || AlignmentType.LEFT,
+    spacing: {{ before: opts.before ?? 80, after: opts.after ?? 80 }},
+    children: [new TextRun({{ text, bold: opts.bold||false, italics: opts.italic||false,
+      size: opts.size||22, color: opts.color||DKTEXT, font: "Arial" }})]
+  }});
+}}
+
+function _spacer(before=160) {{
+  return new Paragraph({{ spacing: {{ before, after: 0 }}, children: [new TextRun("")] }});
+}}
+
+function _pageBreak() {{
+  return new Paragraph({{ children: [new PageBreak()] }});
+}}
+
+function _bullet(text) {{
+  return new Paragraph({{
+    numbering: {{ reference: "bullets", level: 0 }},
+    spacing: {{ before: 60, after: 60 }},
+    children: [new TextRun({{ text, size: 22, color: DKTEXT, font: "Arial" }})]
+  }});
+}}
+
+function _cell(text, width, fill, bold=false, color=DKTEXT, align=AlignmentType.LEFT) {{
+  return new TableCell({{
+    width: {{ size: width, type: WidthType.DXA }},
+    shading: {{ fill, type: ShadingType.CLEAR }},
+    margins: {{ top: 100, bottom: 100, left: 160, right: 160 }},
+    borders: _ab(MIDGRAY),
+    verticalAlign: VerticalAlign.CENTER,
+    children: [new Paragraph({{ alignment: align,
+      children: [new TextRun({{ text: text||"", bold, size: 20, color, font: "Arial" }})] }})]
+  }});
+}}
+
+function _headerCell(text, width) {{
+  return new TableCell({{
+    width: {{ size: width, type: WidthType.DXA }},
+    shading: {{ fill: NAVY, type: ShadingType.CLEAR }},
+    margins: {{ top: 100, bottom: 100, left: 160, right: 160 }},
+    borders: _ab(NAVY),
+    children: [new Paragraph({{
+      children: [new TextRun({{ text, bold: true, size: 20, color: WHITE, font: "Arial" }})]
+    }})]
+  }});
+}}
+
+function _infoRow(label, value, i) {{
+  const fill = i % 2 === 0 ? LTGRAY : WHITE;
+  return new TableRow({{ children: [
+    _cell(label, 2800, fill, true,  NAVY),
+    _cell(value, 6560, fill, false, DKTEXT),
+  ]}});
+}}
+
+function _banner(number, title) {{
+  return new Table({{
+    width: {{ size: 9360, type: WidthType.DXA }},
+    columnWidths: [800, 8560],
+    borders: {{ top: _nb(), bottom: _nb(), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() }},
+    rows: [new TableRow({{ children: [
+      new TableCell({{
+        width: {{ size: 800, type: WidthType.DXA }},
+        shading: {{ fill: TEAL, type: ShadingType.CLEAR }},
+        margins: {{ top: 120, bottom: 120, left: 160, right: 160 }},
+        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
+        children: [new Paragraph({{ alignment: AlignmentType.CENTER,
+          children: [new TextRun({{ text: number, bold: true, size: 28, color: WHITE, font: "Arial" }})] }})]
+      }}),
+      new TableCell({{
+        width: {{ size: 8560, type: WidthType.DXA }},
+        shading: {{ fill: NAVY, type: ShadingType.CLEAR }},
+        margins: {{ top: 120, bottom: 120, left: 200, right: 160 }},
+        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
+        children: [new Paragraph({{
+          children: [new TextRun({{ text: title, bold: true, size: 26, color: WHITE, font: "Arial" }})] }})]
+      }}),
+    ]}})]
+  }});
+}}
+
+// ── Document ──────────────────────────────────────────────────
+const topVendors  = {vendors_js};
+const restrictions = {restrictions_js};
+const sourceNote  = "{source_note}";
+
+const doc = new Document({{
+  numbering: {{ config: [
+    {{ reference: "bullets",
+       levels: [{{ level: 0, format: LevelFormat.BULLET, text: "\\u2022",
+         alignment: AlignmentType.LEFT,
+         style: {{ paragraph: {{ indent: {{ left: 720, hanging: 360 }} }} }} }}] }},
+    {{ reference: "numbers",
+       levels: [{{ level: 0, format: LevelFormat.DECIMAL, text: "%1.",
+         alignment: AlignmentType.LEFT,
+         style: {{ paragraph: {{ indent: {{ left: 720, hanging: 360 }} }} }} }}] }},
+  ]}},
+  styles: {{
+    default: {{ document: {{ run: {{ font: "Arial", size: 22, color: DKTEXT }} }} }},
+    paragraphStyles: [
+      {{ id: "Heading1", name: "Heading 1", basedOn: "Normal", next: "Normal", quickFormat: true,
+        run: {{ size: 32, bold: true, font: "Arial", color: NAVY }},
+        paragraph: {{ spacing: {{ before: 320, after: 160 }}, outlineLevel: 0 }} }},
+      {{ id: "Heading2", name: "Heading 2", basedOn: "Normal", next: "Normal", quickFormat: true,
+        run: {{ size: 26, bold: true, font: "Arial", color: TEAL }},
+        paragraph: {{ spacing: {{ before: 240, after: 120 }}, outlineLevel: 1 }} }},
+    ]
+  }},
+  sections: [{{
+    properties: {{
+      page: {{
+        size: {{ width: 12240, height: 15840 }},
+        margin: {{ top: 1440, right: 1260, bottom: 1440, left: 1260 }}
+      }}
+    }},
+    headers: {{
+      default: new Header({{ children: [
+        new Table({{
+          width: {{ size: 9720, type: WidthType.DXA }},
+          columnWidths: [6200, 3520],
+          borders: {{ top: _nb(), bottom: _b(TEAL), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() }},
+          rows: [new TableRow({{ children: [
+            new TableCell({{ width: {{ size: 6200, type: WidthType.DXA }}, borders: _nbs(), margins: {{ bottom: 80 }},
+              children: [new Paragraph({{ children: [new TextRun({{ text: "REQUEST FOR PROPOSAL — {category.upper()}", bold: true, size: 18, color: NAVY, font: "Arial" }})] }})] }}),
+            new TableCell({{ width: {{ size: 3520, type: WidthType.DXA }}, borders: _nbs(), margins: {{ bottom: 80 }},
+              children: [new Paragraph({{ alignment: AlignmentType.RIGHT, children: [new TextRun({{ text: "CONFIDENTIAL", size: 18, color: TEAL, bold: true, font: "Arial" }})] }})] }}),
+          ]}})]
+        }})
+      ]}})
+    }},
+    footers: {{
+      default: new Footer({{ children: [
+        new Paragraph({{
+          spacing: {{ before: 80 }},
+          border: {{ top: {{ style: BorderStyle.SINGLE, size: 4, color: MIDGRAY, space: 4 }} }},
+          tabStops: [{{ type: TabStopType.RIGHT, position: 9360 }}],
+          children: [
+            new TextRun({{ text: "{org_name} \\u2014 Confidential & Proprietary", size: 18, color: "888888", font: "Arial" }}),
+            new TextRun({{ text: "\\t{ref_number}", size: 18, color: "888888", font: "Arial" }}),
+          ]
+        }})
+      ]}})
+    }},
+
+    children: [
+
+      // ── Cover Page ───────────────────────────────────────────
+      _spacer(2880),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 0 }},
+        children: [new TextRun({{ text: "REQUEST FOR PROPOSAL", bold: true, size: 56, color: NAVY, font: "Arial" }})] }}),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 120, after: 0 }},
+        children: [new TextRun({{ text: "{category}", size: 40, color: TEAL, font: "Arial" }})] }}),
+      _spacer(80),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        children: [new TextRun({{ text: "{short_desc}", size: 22, color: "888888", italics: true, font: "Arial" }})] }}),
+      _spacer(320),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        border: {{ top: {{ style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 }},
+                   bottom: {{ style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 }} }},
+        children: [new TextRun({{ text: "  ", size: 8, font: "Arial" }})] }}),
+      _spacer(240),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        children: [new TextRun({{ text: "Issued by: {org_name}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        children: [new TextRun({{ text: "Issue Date: {issue_date}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        children: [new TextRun({{ text: "Response Deadline: [Insert Date \\u2014 {deadline_weeks} weeks from issue]", size: 24, color: "CC0000", bold: true, font: "Arial" }})] }}),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+        children: [new TextRun({{ text: "RFP Reference: {ref_number}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
+      ...(sourceNote ? [new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 80, after: 0 }},
+        children: [new TextRun({{ text: "\\u26A1 " + sourceNote, size: 18, color: TEAL, font: "Arial" }})] }})] : []),
+      _spacer(400),
+      ...(topVendors.length > 0 ? [
+        new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
+          children: [new TextRun({{ text: "Shortlisted Vendors: " + topVendors.join(" \\u2022 "), size: 20, color: "555555", font: "Arial" }})] }}),
+      ] : []),
+      _spacer(200),
+      new Paragraph({{ alignment: AlignmentType.CENTER,
+        children: [new TextRun({{ text: "CONFIDENTIAL \\u2014 FOR NAMED RECIPIENTS ONLY", bold: true, size: 20, color: "888888", font: "Arial" }})] }}),
+
+      // ── Section 00: Overview ─────────────────────────────────
+      _pageBreak(),
+      _banner("00", "Overview & Submission Details"),
+      _spacer(160),
+      _para("This Request for Proposal invites qualified vendors to submit proposals for: {short_desc}"),
+      _spacer(),
+      new Table({{
+        width: {{ size: 9360, type: WidthType.DXA }},
+        columnWidths: [2800, 6560],
+        borders: {{ ...Object.fromEntries(["top","bottom","left","right","insideH","insideV"].map(k => [k, _b()])) }},
+        rows: [
+          _infoRow("RFP Reference",       "{ref_number}",  0),
+          _infoRow("Category",            "{category}",    1),
+          _infoRow("Issuing Organisation","{org_name}",    0),
+          _infoRow("Issue Date",          "{issue_date}",  1),
+          _infoRow("Response Deadline",   "[Insert Date \\u2014 {deadline_weeks} weeks from above]", 0),
+          _infoRow("Submission Email",    "[procurement@yourorganisation.com]", 1),
+          _infoRow("Questions Deadline",  "[Insert Date \\u2014 5 business days after issue]", 0),
+          _infoRow("RFP Contact",         "[Name, Title, Email, Phone]", 1),
+        ]
+      }}),
+      _spacer(),
+      _para("Mandatory Requirements — vendors failing any item below are automatically disqualified:", {{ bold: true, color: "CC0000" }}),
+      _spacer(80),
+      ...restrictions.map(r => _bullet(r)),
+
+      // ── Dynamic Sections ─────────────────────────────────────
+      {sections_js}
+
+      // ── Scoring Criteria ─────────────────────────────────────
+      _pageBreak(),
+      _banner("EV", "Evaluation Criteria & Scoring"),
+      _spacer(160),
+      _para("All proposals will be scored by the Vendor Selection Committee using the weighted criteria below. Scores are 0\\u201310 per criterion, multiplied by the weight to produce a total out of 100."),
+      _spacer(120),
+      new Table({{
+        width: {{ size: 9360, type: WidthType.DXA }},
+        columnWidths: [4000, 1200, 4160],
+        rows: [
+          new TableRow({{ children: [
+            _headerCell("Criterion",          4000),
+            _headerCell("Weight",             1200),
+            _headerCell("Key Evaluation Focus", 4160),
+          ]}}),
+          {criteria_rows}
+        ]
+      }}),
+      _spacer(),
+      _para("Submission Instructions", {{ bold: true, size: 24, color: NAVY }}),
+      _spacer(80),
+      _bullet("Submit as a single PDF: [CompanyName]_{ref_number}.pdf"),
+      _bullet("Email to: [procurement@yourorganisation.com] — Subject: {ref_number} Proposal"),
+      _bullet("Proposals must arrive by the deadline date at 5:00 PM local time."),
+      _bullet("All questions in writing only to the procurement contact above."),
+      _bullet("Proposals valid for minimum 90 days from submission deadline."),
+      _bullet("The Organisation reserves the right to reject any or all proposals without obligation."),
+      _spacer(400),
+      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 160, after: 80 }},
+        children: [new TextRun({{ text: "\\u2014 End of Request for Proposal \\u2014", bold: true, size: 22, color: NAVY, font: "Arial" }})] }}),
+      new Paragraph({{ alignment: AlignmentType.CENTER,
+        children: [new TextRun({{ text: "Thank you for your interest. We look forward to reviewing your proposal.", size: 20, color: "888888", font: "Arial" }})] }}),
+
+    ]
+  }}]
+}});
+
+Packer.toBuffer(doc).then(buffer => {{
+  fs.writeFileSync(OUTPUT_PATH, buffer);
+  console.log("RFP document generated: " + OUTPUT_PATH);
+}});
+"""
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def _node_ready() -> bool:
+    try:
+        check = subprocess.run(["node", "-e", "require('docx')"],
+                               capture_output=True, timeout=30, env=node_env())
+    except OSError:
+        return False
+    return check.returncode == 0
+
+
+def _run_codegen(template: dict, out_path: str):
+    js = _render_js(template, dict(CONTEXT, _output_path=out_path))
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
+        f.write(js)
+        tmp_js = f.name
+    try:
+        result = subprocess.run(["node", tmp_js], capture_output=True, text=True,
+                                timeout=120, env=node_env())
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+    finally:
+        os.unlink(tmp_js)
+
+
+def bench(sizes: list, repeat: int, use_node: bool) -> list:
+    rows = []
+    out_path = os.path.join(tempfile.gettempdir(), "bench_rfp.docx")
+    pool = get_pool() if use_node else None
+
+    for n in sizes:
+        template = make_template(n)
+        codegen_src = _render_js(template, dict(CONTEXT, _output_path=out_path))
+        data_src    = json.dumps({"template": template, "context": CONTEXT})
+
+        row = {
+            "questions":        n,
+            "codegen_prepare":  _median_ms(lambda: _render_js(template, dict(CONTEXT, _output_path=out_path)), repeat),
+            "data_prepare":     _median_ms(lambda: json.dumps({"template": template, "context": CONTEXT}), repeat),
+            "codegen_payload":  len(codegen_src.encode()),
+            "data_payload":     len(data_src.encode()),
+        }
+        if use_node:
+            row["codegen_oneshot"] = _median_ms(lambda: _run_codegen(template, out_path), repeat)
+            row["data_oneshot"]    = _median_ms(lambda: _build_oneshot(template, CONTEXT, out_path), repeat)
+            pool.render(template, CONTEXT)    # warm a worker before timing
+            row["data_pool"]       = _median_ms(lambda: pool.render(template, CONTEXT), repeat)
+        rows.append(row)
+    return rows
+
+
+def print_table(rows: list, use_node: bool):
+    print(f"\n  {'questions':>9} │ {'prepare ms':^19} │ {'payload KB':^17}", end="")
+    print(f" │ {'oneshot ms':^19} │ {'pool ms':>8}" if use_node else "")
+    print(f"  {'':>9} │ {'codegen':>9} {'data':>9} │ {'codegen':>8} {'data':>8}", end="")
+    print(f" │ {'codegen':>9} {'data':>9} │ {'data':>8}" if use_node else "")
+    print("  " + "─" * (86 if use_node else 52))
+    for r in rows:
+        print(f"  {r['questions']:>9} │ {r['codegen_prepare']:>9.2f} {r['data_prepare']:>9.2f}"
+              f" │ {r['codegen_payload'] / 1024:>8.1f} {r['data_payload'] / 1024:>8.1f}", end="")
+        if use_node:
+            print(f" │ {r['codegen_oneshot']:>9.1f} {r['data_oneshot']:>9.1f} │ {r['data_pool']:>8.1f}")
+        else:
+            print()
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the codegen and data-driven DOCX renderers.")
+    parser.add_argument("--sizes",   type=int, nargs="+", default=[7, 50, 500], help="question counts to test")
+    parser.add_argument("--repeat",  type=int, default=5, help="runs per measurement (median is reported)")
+    parser.add_argument("--no-node", action="store_true", help="skip the end-to-end node timings")
+    args = parser.parse_args()
+
+    use_node = not args.no_node and _node_ready()
+    if not args.no_node and not use_node:
+        print("  node / docx-js not available — reporting Python-side cost only.")
+    print_table(bench(args.sizes, args.repeat, use_node), use_node)
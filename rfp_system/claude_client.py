@@ -0,0 +1,261 @@
+"""
+Claude Client
+==============
+One Anthropic client per process, shared by the RFP engine, vendor scoring
+and anything else that talks to Claude.
+
+    from claude_client import get_client
+    client   = get_client()
+    response = client.messages.create(model=..., max_tokens=..., messages=[...])
+    with client.messages.stream(model=..., ...) as stream:
+        for text in stream.text_stream: ...
+
+The wrapper keeps the SDK's calling convention and adds:
+    connection reuse   one anthropic.Anthropic, so its HTTP pool stays warm
+    concurrency cap    at most CLAUDE_MAX_CONCURRENCY requests in flight
+    token budget       a token bucket of CLAUDE_TPM tokens per minute; each
+                       request reserves its estimated prompt + max_tokens and
+                       is settled against the usage Claude reports
+    retries            429, 408/409, 5xx (incl. 529 overloaded) and connection
+                       errors are retried with full-jitter exponential backoff,
+                       honouring retry-after; a stream is retried only while
+                       opening, never after text has arrived
+    telemetry          a claude_request span per call, token and retry counters
+
+Set CLAUDE_STUB=1 to point the client at a local stub server (claude_stub.py)
+instead of the API — nothing leaves the machine and no key is needed.
+
+Environment:
+    CLAUDE_MAX_CONCURRENCY   requests in flight per process (default 4)
+    CLAUDE_TPM               token budget per minute, 0 = unlimited (default 0)
+    CLAUDE_MAX_RETRIES       retries per request (default 4)
+    CLAUDE_TIMEOUT           seconds per HTTP request (default 120)
+    CLAUDE_STUB              1 = serve requests from the local stub
+"""
+
+import os
+import json
+import time
+import random
+import threading
+
+import anthropic
+
+from telemetry import span, count, observe
+
+MAX_CONCURRENCY = int(os.environ.get("CLAUDE_MAX_CONCURRENCY", "4"))
+TOKENS_PER_MIN  = int(os.environ.get("CLAUDE_TPM", "0"))
+MAX_RETRIES     = int(os.environ.get("CLAUDE_MAX_RETRIES", "4"))
+TIMEOUT         = float(os.environ.get("CLAUDE_TIMEOUT", "120"))
+USE_STUB        = os.environ.get("CLAUDE_STUB", "0") not in ("", "0")
+
+BACKOFF_BASE    = 1.0     # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_MAX     = 30.0
+RETRY_STATUSES  = {408, 409, 429}
+
+
+# ── TOKEN BUDGET ──────────────────────────────────────────────
+
+class TokenBudget:
+    """Token bucket refilled continuously at tokens_per_minute / 60 per second."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = max(0, tokens_per_minute)
+        self.tokens   = float(self.capacity)
+        self._rate    = self.capacity / 60.0
+        self._updated = time.monotonic()
+        self._cond    = threading.Condition()
+
+    def acquire(self, tokens: int) -> int:
+        """Block until `tokens` are available and take them. Returns the amount reserved."""
+        if not self.capacity:
+            return 0
+        tokens  = min(int(tokens), self.capacity)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    break
+                self._cond.wait(min((tokens - self.tokens) / self._rate, 1.0))
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            observe("claude_throttle_seconds", waited)
+        return tokens
+
+    def settle(self, reserved: int, used: int):
+        """Return the unused part of a reservation (or charge the overshoot)."""
+        if not self.capacity:
+            return
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + reserved - used)
+            self._cond.notify_all()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens   = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+def estimate_tokens(request: dict) -> int:
+    """Rough prompt size (4 characters per token) plus the full max_tokens allowance."""
+    prompt = json.dumps([request.get("system"), request.get("tools"), request.get("messages")], default=str)
+    return len(prompt) // 4 + int(request.get("max_tokens", 0))
+
+
+def _used_tokens(usage) -> int:
+    if usage is None:
+        return 0
+    return sum(getattr(usage, k, None) or 0
+               for k in ("input_tokens", "output_tokens", "cache_creation_input_tokens"))
+
+
+def _count_usage(usage):
+    if usage is None:
+        return
+    for kind, attr in (("input", "input_tokens"), ("output", "output_tokens"),
+                       ("cache_read", "cache_read_input_tokens"),
+                       ("cache_write", "cache_creation_input_tokens")):
+        value = getattr(usage, attr, None)
+        if value:
+            count("claude_tokens_total", value, kind=kind)
+
+
+# ── CLIENT ────────────────────────────────────────────────────
+
+class ClaudeClient:
+    """anthropic.Anthropic behind a concurrency cap, a token budget and retries."""
+
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 max_concurrency: int = MAX_CONCURRENCY, tokens_per_minute: int = TOKENS_PER_MIN,
+                 max_retries: int = MAX_RETRIES, timeout: float = TIMEOUT):
+        self.max_retries = max_retries
+        self.budget      = TokenBudget(tokens_per_minute)
+        self._slots      = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._client     = anthropic.Anthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
+            base_url=base_url, max_retries=0, timeout=timeout)
+        self.messages    = _Messages(self)
+
+    def create(self, **request):
+        reserved = self.budget.acquire(estimate_tokens(request))
+        response = None
+        try:
+            with self._slots, span("claude_request", mode="create"):
+                response = self._with_retries(lambda: self._client.messages.create(**request))
+        finally:
+            self.budget.settle(reserved, _used_tokens(getattr(response, "usage", None)) if response else reserved)
+        _count_usage(response.usage)
+        return response
+
+    def stream(self, **request) -> "_Stream":
+        return _Stream(self, request)
+
+    def _with_retries(self, call):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return call()
+            except anthropic.APIStatusError as e:
+                if attempt == self.max_retries or not _retryable(e.status_code):
+                    raise
+                reason, delay = f"HTTP {e.status_code}", _retry_after(e) or _backoff(attempt)
+                count("claude_retries_total", reason=str(e.status_code))
+            except anthropic.APIConnectionError as e:
+                if attempt == self.max_retries:
+                    raise
+                reason, delay = type(e).__name__, _backoff(attempt)
+                count("claude_retries_total", reason="connection")
+            print(f"[Claude] ⚠️  {reason} — retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+class _Messages:
+    """client.messages, so callers keep the SDK's client.messages.create(...) shape."""
+
+    def __init__(self, client: ClaudeClient):
+        self._client = client
+
+    def create(self, **request):
+        return self._client.create(**request)
+
+    def stream(self, **request):
+        return self._client.stream(**request)
+
+
+class _Stream:
+    """Context manager around messages.stream(): throttled, capped and retried while opening."""
+
+    def __init__(self, client: ClaudeClient, request: dict):
+        self._client   = client
+        self._request  = request
+        self._manager  = None
+        self._stream   = None
+        self._span     = None
+        self._reserved = 0
+
+    def __enter__(self):
+        client = self._client
+        self._reserved = client.budget.acquire(estimate_tokens(self._request))
+        client._slots.acquire()
+        self._span = span("claude_request", mode="stream").start()
+        try:
+            def open_stream():
+                manager = client._client.messages.stream(**self._request)
+                return manager, manager.__enter__()
+            self._manager, stream = client._with_retries(open_stream)
+        except BaseException as e:
+            self._release(None, type(e).__name__)
+            raise
+        self._stream = stream
+        return stream
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._manager.__exit__(exc_type, exc, tb)
+        finally:
+            usage = getattr(getattr(self._stream, "current_message_snapshot", None), "usage", None)
+            self._release(usage, exc_type.__name__ if exc_type else None)
+        return False
+
+    def _release(self, usage, error):
+        self._span.end(error)
+        self._client._slots.release()
+        self._client.budget.settle(self._reserved, _used_tokens(usage) if usage else self._reserved)
+        _count_usage(usage)
+
+
+def _retryable(status: int) -> bool:
+    return status in RETRY_STATUSES or status >= 500
+
+
+def _retry_after(error) -> float:
+    try:
+        return min(float(error.response.headers.get("retry-after")), BACKOFF_MAX * 2) + random.uniform(0, 0.5)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)]."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+# ── SHARED INSTANCE ───────────────────────────────────────────
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> ClaudeClient:
+    """The process-wide client — against the local stub when CLAUDE_STUB is set."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if USE_STUB:
+                from claude_stub import start_stub
+                stub = start_stub()
+                _client = ClaudeClient(api_key="stub", base_url=stub.url)
+            else:
+                _client = ClaudeClient()
+        return _client
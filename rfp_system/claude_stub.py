@@ -0,0 +1,249 @@
+"""
+Claude Stub
+============
+A local stand-in for the Messages API (POST /v1/messages), for running the
+app and its checks without network access or an API key.
+
+    stub = start_stub()                    # or CLAUDE_STUB=1 with get_client()
+    client = ClaudeClient(api_key="stub", base_url=stub.url)
+
+Answers are deterministic and shaped like the real thing:
+    record_scores tool     a 4–9 score per criterion for every V-numbered
+                           vendor in the request (claude_scoring.py)
+    RFP template prompt    a small valid template JSON for the category
+    anything else          a short text reply
+
+Streaming requests get the same answer as server-sent events (message_start,
+content_block_* deltas, message_delta, message_stop). Prompt caching is
+mimicked: the first request with a given cached system block reports
+cache_creation_input_tokens, later ones cache_read_input_tokens.
+
+Fault injection for exercising retries:
+    StubServer(failures=[429, 529])        first two requests fail with those statuses
+    CLAUDE_STUB_FAILURES=429,529           same, for the shared stub
+    CLAUDE_STUB_LATENCY=0.2                seconds added to every request
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_FAILURES = [int(s) for s in os.environ.get("CLAUDE_STUB_FAILURES", "").split(",") if s.strip()]
+STUB_LATENCY  = float(os.environ.get("CLAUDE_STUB_LATENCY", "0"))
+
+_ERROR_TYPES = {400: "invalid_request_error", 401: "authentication_error", 429: "rate_limit_error",
+                500: "api_error", 529: "overloaded_error"}
+
+
+class StubServer:
+    """Threaded HTTP server answering /v1/messages on 127.0.0.1."""
+
+    def __init__(self, port: int = 0, failures=(), latency: float = 0.0, responder=None):
+        self.failures  = list(failures)
+        self.latency   = latency
+        self.responder = responder or default_responder
+        self.requests  = []                 # request bodies, in arrival order
+        self._cached   = set()
+        self._lock     = threading.Lock()
+        self._server   = ThreadingHTTPServer(("127.0.0.1", port), _handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="claude-stub").start()
+        print(f"[Claude Stub] Listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ── request handling ──────────────────────────────────────
+    def handle(self, body: dict):
+        """(status, message dict or error dict) for one request body."""
+        with self._lock:
+            self.requests.append(body)
+            status = self.failures.pop(0) if self.failures else 200
+        if self.latency:
+            time.sleep(self.latency)
+        if status != 200:
+            return status, {"type": "error",
+                            "error": {"type": _ERROR_TYPES.get(status, "api_error"), "message": "stub failure"}}
+
+        content, stop_reason = self.responder(body)
+        return 200, {
+            "id": f"msg_stub_{uuid.uuid4().hex[:16]}", "type": "message", "role": "assistant",
+            "model": body.get("model", "stub"), "content": content,
+            "stop_reason": stop_reason, "stop_sequence": None,
+            "usage": self._usage(body, content),
+        }
+
+    def _usage(self, body: dict, content: list) -> dict:
+        cached = "".join(b.get("text", "") for b in _system_blocks(body) if b.get("cache_control"))
+        cached_tokens = len(cached) // 4
+        with self._lock:
+            key = hashlib.sha256(cached.encode("utf-8")).hexdigest()
+            hit = key in self._cached
+            self._cached.add(key)
+        prompt_tokens = len(json.dumps([body.get("system"), body.get("tools"), body.get("messages")])) // 4
+        return {"input_tokens": max(1, prompt_tokens - cached_tokens),
+                "output_tokens": max(1, len(json.dumps(content)) // 4),
+                "cache_creation_input_tokens": 0 if hit or not cached else cached_tokens,
+                "cache_read_input_tokens": cached_tokens if hit else 0}
+
+
+def _handler(stub: StubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self._json(400, {"type": "error", "error": {"type": "invalid_request_error",
+                                                                    "message": "body is not JSON"}})
+            if self.path.split("?")[0] != "/v1/messages":
+                return self._json(404, {"type": "error", "error": {"type": "not_found_error",
+                                                                    "message": self.path}})
+            status, message = stub.handle(body)
+            if status == 200 and body.get("stream"):
+                return self._sse(message)
+            self._json(status, message)
+
+        def _json(self, status: int, payload: dict):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("retry-after", "0")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _sse(self, message: dict):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for event, data in sse_events(message):
+                self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def sse_events(message: dict, chunk: int = 40):
+    """(event, data) pairs that stream `message` the way the Messages API does."""
+    usage = message["usage"]
+    start = dict(message, content=[], stop_reason=None, usage=dict(usage, output_tokens=1))
+    yield "message_start", {"type": "message_start", "message": start}
+    for i, block in enumerate(message["content"]):
+        if block["type"] == "text":
+            yield "content_block_start", {"type": "content_block_start", "index": i,
+                                          "content_block": {"type": "text", "text": ""}}
+            text = block["text"]
+            for pos in range(0, len(text), chunk):
+                yield "content_block_delta", {"type": "content_block_delta", "index": i,
+                                              "delta": {"type": "text_delta", "text": text[pos:pos + chunk]}}
+        else:
+            yield "content_block_start", {"type": "content_block_start", "index": i,
+                                          "content_block": dict(block, input={})}
+            partial = json.dumps(block["input"])
+            for pos in range(0, len(partial), chunk):
+                yield "content_block_delta", {"type": "content_block_delta", "index": i,
+                                              "delta": {"type": "input_json_delta",
+                                                        "partial_json": partial[pos:pos + chunk]}}
+        yield "content_block_stop", {"type": "content_block_stop", "index": i}
+    yield "message_delta", {"type": "message_delta",
+                            "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                            "usage": {"output_tokens": usage["output_tokens"]}}
+    yield "message_stop", {"type": "message_stop"}
+
+
+# ── CANNED ANSWERS ────────────────────────────────────────────
+
+def default_responder(body: dict):
+    """(content blocks, stop_reason) for a request body."""
+    forced = (body.get("tool_choice") or {}).get("name")
+    tools  = {t.get("name"): t for t in body.get("tools") or []}
+    text   = _user_text(body)
+
+    if forced == "record_scores" and forced in tools:
+        criteria = list(tools[forced]["input_schema"]["properties"]["vendors"]["items"]
+                        ["properties"]["scores"]["properties"])
+        vendors = [{"id": ref, "scores": {c: _stub_score(name, c) for c in criteria}}
+                   for ref, name in re.findall(r"^(V\d+)\.\s+(.+?)(?:\s+—.*)?$", text, re.M)]
+        return [{"type": "tool_use", "id": f"toolu_stub_{uuid.uuid4().hex[:12]}",
+                 "name": forced, "input": {"vendors": vendors}}], "tool_use"
+
+    category = re.search(r'vendor category: "([^"]+)"', text)
+    if category:
+        return [{"type": "text", "text": json.dumps(_stub_template(category.group(1)))}], "end_turn"
+    return [{"type": "text", "text": "Stub response."}], "end_turn"
+
+
+def _system_blocks(body: dict) -> list:
+    system = body.get("system")
+    if isinstance(system, str):
+        return [{"type": "text", "text": system}]
+    return system or []
+
+
+def _user_text(body: dict) -> str:
+    parts = []
+    for message in body.get("messages") or []:
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts += [b.get("text", "") for b in content or [] if b.get("type") == "text"]
+    return "\n".join(parts)
+
+
+def _stub_score(vendor: str, criterion: str) -> int:
+    return 4 + hashlib.sha256(f"{vendor}|{criterion}".encode("utf-8")).digest()[0] % 6
+
+
+def _stub_template(category: str) -> dict:
+    titles = ["Company Background & History", "Technical Specifications & Integrations",
+              "Compliance & Security", "Pricing & Licensing Model",
+              "Implementation Timeline & Support", "References & Case Studies",
+              "SLA & Performance Guarantees"]
+    return {
+        "category": category,
+        "short_description": f"Request for proposal for {category} (stub template).",
+        "mandatory_requirements": ["Signed BAA", "SOC 2 Type II report", "HL7 FHIR support"],
+        "sections": [{"number": f"{i:02d}", "title": title,
+                      "description": f"Stub section {i} for {category}.",
+                      "questions": [f"{title}: stub question {q}?" for q in range(1, 4)]}
+                     for i, title in enumerate(titles, 1)],
+    }
+
+
+# ── SHARED INSTANCE ───────────────────────────────────────────
+
+_stub = None
+_stub_lock = threading.Lock()
+
+def start_stub() -> StubServer:
+    """The process-wide stub, started on first use on a free port."""
+    global _stub
+    with _stub_lock:
+        if _stub is None:
+            _stub = StubServer(failures=STUB_FAILURES, latency=STUB_LATENCY).start()
+        return _stub
@@ -0,0 +1,143 @@
+"""
+Document Cache
+===============
+Content-addressed store for generated RFP documents.
+
+A document is keyed on a stable hash of the template plus the rendering
+context, so a repeat request with the same category, organisation, vendors,
+criteria, restrictions, deadline and issue date is answered with the file
+that is already on disk.
+
+The store lives in the RFP output directory and is bounded two ways:
+    RFP_CACHE_MAX_MB         total size of RFP_*.docx files   (default 200)
+    RFP_CACHE_MAX_AGE_DAYS   days a document may go unused    (default 7)
+Least-recently-used documents are evicted first; a cache hit refreshes the
+file's mtime, which doubles as its last-used time. Staging files left by a
+render that never committed (a killed worker or process) are removed once
+they are older than STAGING_GRACE — twice RFP_NODE_TIMEOUT, long enough for
+a render to wait for a worker and then run to its timeout.
+
+Usage:
+    cache = DocumentCache(output_dir)
+    key   = document_key(template, context, backend)
+    path  = cache.path_for(category, key)
+    if not cache.hit(path):
+        build_rfp_docx(template, context, cache.staging_path(path))
+        cache.commit(path)
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import threading
+
+CACHE_VERSION = 1       # bump when the document layout changes
+MAX_BYTES     = int(float(os.environ.get("RFP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+MAX_AGE       = float(os.environ.get("RFP_CACHE_MAX_AGE_DAYS", "7")) * 86400
+STAGING_GRACE = 2 * float(os.environ.get("RFP_NODE_TIMEOUT", "60"))
+
+
+def document_key(template: dict, context: dict, backend: str) -> str:
+    """Stable SHA-256 of everything that affects the rendered document."""
+    material = {
+        "version":  CACHE_VERSION,
+        "backend":  backend,
+        "template": {k: v for k, v in template.items() if k != "context"},
+        "context":  {k: v for k, v in context.items() if not k.startswith("_")},
+    }
+    blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """Size- and age-bounded LRU store of RFP_*.docx files in one directory."""
+
+    def __init__(self, root: str, max_bytes: int = MAX_BYTES, max_age: float = MAX_AGE):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self.max_age   = max_age
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, category: str, key: str) -> str:
+        safe_name = re.sub(r'[^a-zA-Z0-9]', '_', category)
+        return os.path.join(self.root, f"RFP_{safe_name}_{key[:16]}.docx")
+
+    def staging_path(self, path: str) -> str:
+        return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+    def hit(self, path: str) -> bool:
+        """True if `path` is cached and fresh. Marks it as recently used."""
+        try:
+            age = time.time() - os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        if age > self.max_age:
+            self._remove(path)
+            return False
+        os.utime(path)
+        return True
+
+    def commit(self, path: str):
+        """Move a fully written staging file into place, then enforce the bounds."""
+        os.replace(self.staging_path(path), path)
+        self.prune(keep=path)
+
+    def discard(self, path: str):
+        self._remove(self.staging_path(path))
+
+    def prune(self, keep: str = None) -> int:
+        """
+        Remove abandoned staging files, evict expired documents, then
+        least-recently-used ones until under max_bytes. Returns the number of
+        files removed.
+        """
+        now, entries = time.time(), []
+        abandoned = 0
+        for path in glob.glob(os.path.join(self.root, "RFP_*.docx.*.tmp")):
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > STAGING_GRACE:
+                abandoned += self._remove(path)
+        if abandoned:
+            print(f"[Doc Cache] Removed {abandoned} abandoned staging file(s) from {self.root}")
+
+        for path in glob.glob(os.path.join(self.root, "RFP_*.docx")):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        evicted, total = 0, 0
+        live = []
+        for mtime, size, path in entries:
+            if now - mtime > self.max_age and path != keep:
+                evicted += self._remove(path)
+            else:
+                live.append((mtime, size, path))
+                total += size
+
+        for mtime, size, path in sorted(live):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            evicted += self._remove(path)
+            total -= size
+
+        if evicted:
+            print(f"[Doc Cache] Evicted {evicted} document(s) from {self.root}")
+        return evicted + abandoned
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.unlink(path)
+            return 1
+        except FileNotFoundError:
+            return 0
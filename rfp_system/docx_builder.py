@@ -3,407 +3,412 @@ DOCX Builder
 =============
 Renders an RFP template dictionary into a professional .docx Word document.
 Works with both pre-built templates and AI-generated ones — same output quality.
+
+Backends (pick with `backend=` or the RFP_DOCX_BACKEND environment variable):
+    node     docx-js via the Node worker pool, one-shot `node` as fallback
+    python   python-docx, in-process — no Node needed
+    auto     node when `node` is on PATH and can load docx-js, otherwise python
+             (default); the check runs once per process
 """
 
 import os
 import sys
+import functools
 sys.path.insert(0, '/home/claude/.npm-global/lib/node_modules')
 
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches, Twips
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK, WD_TAB_ALIGNMENT
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-import subprocess, json, tempfile
+import subprocess, json, shutil
+
+from node_pool import get_pool, node_env, WorkerError
+from telemetry import span
+
+RENDERER_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docx_renderer.js")
+BACKENDS    = ("auto", "node", "python")
 
 # We use docx-js (node) for generation — consistent with SKILL.md
-# This module writes the JS, runs node, and outputs the .docx
+# docx_renderer.js is a fixed renderer that takes the template and context as
+# JSON. Documents are rendered by a pool of long-lived Node workers
+# (node_pool.py); if the pool is unavailable, a single `node docx_renderer.js`
+# process is run instead.
 
-def build_rfp_docx(template: dict, context: dict, output_path: str):
+def build_rfp_docx(template: dict, context: dict, output_path: str, backend: str = None):
     """
     Generate a .docx RFP document from template + context.
-    Uses docx-js via Node.js for maximum formatting quality.
+    Uses docx-js via Node.js for maximum formatting quality, or python-docx
+    in-process when backend="python".
     """
-    context["_output_path"] = output_path
-    js_code = _render_js(template, context)
-
-    # Write temp JS file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-        f.write(js_code)
-        tmp_js = f.name
-
+    backend = resolve_backend(backend)
+    payload = _template_data(template)
+
+    if backend == "python":
+        with span("docx_render", backend="python"):
+            _build_python(payload, context, output_path)
+        print(f"[DOCX Builder] RFP document generated: {output_path}")
+        return
+
+    pool = get_pool()
+    if pool.enabled:
+        try:
+            with span("js_render", mode="pool"):
+                docx_bytes = pool.render(payload, context)
+        except WorkerError as e:
+            print(f"[DOCX Builder] Worker pool unavailable — falling back to one-shot node ({str(e).splitlines()[0]})")
+        else:
+            with span("file_write"):
+                with open(output_path, "wb") as f:
+                    f.write(docx_bytes)
+            print(f"[DOCX Builder] RFP document generated: {output_path}")
+            return
+
+    _build_oneshot(payload, context, output_path)
+
+
+def resolve_backend(backend: str = None) -> str:
+    """Turn a backend name (or None → RFP_DOCX_BACKEND) into "node" or "python"."""
+    backend = (backend or os.environ.get("RFP_DOCX_BACKEND") or "auto").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown DOCX backend {backend!r} — expected one of {', '.join(BACKENDS)}")
+    if backend == "auto":
+        return "node" if _node_ready() else "python"
+    return backend
+
+
+@functools.lru_cache(maxsize=1)
+def _node_ready() -> bool:
+    """True if `node` is on PATH and can require('docx') — probed once."""
+    if not shutil.which("node"):
+        return False
     try:
+        check = subprocess.run(["node", "-e", "require('docx')"],
+                               capture_output=True, timeout=30, env=node_env())
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    if check.returncode != 0:
+        print("[DOCX Builder] node is installed but docx-js is not — using python-docx")
+    return check.returncode == 0
+
+
+def _build_oneshot(template: dict, context: dict, output_path: str):
+    """Render with a fresh `node docx_renderer.js` process, passing the data on stdin."""
+    with span("node_subprocess"):
         result = subprocess.run(
-            ['node', tmp_js],
-            capture_output=True, text=True, timeout=60
+            ['node', RENDERER_JS, output_path],
+            input=json.dumps({"template": template, "context": context}),
+            capture_output=True, text=True, timeout=60, env=node_env()
         )
-        if result.returncode != 0:
-            raise RuntimeError(f"Node.js error:\n{result.stderr}")
-        print(f"[DOCX Builder] {result.stdout.strip()}")
-    finally:
-        os.unlink(tmp_js)
-
-
-def _esc(text: str) -> str:
-    """Escape text for safe embedding in JS template literals."""
-    return (text or "").\
-        replace("\\", "\\\\").\
-        replace("`",  "\\`").\
-        replace("$",  "\\$").\
-        replace("\n", " ").\
-        replace('"',  '\\"')
-
-
-def _render_js(template: dict, context: dict) -> str:
-    """Render the full Node.js docx-generation script."""
-
-    category        = _esc(context["category"])
-    org_name        = _esc(context["org_name"])
-    issue_date      = _esc(context["issue_date"])
-    ref_number      = _esc(context["ref_number"])
-    deadline_weeks  = _esc(context["deadline_weeks"])
-    short_desc      = _esc(template.get("short_description", category))
-    source          = context.get("source", "template")
-    source_note     = "" if source == "template" else "AI-Generated Template"
-
-    # Top vendors list
-    vendors_js = json.dumps(context.get("top_vendors", []))
-
-    # Restrictions
-    restrictions_js = json.dumps(context.get("restrictions", []))
-
-    # Criteria rows for scoring table
-    criteria_rows = ""
-    for i, (crit, info) in enumerate(context.get("criteria", {}).items()):
-        w    = info.get("weight", 0)
-        desc = info.get("desc", "")
-        fill = "FFFFFF" if i % 2 == 0 else "F2F4F6"
-        criteria_rows += f"""
-    new TableRow({{ children: [
-      _cell({json.dumps(crit)},  4000, "{fill}", true,  "1B2E45"),
-      _cell("{w}%",              1200, "{fill}", true,  "0D7A6B", WD_CENTER),
-      _cell({json.dumps(desc)},  4160, "{fill}", false, "1A1A2E"),
-    ]}}),"""
-
-    # Mandatory requirements bullets
-    mandatory = template.get("mandatory_requirements", [])
-    mandatory_bullets = "\n".join(
-        f'    _bullet({json.dumps(r)}),' for r in mandatory
-    )
-
-    # Sections
-    sections_js = ""
+    if result.returncode != 0:
+        raise RuntimeError(f"Node.js error:\n{result.stderr}")
+    print(f"[DOCX Builder] {result.stdout.strip()}")
+
+
+def _template_data(template: dict) -> dict:
+    """The template without the runtime context that generate_rfp attaches to it."""
+    return {k: v for k, v in template.items() if k != "context"}
+
+
+# ── PYTHON-DOCX BACKEND ───────────────────────────────────────
+# Same layout as docx_renderer.js: cover page, overview, one banner + question
+# table per section, scoring criteria table, header and footer.
+
+NAVY    = "1B2E45"
+TEAL    = "0D7A6B"
+LTGRAY  = "F2F4F6"
+MIDGRAY = "D0D5DD"
+WHITE   = "FFFFFF"
+DKTEXT  = "1A1A2E"
+GREY    = "888888"
+RED     = "CC0000"
+
+# Schema order of the children we insert into pPr / tcPr / tblPr
+_PPR_AFTER_PBDR  = ("w:shd", "w:tabs", "w:suppressAutoHyphens", "w:spacing", "w:ind",
+                    "w:contextualSpacing", "w:jc", "w:textDirection", "w:outlineLvl",
+                    "w:rPr", "w:sectPr", "w:pPrChange")
+_TCPR_AFTER      = {"w:tcBorders": ("w:shd", "w:noWrap", "w:tcMar", "w:textDirection",
+                                    "w:tcFitText", "w:vAlign", "w:hideMark"),
+                    "w:shd":       ("w:noWrap", "w:tcMar", "w:textDirection",
+                                    "w:tcFitText", "w:vAlign", "w:hideMark"),
+                    "w:tcMar":     ("w:textDirection", "w:tcFitText", "w:vAlign", "w:hideMark")}
+_TBLPR_AFTER_BDR = ("w:shd", "w:tblLayout", "w:tblCellMar", "w:tblLook",
+                    "w:tblCaption", "w:tblDescription")
+
+
+def _flat(text) -> str:
+    return str(text or "").replace("\n", " ")
+
+
+def _border_el(tag: str, sides: dict) -> OxmlElement:
+    """<tag> with one child per side; value None means no border."""
+    el = OxmlElement(tag)
+    for side, spec in sides.items():
+        b = OxmlElement(f"w:{side}")
+        if spec is None:
+            b.set(qn("w:val"), "nil")
+        else:
+            size, color, space = spec
+            b.set(qn("w:val"), "single")
+            b.set(qn("w:sz"), str(size))
+            b.set(qn("w:space"), str(space))
+            b.set(qn("w:color"), color)
+        el.append(b)
+    return el
+
+
+def _all_sides(spec, inside: bool = False) -> dict:
+    sides = ("top", "left", "bottom", "right") + (("insideH", "insideV") if inside else ())
+    return {side: spec for side in sides}
+
+
+def _run(par, text: str, size: int = 22, bold: bool = False, italic: bool = False, color: str = DKTEXT):
+    run = par.add_run(text)
+    run.bold   = bold
+    run.italic = italic
+    run.font.name  = "Arial"
+    run.font.size  = Pt(size / 2)
+    run.font.color.rgb = RGBColor.from_string(color)
+    return run
+
+
+def _para(container, text: str, align=WD_ALIGN_PARAGRAPH.LEFT, before: int = 80, after: int = 80, **run_opts):
+    par = container.add_paragraph()
+    par.alignment = align
+    par.paragraph_format.space_before = Twips(before)
+    par.paragraph_format.space_after  = Twips(after)
+    _run(par, text, **run_opts)
+    return par
+
+
+def _centered(doc, text: str, before: int = 0, after: int = 80, **run_opts):
+    return _para(doc, text, align=WD_ALIGN_PARAGRAPH.CENTER, before=before, after=after, **run_opts)
+
+
+def _spacer(doc, before: int = 160):
+    par = doc.add_paragraph()
+    par.paragraph_format.space_before = Twips(before)
+    par.paragraph_format.space_after  = Twips(0)
+
+
+def _page_break(doc):
+    doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+
+
+def _bullet(doc, text: str):
+    par = doc.add_paragraph(style="List Bullet")
+    par.paragraph_format.space_before = Twips(60)
+    par.paragraph_format.space_after  = Twips(60)
+    _run(par, text)
+
+
+def _para_border(par, sides: dict):
+    par._p.get_or_add_pPr().insert_element_before(_border_el("w:pBdr", sides), *_PPR_AFTER_PBDR)
+
+
+def _table(container, widths: list, borders: dict = None, **kwargs):
+    table = container.add_table(rows=0, cols=len(widths), **kwargs)
+    table.autofit = False
+    for col, w in zip(table.columns, widths):
+        col.width = Twips(w)
+    if borders is not None:
+        table._tbl.tblPr.insert_element_before(_border_el("w:tblBorders", borders), *_TBLPR_AFTER_BDR)
+    return table
+
+
+def _cell(cell, text: str, width: int, fill: str = None, bold: bool = False, color: str = DKTEXT,
+          align=WD_ALIGN_PARAGRAPH.LEFT, size: int = 20, border=(1, MIDGRAY, 0),
+          margins=(100, 100, 160, 160), valign=WD_ALIGN_VERTICAL.CENTER):
+    cell.width = Twips(width)
+    tcPr = cell._tc.get_or_add_tcPr()
+    tcPr.insert_element_before(_border_el("w:tcBorders", _all_sides(border)), *_TCPR_AFTER["w:tcBorders"])
+    if fill:
+        shd = OxmlElement("w:shd")
+        shd.set(qn("w:val"), "clear")
+        shd.set(qn("w:color"), "auto")
+        shd.set(qn("w:fill"), fill)
+        tcPr.insert_element_before(shd, *_TCPR_AFTER["w:shd"])
+    mar = OxmlElement("w:tcMar")
+    for side, value in zip(("top", "bottom", "left", "right"), margins):
+        m = OxmlElement(f"w:{side}")
+        m.set(qn("w:w"), str(value))
+        m.set(qn("w:type"), "dxa")
+        mar.append(m)
+    tcPr.insert_element_before(mar, *_TCPR_AFTER["w:tcMar"])
+    if valign is not None:
+        cell.vertical_alignment = valign
+
+    par = cell.paragraphs[0]
+    par.alignment = align
+    _run(par, text or "", size=size, bold=bold, color=color)
+    return cell
+
+
+def _header_cell(cell, text: str, width: int):
+    return _cell(cell, text, width, NAVY, bold=True, color=WHITE, border=(1, NAVY, 0), valign=None)
+
+
+def _row(table):
+    return table.add_row().cells
+
+
+def _banner(doc, number: str, title: str):
+    table = _table(doc, [800, 8560], borders=_all_sides(None, inside=True))
+    left, right = _row(table)
+    _cell(left, number, 800, TEAL, bold=True, color=WHITE, size=28, border=None,
+          align=WD_ALIGN_PARAGRAPH.CENTER, margins=(120, 120, 160, 160))
+    _cell(right, title, 8560, NAVY, bold=True, color=WHITE, size=26, border=None,
+          margins=(120, 120, 200, 160))
+
+
+def _info_row(table, label: str, value: str, i: int):
+    fill = LTGRAY if i % 2 == 0 else WHITE
+    a, b = _row(table)
+    _cell(a, label, 2800, fill, bold=True, color=NAVY)
+    _cell(b, value, 6560, fill)
+
+
+def _build_python(template: dict, context: dict, output_path: str):
+    """Render the RFP in-process with python-docx."""
+    category       = _flat(context.get("category"))
+    org_name       = _flat(context.get("org_name"))
+    issue_date     = _flat(context.get("issue_date"))
+    ref_number     = _flat(context.get("ref_number"))
+    deadline_weeks = _flat(context.get("deadline_weeks"))
+    short_desc     = _flat(template.get("short_description") or category)
+    source_note    = "" if context.get("source", "template") == "template" else "AI-Generated Template"
+    top_vendors    = context.get("top_vendors", [])
+
+    doc = Document()
+    normal = doc.styles["Normal"]
+    normal.font.name = "Arial"
+    normal.font.size = Pt(11)
+    normal.font.color.rgb = RGBColor.from_string(DKTEXT)
+
+    section = doc.sections[0]
+    section.page_width, section.page_height = Twips(12240), Twips(15840)
+    section.top_margin = section.bottom_margin = Twips(1440)
+    section.left_margin = section.right_margin = Twips(1260)
+
+    # ── Header / footer ──
+    header = section.header
+    table  = _table(header, [6200, 3520], width=Twips(9720),
+                    borders=dict(_all_sides(None, inside=True), bottom=(1, TEAL, 0)))
+    a, b = _row(table)
+    _cell(a, f"REQUEST FOR PROPOSAL — {category.upper()}", 6200, bold=True, color=NAVY, size=18,
+          border=None, margins=(0, 80, 0, 0), valign=None)
+    _cell(b, "CONFIDENTIAL", 3520, bold=True, color=TEAL, size=18, border=None,
+          align=WD_ALIGN_PARAGRAPH.RIGHT, margins=(0, 80, 0, 0), valign=None)
+    header.paragraphs[0]._p.addprevious(table._tbl)
+
+    footer = section.footer.paragraphs[0]
+    footer.paragraph_format.space_before = Twips(80)
+    footer.paragraph_format.tab_stops.add_tab_stop(Twips(9360), WD_TAB_ALIGNMENT.RIGHT)
+    _para_border(footer, {"top": (4, MIDGRAY, 4)})
+    _run(footer, f"{org_name} — Confidential & Proprietary", size=18, color=GREY)
+    _run(footer, f"\t{ref_number}", size=18, color=GREY)
+
+    # ── Cover page ──
+    _spacer(doc, 2880)
+    _centered(doc, "REQUEST FOR PROPOSAL", after=0, bold=True, size=56, color=NAVY)
+    _centered(doc, category, before=120, after=0, size=40, color=TEAL)
+    _spacer(doc, 80)
+    _centered(doc, short_desc, size=22, color=GREY, italic=True)
+    _spacer(doc, 320)
+    rule = _centered(doc, "  ", size=8)
+    _para_border(rule, {"top": (8, TEAL, 4), "bottom": (8, TEAL, 4)})
+    _spacer(doc, 240)
+    _centered(doc, f"Issued by: {org_name}", size=24)
+    _centered(doc, f"Issue Date: {issue_date}", size=24)
+    _centered(doc, f"Response Deadline: [Insert Date — {deadline_weeks} weeks from issue]",
+              size=24, color=RED, bold=True)
+    _centered(doc, f"RFP Reference: {ref_number}", size=24)
+    if source_note:
+        _centered(doc, f"⚡ {source_note}", before=80, after=0, size=18, color=TEAL)
+    _spacer(doc, 400)
+    if top_vendors:
+        _centered(doc, "Shortlisted Vendors: " + " • ".join(top_vendors), size=20, color="555555")
+    _spacer(doc, 200)
+    _centered(doc, "CONFIDENTIAL — FOR NAMED RECIPIENTS ONLY", after=0, bold=True, size=20, color=GREY)
+
+    # ── Section 00: Overview ──
+    _page_break(doc)
+    _banner(doc, "00", "Overview & Submission Details")
+    _spacer(doc, 160)
+    _para(doc, f"This Request for Proposal invites qualified vendors to submit proposals for: {short_desc}")
+    _spacer(doc)
+    info = _table(doc, [2800, 6560], borders=_all_sides((1, MIDGRAY, 0), inside=True))
+    for i, (label, value) in enumerate([
+        ("RFP Reference",        ref_number),
+        ("Category",             category),
+        ("Issuing Organisation", org_name),
+        ("Issue Date",           issue_date),
+        ("Response Deadline",    f"[Insert Date — {deadline_weeks} weeks from above]"),
+        ("Submission Email",     "[procurement@yourorganisation.com]"),
+        ("Questions Deadline",   "[Insert Date — 5 business days after issue]"),
+        ("RFP Contact",          "[Name, Title, Email, Phone]"),
+    ]):
+        _info_row(info, label, value, i)
+    _spacer(doc)
+    _para(doc, "Mandatory Requirements — vendors failing any item below are automatically disqualified:",
+          bold=True, color=RED)
+    _spacer(doc, 80)
+    for r in context.get("restrictions", []):
+        _bullet(doc, r)
+
+    # ── Dynamic sections ──
     for sec in template.get("sections", []):
-        num   = _esc(sec.get("number", ""))
-        title = _esc(sec.get("title", ""))
-        desc  = _esc(sec.get("description", ""))
-        questions = sec.get("questions", [])
-        q_rows = ""
-        for qi, q in enumerate(questions):
-            fill = "FFFFFF" if qi % 2 == 0 else "F2F4F6"
-            q_rows += f"""
-      new TableRow({{ children: [
-        _cell({json.dumps(q)}, 5500, "{fill}", false, "1A1A2E"),
-        _cell("",              3860, "{fill}", false, "1A1A2E"),
-      ]}}),"""
-
-        sections_js += f"""
-  // ── Section {num}: {title} ──
-  _pageBreak(),
-  _banner("{num}", "{title}"),
-  _spacer(160),
-  _para("{desc}", {{ size: 22 }}),
-  _spacer(120),
-  new Table({{
-    width: {{ size: 9360, type: WidthType.DXA }},
-    columnWidths: [5500, 3860],
-    rows: [
-      new TableRow({{ children: [
-        _headerCell("Question / Requirement", 5500),
-        _headerCell("Vendor Response",        3860),
-      ]}}),{q_rows}
-    ]
-  }}),"""
-
-    output_path_escaped = _esc(context.get("_output_path", "/tmp/rfp_output.docx"))
-
-    return f"""
-const {{
-  Document, Packer, Paragraph, TextRun, Table, TableRow, TableCell,
-  Header, Footer, AlignmentType, HeadingLevel, BorderStyle, WidthType,
-  ShadingType, VerticalAlign, PageBreak, LevelFormat,
-  TabStopType, TabStopPosition
-}} = require('docx');
-const fs = require('fs');
-
-const NAVY    = "1B2E45";
-const TEAL    = "0D7A6B";
-const LTGRAY  = "F2F4F6";
-const MIDGRAY = "D0D5DD";
-const WHITE   = "FFFFFF";
-const DKTEXT  = "1A1A2E";
-const WD_CENTER = AlignmentType.CENTER;
-const WD_RIGHT  = AlignmentType.RIGHT;
-
-const OUTPUT_PATH = {json.dumps(output_path_escaped)};
-
-// ── Helpers ───────────────────────────────────────────────────
-const _b  = (c="D0D5DD") => ({{ style: BorderStyle.SINGLE, size: 1, color: c }});
-const _ab = (c="D0D5DD") => ({{ top: _b(c), bottom: _b(c), left: _b(c), right: _b(c) }});
-const _nb = () => ({{ style: BorderStyle.NONE, size: 0, color: "FFFFFF" }});
-const _nbs = () => ({{ top: _nb(), bottom: _nb(), left: _nb(), right: _nb() }});
-
-function _para(text, opts={{}}) {{
-  return new Paragraph({{
-    alignment: opts.align || AlignmentType.LEFT,
-    spacing: {{ before: opts.before ?? 80, after: opts.after ?? 80 }},
-    children: [new TextRun({{ text, bold: opts.bold||false, italics: opts.italic||false,
-      size: opts.size||22, color: opts.color||DKTEXT, font: "Arial" }})]
-  }});
-}}
-
-function _spacer(before=160) {{
-  return new Paragraph({{ spacing: {{ before, after: 0 }}, children: [new TextRun("")] }});
-}}
-
-function _pageBreak() {{
-  return new Paragraph({{ children: [new PageBreak()] }});
-}}
-
-function _bullet(text) {{
-  return new Paragraph({{
-    numbering: {{ reference: "bullets", level: 0 }},
-    spacing: {{ before: 60, after: 60 }},
-    children: [new TextRun({{ text, size: 22, color: DKTEXT, font: "Arial" }})]
-  }});
-}}
-
-function _cell(text, width, fill, bold=false, color=DKTEXT, align=AlignmentType.LEFT) {{
-  return new TableCell({{
-    width: {{ size: width, type: WidthType.DXA }},
-    shading: {{ fill, type: ShadingType.CLEAR }},
-    margins: {{ top: 100, bottom: 100, left: 160, right: 160 }},
-    borders: _ab(MIDGRAY),
-    verticalAlign: VerticalAlign.CENTER,
-    children: [new Paragraph({{ alignment: align,
-      children: [new TextRun({{ text: text||"", bold, size: 20, color, font: "Arial" }})] }})]
-  }});
-}}
-
-function _headerCell(text, width) {{
-  return new TableCell({{
-    width: {{ size: width, type: WidthType.DXA }},
-    shading: {{ fill: NAVY, type: ShadingType.CLEAR }},
-    margins: {{ top: 100, bottom: 100, left: 160, right: 160 }},
-    borders: _ab(NAVY),
-    children: [new Paragraph({{
-      children: [new TextRun({{ text, bold: true, size: 20, color: WHITE, font: "Arial" }})]
-    }})]
-  }});
-}}
-
-function _infoRow(label, value, i) {{
-  const fill = i % 2 === 0 ? LTGRAY : WHITE;
-  return new TableRow({{ children: [
-    _cell(label, 2800, fill, true,  NAVY),
-    _cell(value, 6560, fill, false, DKTEXT),
-  ]}});
-}}
-
-function _banner(number, title) {{
-  return new Table({{
-    width: {{ size: 9360, type: WidthType.DXA }},
-    columnWidths: [800, 8560],
-    borders: {{ top: _nb(), bottom: _nb(), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() }},
-    rows: [new TableRow({{ children: [
-      new TableCell({{
-        width: {{ size: 800, type: WidthType.DXA }},
-        shading: {{ fill: TEAL, type: ShadingType.CLEAR }},
-        margins: {{ top: 120, bottom: 120, left: 160, right: 160 }},
-        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
-        children: [new Paragraph({{ alignment: AlignmentType.CENTER,
-          children: [new TextRun({{ text: number, bold: true, size: 28, color: WHITE, font: "Arial" }})] }})]
-      }}),
-      new TableCell({{
-        width: {{ size: 8560, type: WidthType.DXA }},
-        shading: {{ fill: NAVY, type: ShadingType.CLEAR }},
-        margins: {{ top: 120, bottom: 120, left: 200, right: 160 }},
-        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
-        children: [new Paragraph({{
-          children: [new TextRun({{ text: title, bold: true, size: 26, color: WHITE, font: "Arial" }})] }})]
-      }}),
-    ]}})]
-  }});
-}}
-
-// ── Document ──────────────────────────────────────────────────
-const topVendors  = {vendors_js};
-const restrictions = {restrictions_js};
-const sourceNote  = "{source_note}";
-
-const doc = new Document({{
-  numbering: {{ config: [
-    {{ reference: "bullets",
-       levels: [{{ level: 0, format: LevelFormat.BULLET, text: "\\u2022",
-         alignment: AlignmentType.LEFT,
-         style: {{ paragraph: {{ indent: {{ left: 720, hanging: 360 }} }} }} }}] }},
-    {{ reference: "numbers",
-       levels: [{{ level: 0, format: LevelFormat.DECIMAL, text: "%1.",
-         alignment: AlignmentType.LEFT,
-         style: {{ paragraph: {{ indent: {{ left: 720, hanging: 360 }} }} }} }}] }},
-  ]}},
-  styles: {{
-    default: {{ document: {{ run: {{ font: "Arial", size: 22, color: DKTEXT }} }} }},
-    paragraphStyles: [
-      {{ id: "Heading1", name: "Heading 1", basedOn: "Normal", next: "Normal", quickFormat: true,
-        run: {{ size: 32, bold: true, font: "Arial", color: NAVY }},
-        paragraph: {{ spacing: {{ before: 320, after: 160 }}, outlineLevel: 0 }} }},
-      {{ id: "Heading2", name: "Heading 2", basedOn: "Normal", next: "Normal", quickFormat: true,
-        run: {{ size: 26, bold: true, font: "Arial", color: TEAL }},
-        paragraph: {{ spacing: {{ before: 240, after: 120 }}, outlineLevel: 1 }} }},
-    ]
-  }},
-  sections: [{{
-    properties: {{
-      page: {{
-        size: {{ width: 12240, height: 15840 }},
-        margin: {{ top: 1440, right: 1260, bottom: 1440, left: 1260 }}
-      }}
-    }},
-    headers: {{
-      default: new Header({{ children: [
-        new Table({{
-          width: {{ size: 9720, type: WidthType.DXA }},
-          columnWidths: [6200, 3520],
-          borders: {{ top: _nb(), bottom: _b(TEAL), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() }},
-          rows: [new TableRow({{ children: [
-            new TableCell({{ width: {{ size: 6200, type: WidthType.DXA }}, borders: _nbs(), margins: {{ bottom: 80 }},
-              children: [new Paragraph({{ children: [new TextRun({{ text: "REQUEST FOR PROPOSAL — {category.upper()}", bold: true, size: 18, color: NAVY, font: "Arial" }})] }})] }}),
-            new TableCell({{ width: {{ size: 3520, type: WidthType.DXA }}, borders: _nbs(), margins: {{ bottom: 80 }},
-              children: [new Paragraph({{ alignment: AlignmentType.RIGHT, children: [new TextRun({{ text: "CONFIDENTIAL", size: 18, color: TEAL, bold: true, font: "Arial" }})] }})] }}),
-          ]}})]
-        }})
-      ]}})
-    }},
-    footers: {{
-      default: new Footer({{ children: [
-        new Paragraph({{
-          spacing: {{ before: 80 }},
-          border: {{ top: {{ style: BorderStyle.SINGLE, size: 4, color: MIDGRAY, space: 4 }} }},
-          tabStops: [{{ type: TabStopType.RIGHT, position: 9360 }}],
-          children: [
-            new TextRun({{ text: "{org_name} \\u2014 Confidential & Proprietary", size: 18, color: "888888", font: "Arial" }}),
-            new TextRun({{ text: "\\t{ref_number}", size: 18, color: "888888", font: "Arial" }}),
-          ]
-        }})
-      ]}})
-    }},
-
-    children: [
-
-      // ── Cover Page ───────────────────────────────────────────
-      _spacer(2880),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 0 }},
-        children: [new TextRun({{ text: "REQUEST FOR PROPOSAL", bold: true, size: 56, color: NAVY, font: "Arial" }})] }}),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 120, after: 0 }},
-        children: [new TextRun({{ text: "{category}", size: 40, color: TEAL, font: "Arial" }})] }}),
-      _spacer(80),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        children: [new TextRun({{ text: "{short_desc}", size: 22, color: "888888", italics: true, font: "Arial" }})] }}),
-      _spacer(320),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        border: {{ top: {{ style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 }},
-                   bottom: {{ style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 }} }},
-        children: [new TextRun({{ text: "  ", size: 8, font: "Arial" }})] }}),
-      _spacer(240),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        children: [new TextRun({{ text: "Issued by: {org_name}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        children: [new TextRun({{ text: "Issue Date: {issue_date}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        children: [new TextRun({{ text: "Response Deadline: [Insert Date \\u2014 {deadline_weeks} weeks from issue]", size: 24, color: "CC0000", bold: true, font: "Arial" }})] }}),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-        children: [new TextRun({{ text: "RFP Reference: {ref_number}", size: 24, color: DKTEXT, font: "Arial" }})] }}),
-      ...(sourceNote ? [new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 80, after: 0 }},
-        children: [new TextRun({{ text: "\\u26A1 " + sourceNote, size: 18, color: TEAL, font: "Arial" }})] }})] : []),
-      _spacer(400),
-      ...(topVendors.length > 0 ? [
-        new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 0, after: 80 }},
-          children: [new TextRun({{ text: "Shortlisted Vendors: " + topVendors.join(" \\u2022 "), size: 20, color: "555555", font: "Arial" }})] }}),
-      ] : []),
-      _spacer(200),
-      new Paragraph({{ alignment: AlignmentType.CENTER,
-        children: [new TextRun({{ text: "CONFIDENTIAL \\u2014 FOR NAMED RECIPIENTS ONLY", bold: true, size: 20, color: "888888", font: "Arial" }})] }}),
-
-      // ── Section 00: Overview ─────────────────────────────────
-      _pageBreak(),
-      _banner("00", "Overview & Submission Details"),
-      _spacer(160),
-      _para("This Request for Proposal invites qualified vendors to submit proposals for: {short_desc}"),
-      _spacer(),
-      new Table({{
-        width: {{ size: 9360, type: WidthType.DXA }},
-        columnWidths: [2800, 6560],
-        borders: {{ ...Object.fromEntries(["top","bottom","left","right","insideH","insideV"].map(k => [k, _b()])) }},
-        rows: [
-          _infoRow("RFP Reference",       "{ref_number}",  0),
-          _infoRow("Category",            "{category}",    1),
-          _infoRow("Issuing Organisation","{org_name}",    0),
-          _infoRow("Issue Date",          "{issue_date}",  1),
-          _infoRow("Response Deadline",   "[Insert Date \\u2014 {deadline_weeks} weeks from above]", 0),
-          _infoRow("Submission Email",    "[procurement@yourorganisation.com]", 1),
-          _infoRow("Questions Deadline",  "[Insert Date \\u2014 5 business days after issue]", 0),
-          _infoRow("RFP Contact",         "[Name, Title, Email, Phone]", 1),
-        ]
-      }}),
-      _spacer(),
-      _para("Mandatory Requirements — vendors failing any item below are automatically disqualified:", {{ bold: true, color: "CC0000" }}),
-      _spacer(80),
-      ...restrictions.map(r => _bullet(r)),
-
-      // ── Dynamic Sections ─────────────────────────────────────
-      {sections_js}
-
-      // ── Scoring Criteria ─────────────────────────────────────
-      _pageBreak(),
-      _banner("EV", "Evaluation Criteria & Scoring"),
-      _spacer(160),
-      _para("All proposals will be scored by the Vendor Selection Committee using the weighted criteria below. Scores are 0\\u201310 per criterion, multiplied by the weight to produce a total out of 100."),
-      _spacer(120),
-      new Table({{
-        width: {{ size: 9360, type: WidthType.DXA }},
-        columnWidths: [4000, 1200, 4160],
-        rows: [
-          new TableRow({{ children: [
-            _headerCell("Criterion",          4000),
-            _headerCell("Weight",             1200),
-            _headerCell("Key Evaluation Focus", 4160),
-          ]}}),
-          {criteria_rows}
-        ]
-      }}),
-      _spacer(),
-      _para("Submission Instructions", {{ bold: true, size: 24, color: NAVY }}),
-      _spacer(80),
-      _bullet("Submit as a single PDF: [CompanyName]_{ref_number}.pdf"),
-      _bullet("Email to: [procurement@yourorganisation.com] — Subject: {ref_number} Proposal"),
-      _bullet("Proposals must arrive by the deadline date at 5:00 PM local time."),
-      _bullet("All questions in writing only to the procurement contact above."),
-      _bullet("Proposals valid for minimum 90 days from submission deadline."),
-      _bullet("The Organisation reserves the right to reject any or all proposals without obligation."),
-      _spacer(400),
-      new Paragraph({{ alignment: AlignmentType.CENTER, spacing: {{ before: 160, after: 80 }},
-        children: [new TextRun({{ text: "\\u2014 End of Request for Proposal \\u2014", bold: true, size: 22, color: NAVY, font: "Arial" }})] }}),
-      new Paragraph({{ alignment: AlignmentType.CENTER,
-        children: [new TextRun({{ text: "Thank you for your interest. We look forward to reviewing your proposal.", size: 20, color: "888888", font: "Arial" }})] }}),
-
-    ]
-  }}]
-}});
-
-Packer.toBuffer(doc).then(buffer => {{
-  fs.writeFileSync(OUTPUT_PATH, buffer);
-  console.log("RFP document generated: " + OUTPUT_PATH);
-}});
-"""
+        _page_break(doc)
+        _banner(doc, _flat(sec.get("number")), _flat(sec.get("title")))
+        _spacer(doc, 160)
+        _para(doc, _flat(sec.get("description")))
+        _spacer(doc, 120)
+        table = _table(doc, [5500, 3860])
+        a, b = _row(table)
+        _header_cell(a, "Question / Requirement", 5500)
+        _header_cell(b, "Vendor Response",        3860)
+        for qi, q in enumerate(sec.get("questions", [])):
+            fill = WHITE if qi % 2 == 0 else LTGRAY
+            a, b = _row(table)
+            _cell(a, q,  5500, fill)
+            _cell(b, "", 3860, fill)
+
+    # ── Scoring criteria ──
+    _page_break(doc)
+    _banner(doc, "EV", "Evaluation Criteria & Scoring")
+    _spacer(doc, 160)
+    _para(doc, "All proposals will be scored by the Vendor Selection Committee using the weighted criteria "
+               "below. Scores are 0–10 per criterion, multiplied by the weight to produce a total out of 100.")
+    _spacer(doc, 120)
+    table = _table(doc, [4000, 1200, 4160])
+    a, b, c = _row(table)
+    _header_cell(a, "Criterion",            4000)
+    _header_cell(b, "Weight",               1200)
+    _header_cell(c, "Key Evaluation Focus", 4160)
+    for i, (crit, info) in enumerate(context.get("criteria", {}).items()):
+        fill = WHITE if i % 2 == 0 else LTGRAY
+        a, b, c = _row(table)
+        _cell(a, crit,                       4000, fill, bold=True, color=NAVY)
+        _cell(b, f"{info.get('weight', 0)}%", 1200, fill, bold=True, color=TEAL,
+              align=WD_ALIGN_PARAGRAPH.CENTER)
+        _cell(c, info.get("desc", ""),       4160, fill)
+
+    _spacer(doc)
+    _para(doc, "Submission Instructions", bold=True, size=24, color=NAVY)
+    _spacer(doc, 80)
+    for line in (
+        f"Submit as a single PDF: [CompanyName]_{ref_number}.pdf",
+        f"Email to: [procurement@yourorganisation.com] — Subject: {ref_number} Proposal",
+        "Proposals must arrive by the deadline date at 5:00 PM local time.",
+        "All questions in writing only to the procurement contact above.",
+        "Proposals valid for minimum 90 days from submission deadline.",
+        "The Organisation reserves the right to reject any or all proposals without obligation.",
+    ):
+        _bullet(doc, line)
+    _spacer(doc, 400)
+    _centered(doc, "— End of Request for Proposal —", before=160, bold=True, size=22, color=NAVY)
+    _centered(doc, "Thank you for your interest. We look forward to reviewing your proposal.",
+              after=0, size=20, color=GREY)
+
+    doc.save(output_path)
@@ -0,0 +1,372 @@
+/*
+ * DOCX Renderer
+ * =============
+ * Fixed docx-js renderer for RFP documents. Takes the template and context
+ * as plain data and returns the .docx bytes — no per-document code generation.
+ *
+ * Loaded once by docx_worker.js, which serves render requests from the
+ * Python worker pool (see node_pool.py). When run directly it renders a
+ * single document — the fallback used when the pool is unavailable:
+ *
+ *     node docx_renderer.js <output_path> < payload.json
+ *
+ * where payload.json is {"template": {...}, "context": {...}}.
+ */
+
+const {
+  Document, Packer, Paragraph, TextRun, Table, TableRow, TableCell,
+  Header, Footer, AlignmentType, BorderStyle, WidthType,
+  ShadingType, VerticalAlign, PageBreak, LevelFormat, TabStopType
+} = require('docx');
+
+const NAVY    = "1B2E45";
+const TEAL    = "0D7A6B";
+const LTGRAY  = "F2F4F6";
+const MIDGRAY = "D0D5DD";
+const WHITE   = "FFFFFF";
+const DKTEXT  = "1A1A2E";
+
+// Single-line text — template fields never carry hard line breaks into the document
+const _flat = (t) => String(t ?? "").replace(/\n/g, " ");
+
+// ── Helpers ───────────────────────────────────────────────────
+const _b  = (c=MIDGRAY) => ({ style: BorderStyle.SINGLE, size: 1, color: c });
+const _ab = (c=MIDGRAY) => ({ top: _b(c), bottom: _b(c), left: _b(c), right: _b(c) });
+const _nb = () => ({ style: BorderStyle.NONE, size: 0, color: WHITE });
+const _nbs = () => ({ top: _nb(), bottom: _nb(), left: _nb(), right: _nb() });
+
+function _run(text, opts={}) {
+  return new TextRun({ text, bold: opts.bold||false, italics: opts.italic||false,
+    size: opts.size||22, color: opts.color||DKTEXT, font: "Arial" });
+}
+
+function _para(text, opts={}) {
+  return new Paragraph({
+    alignment: opts.align || AlignmentType.LEFT,
+    spacing: { before: opts.before ?? 80, after: opts.after ?? 80 },
+    children: [_run(text, opts)]
+  });
+}
+
+function _centered(text, opts={}) {
+  return new Paragraph({
+    alignment: AlignmentType.CENTER,
+    spacing: { before: opts.before ?? 0, after: opts.after ?? 80 },
+    children: [_run(text, opts)]
+  });
+}
+
+function _spacer(before=160) {
+  return new Paragraph({ spacing: { before, after: 0 }, children: [new TextRun("")] });
+}
+
+function _pageBreak() {
+  return new Paragraph({ children: [new PageBreak()] });
+}
+
+function _bullet(text) {
+  return new Paragraph({
+    numbering: { reference: "bullets", level: 0 },
+    spacing: { before: 60, after: 60 },
+    children: [new TextRun({ text, size: 22, color: DKTEXT, font: "Arial" })]
+  });
+}
+
+function _cell(text, width, fill, bold=false, color=DKTEXT, align=AlignmentType.LEFT) {
+  return new TableCell({
+    width: { size: width, type: WidthType.DXA },
+    shading: { fill, type: ShadingType.CLEAR },
+    margins: { top: 100, bottom: 100, left: 160, right: 160 },
+    borders: _ab(MIDGRAY),
+    verticalAlign: VerticalAlign.CENTER,
+    children: [new Paragraph({ alignment: align,
+      children: [new TextRun({ text: text||"", bold, size: 20, color, font: "Arial" })] })]
+  });
+}
+
+function _headerCell(text, width) {
+  return new TableCell({
+    width: { size: width, type: WidthType.DXA },
+    shading: { fill: NAVY, type: ShadingType.CLEAR },
+    margins: { top: 100, bottom: 100, left: 160, right: 160 },
+    borders: _ab(NAVY),
+    children: [new Paragraph({
+      children: [new TextRun({ text, bold: true, size: 20, color: WHITE, font: "Arial" })]
+    })]
+  });
+}
+
+function _infoRow(label, value, i) {
+  const fill = i % 2 === 0 ? LTGRAY : WHITE;
+  return new TableRow({ children: [
+    _cell(label, 2800, fill, true,  NAVY),
+    _cell(value, 6560, fill, false, DKTEXT),
+  ]});
+}
+
+function _banner(number, title) {
+  return new Table({
+    width: { size: 9360, type: WidthType.DXA },
+    columnWidths: [800, 8560],
+    borders: { top: _nb(), bottom: _nb(), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() },
+    rows: [new TableRow({ children: [
+      new TableCell({
+        width: { size: 800, type: WidthType.DXA },
+        shading: { fill: TEAL, type: ShadingType.CLEAR },
+        margins: { top: 120, bottom: 120, left: 160, right: 160 },
+        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
+        children: [new Paragraph({ alignment: AlignmentType.CENTER,
+          children: [new TextRun({ text: number, bold: true, size: 28, color: WHITE, font: "Arial" })] })]
+      }),
+      new TableCell({
+        width: { size: 8560, type: WidthType.DXA },
+        shading: { fill: NAVY, type: ShadingType.CLEAR },
+        margins: { top: 120, bottom: 120, left: 200, right: 160 },
+        borders: _nbs(), verticalAlign: VerticalAlign.CENTER,
+        children: [new Paragraph({
+          children: [new TextRun({ text: title, bold: true, size: 26, color: WHITE, font: "Arial" })] })]
+      }),
+    ]})]
+  });
+}
+
+// ── Document parts ────────────────────────────────────────────
+
+function _header(category) {
+  return new Header({ children: [
+    new Table({
+      width: { size: 9720, type: WidthType.DXA },
+      columnWidths: [6200, 3520],
+      borders: { top: _nb(), bottom: _b(TEAL), left: _nb(), right: _nb(), insideH: _nb(), insideV: _nb() },
+      rows: [new TableRow({ children: [
+        new TableCell({ width: { size: 6200, type: WidthType.DXA }, borders: _nbs(), margins: { bottom: 80 },
+          children: [new Paragraph({ children: [new TextRun({ text: "REQUEST FOR PROPOSAL — " + category.toUpperCase(), bold: true, size: 18, color: NAVY, font: "Arial" })] })] }),
+        new TableCell({ width: { size: 3520, type: WidthType.DXA }, borders: _nbs(), margins: { bottom: 80 },
+          children: [new Paragraph({ alignment: AlignmentType.RIGHT, children: [new TextRun({ text: "CONFIDENTIAL", size: 18, color: TEAL, bold: true, font: "Arial" })] })] }),
+      ]})]
+    })
+  ]});
+}
+
+function _footer(orgName, refNumber) {
+  return new Footer({ children: [
+    new Paragraph({
+      spacing: { before: 80 },
+      border: { top: { style: BorderStyle.SINGLE, size: 4, color: MIDGRAY, space: 4 } },
+      tabStops: [{ type: TabStopType.RIGHT, position: 9360 }],
+      children: [
+        new TextRun({ text: orgName + " — Confidential & Proprietary", size: 18, color: "888888", font: "Arial" }),
+        new TextRun({ text: "\t" + refNumber, size: 18, color: "888888", font: "Arial" }),
+      ]
+    })
+  ]});
+}
+
+function _coverPage(c) {
+  return [
+    _spacer(2880),
+    _centered("REQUEST FOR PROPOSAL", { after: 0, bold: true, size: 56, color: NAVY }),
+    _centered(c.category, { before: 120, after: 0, size: 40, color: TEAL }),
+    _spacer(80),
+    _centered(c.shortDesc, { size: 22, color: "888888", italic: true }),
+    _spacer(320),
+    new Paragraph({ alignment: AlignmentType.CENTER, spacing: { before: 0, after: 80 },
+      border: { top: { style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 },
+                bottom: { style: BorderStyle.SINGLE, size: 8, color: TEAL, space: 4 } },
+      children: [new TextRun({ text: "  ", size: 8, font: "Arial" })] }),
+    _spacer(240),
+    _centered("Issued by: " + c.orgName, { size: 24 }),
+    _centered("Issue Date: " + c.issueDate, { size: 24 }),
+    _centered("Response Deadline: [Insert Date — " + c.deadlineWeeks + " weeks from issue]",
+      { size: 24, color: "CC0000", bold: true }),
+    _centered("RFP Reference: " + c.refNumber, { size: 24 }),
+    ...(c.sourceNote ? [_centered("⚡ " + c.sourceNote, { before: 80, after: 0, size: 18, color: TEAL })] : []),
+    _spacer(400),
+    ...(c.topVendors.length > 0 ? [
+      _centered("Shortlisted Vendors: " + c.topVendors.join(" • "), { size: 20, color: "555555" }),
+    ] : []),
+    _spacer(200),
+    new Paragraph({ alignment: AlignmentType.CENTER,
+      children: [_run("CONFIDENTIAL — FOR NAMED RECIPIENTS ONLY", { bold: true, size: 20, color: "888888" })] }),
+  ];
+}
+
+function _overview(c) {
+  return [
+    _pageBreak(),
+    _banner("00", "Overview & Submission Details"),
+    _spacer(160),
+    _para("This Request for Proposal invites qualified vendors to submit proposals for: " + c.shortDesc),
+    _spacer(),
+    new Table({
+      width: { size: 9360, type: WidthType.DXA },
+      columnWidths: [2800, 6560],
+      borders: Object.fromEntries(["top","bottom","left","right","insideH","insideV"].map(k => [k, _b()])),
+      rows: [
+        _infoRow("RFP Reference",       c.refNumber,  0),
+        _infoRow("Category",            c.category,   1),
+        _infoRow("Issuing Organisation", c.orgName,   0),
+        _infoRow("Issue Date",          c.issueDate,  1),
+        _infoRow("Response Deadline",   "[Insert Date — " + c.deadlineWeeks + " weeks from above]", 0),
+        _infoRow("Submission Email",    "[procurement@yourorganisation.com]", 1),
+        _infoRow("Questions Deadline",  "[Insert Date — 5 business days after issue]", 0),
+        _infoRow("RFP Contact",         "[Name, Title, Email, Phone]", 1),
+      ]
+    }),
+    _spacer(),
+    _para("Mandatory Requirements — vendors failing any item below are automatically disqualified:", { bold: true, color: "CC0000" }),
+    _spacer(80),
+    ...c.restrictions.map(r => _bullet(r)),
+  ];
+}
+
+function _section(sec) {
+  const rows = [
+    new TableRow({ children: [
+      _headerCell("Question / Requirement", 5500),
+      _headerCell("Vendor Response",        3860),
+    ]}),
+  ];
+  (sec.questions || []).forEach((q, qi) => {
+    const fill = qi % 2 === 0 ? WHITE : LTGRAY;
+    rows.push(new TableRow({ children: [
+      _cell(q,  5500, fill, false, DKTEXT),
+      _cell("", 3860, fill, false, DKTEXT),
+    ]}));
+  });
+  return [
+    _pageBreak(),
+    _banner(_flat(sec.number), _flat(sec.title)),
+    _spacer(160),
+    _para(_flat(sec.description), { size: 22 }),
+    _spacer(120),
+    new Table({
+      width: { size: 9360, type: WidthType.DXA },
+      columnWidths: [5500, 3860],
+      rows,
+    }),
+  ];
+}
+
+function _scoring(c) {
+  const rows = [
+    new TableRow({ children: [
+      _headerCell("Criterion",            4000),
+      _headerCell("Weight",               1200),
+      _headerCell("Key Evaluation Focus", 4160),
+    ]}),
+  ];
+  Object.entries(c.criteria).forEach(([crit, info], i) => {
+    const fill = i % 2 === 0 ? WHITE : LTGRAY;
+    rows.push(new TableRow({ children: [
+      _cell(crit,                         4000, fill, true,  NAVY),
+      _cell(`${info.weight ?? 0}%`,       1200, fill, true,  TEAL, AlignmentType.CENTER),
+      _cell(info.desc || "",              4160, fill, false, DKTEXT),
+    ]}));
+  });
+  return [
+    _pageBreak(),
+    _banner("EV", "Evaluation Criteria & Scoring"),
+    _spacer(160),
+    _para("All proposals will be scored by the Vendor Selection Committee using the weighted criteria below. Scores are 0–10 per criterion, multiplied by the weight to produce a total out of 100."),
+    _spacer(120),
+    new Table({
+      width: { size: 9360, type: WidthType.DXA },
+      columnWidths: [4000, 1200, 4160],
+      rows,
+    }),
+    _spacer(),
+    _para("Submission Instructions", { bold: true, size: 24, color: NAVY }),
+    _spacer(80),
+    _bullet("Submit as a single PDF: [CompanyName]_" + c.refNumber + ".pdf"),
+    _bullet("Email to: [procurement@yourorganisation.com] — Subject: " + c.refNumber + " Proposal"),
+    _bullet("Proposals must arrive by the deadline date at 5:00 PM local time."),
+    _bullet("All questions in writing only to the procurement contact above."),
+    _bullet("Proposals valid for minimum 90 days from submission deadline."),
+    _bullet("The Organisation reserves the right to reject any or all proposals without obligation."),
+    _spacer(400),
+    new Paragraph({ alignment: AlignmentType.CENTER, spacing: { before: 160, after: 80 },
+      children: [_run("— End of Request for Proposal —", { bold: true, size: 22, color: NAVY })] }),
+    new Paragraph({ alignment: AlignmentType.CENTER,
+      children: [_run("Thank you for your interest. We look forward to reviewing your proposal.", { size: 20, color: "888888" })] }),
+  ];
+}
+
+// ── Public entry point ────────────────────────────────────────
+
+function buildDocument(template, context) {
+  const category = _flat(context.category);
+  const c = {
+    category,
+    orgName:       _flat(context.org_name),
+    issueDate:     _flat(context.issue_date),
+    refNumber:     _flat(context.ref_number),
+    deadlineWeeks: _flat(context.deadline_weeks),
+    shortDesc:     _flat(template.short_description || category),
+    sourceNote:    (context.source || "template") === "template" ? "" : "AI-Generated Template",
+    topVendors:    context.top_vendors  || [],
+    restrictions:  context.restrictions || [],
+    criteria:      context.criteria     || {},
+  };
+
+  return new Document({
+    numbering: { config: [
+      { reference: "bullets",
+        levels: [{ level: 0, format: LevelFormat.BULLET, text: "•",
+          alignment: AlignmentType.LEFT,
+          style: { paragraph: { indent: { left: 720, hanging: 360 } } } }] },
+      { reference: "numbers",
+        levels: [{ level: 0, format: LevelFormat.DECIMAL, text: "%1.",
+          alignment: AlignmentType.LEFT,
+          style: { paragraph: { indent: { left: 720, hanging: 360 } } } }] },
+    ]},
+    styles: {
+      default: { document: { run: { font: "Arial", size: 22, color: DKTEXT } } },
+      paragraphStyles: [
+        { id: "Heading1", name: "Heading 1", basedOn: "Normal", next: "Normal", quickFormat: true,
+          run: { size: 32, bold: true, font: "Arial", color: NAVY },
+          paragraph: { spacing: { before: 320, after: 160 }, outlineLevel: 0 } },
+        { id: "Heading2", name: "Heading 2", basedOn: "Normal", next: "Normal", quickFormat: true,
+          run: { size: 26, bold: true, font: "Arial", color: TEAL },
+          paragraph: { spacing: { before: 240, after: 120 }, outlineLevel: 1 } },
+      ]
+    },
+    sections: [{
+      properties: {
+        page: {
+          size: { width: 12240, height: 15840 },
+          margin: { top: 1440, right: 1260, bottom: 1440, left: 1260 }
+        }
+      },
+      headers: { default: _header(category) },
+      footers: { default: _footer(c.orgName, c.refNumber) },
+      children: [
+        ..._coverPage(c),
+        ..._overview(c),
+        ...(template.sections || []).flatMap(_section),
+        ..._scoring(c),
+      ]
+    }]
+  });
+}
+
+function render(template, context) {
+  return Packer.toBuffer(buildDocument(template, context));
+}
+
+module.exports = { render, buildDocument };
+
+
+// ── One-shot mode ─────────────────────────────────────────────
+if (require.main === module) {
+  const fs = require('fs');
+  const outputPath = process.argv[2];
+  const payload = JSON.parse(fs.readFileSync(0, 'utf8'));
+  render(payload.template || {}, payload.context || {}).then(buffer => {
+    fs.writeFileSync(outputPath, buffer);
+    console.log("RFP document generated: " + outputPath);
+  }).catch(err => {
+    console.error((err && err.stack) || String(err));
+    process.exit(1);
+  });
+}
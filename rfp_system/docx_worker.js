@@ -0,0 +1,56 @@
+/*
+ * DOCX Worker
+ * ===========
+ * Long-lived render process managed by node_pool.py. `docx` is required once
+ * at startup; afterwards each request only pays for the render itself.
+ *
+ * Protocol — one JSON object per line on stdin, one reply per line on stdout:
+ *
+ *   {"id": 1, "op": "render", "template": {...}, "context": {...}}
+ *     -> {"id": 1, "ok": true, "docx": "<base64>"}
+ *   {"id": 2, "op": "ping"}
+ *     -> {"id": 2, "ok": true, "pid": 1234, "rendered": 17}
+ *
+ * Failures reply {"id": n, "ok": false, "error": "..."} and keep the worker alive.
+ */
+
+const readline = require('readline');
+const { render } = require('./docx_renderer');
+
+let rendered = 0;
+
+function reply(msg) {
+  process.stdout.write(JSON.stringify(msg) + "\n");
+}
+
+async function handle(req) {
+  if (req.op === "ping") {
+    return { id: req.id, ok: true, pid: process.pid, rendered };
+  }
+  if (req.op === "render") {
+    const buffer = await render(req.template || {}, req.context || {});
+    rendered += 1;
+    return { id: req.id, ok: true, docx: buffer.toString("base64") };
+  }
+  throw new Error("Unknown op: " + req.op);
+}
+
+// Requests are handled strictly in order — the pool sends one at a time per worker
+let queue = Promise.resolve();
+
+readline.createInterface({ input: process.stdin, terminal: false }).on("line", (line) => {
+  if (!line.trim()) return;
+  queue = queue.then(async () => {
+    let req = {};
+    try {
+      req = JSON.parse(line);
+      reply(await handle(req));
+    } catch (err) {
+      reply({ id: req.id, ok: false, error: (err && err.stack) || String(err) });
+    }
+  });
+}).on("close", () => {
+  queue.then(() => process.exit(0));
+});
+
+reply({ id: 0, ok: true, ready: true, pid: process.pid });
@@ -6,6 +6,19 @@ Run independently to generate an RFP for any healthcare vendor category.
 Usage:
     python generate_rfp.py
 
+Batch mode — one document per manifest row, rendered in parallel:
+    python generate_rfp.py --batch manifest.csv --workers 4 --output-dir generated/
+
+    Manifests may be .csv, .json (a list of objects) or .jsonl. Fields:
+        category        required
+        org_name        required
+        vendors         list, or "A; B; C" in CSV
+        criteria        {"name": {"weight": 25, "desc": "..."}}, JSON-encoded in CSV
+        restrictions    list, or "rule one; rule two" in CSV
+        deadline_weeks  optional, default "2-4"
+    Missing criteria / restrictions fall back to the defaults below. A summary
+    of successes, failures and timings is written next to the documents.
+
 Or import and call directly:
     from generate_rfp import run
     run(category="EHR / Electronic Health Records", org_name="My Hospital")
@@ -13,9 +26,15 @@ Or import and call directly:
 
 import os
 import sys
+import csv
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 sys.path.insert(0, os.path.dirname(__file__))
 
-from rfp_engine import generate_rfp, template_exists, CATEGORY_KEYS
+from rfp_engine import generate_rfp, template_exists, template_source, warm_template, CATEGORY_KEYS
 
 CATEGORIES = list(CATEGORY_KEYS.keys())
 
@@ -79,7 +98,10 @@ def run(
     top_vendors  = top_vendors  or []
 
     # ── Show what will happen ─────────────────────────────────
-    source = "Pre-built template" if template_exists(category) else "Claude AI (no template found)"
+    source = {
+        "template": "Pre-built template",
+        "cached":   "Cached AI template",
+    }.get(template_source(category, criteria, restrictions), "Claude AI (no template found)")
     print(f"\n  Category:    {category}")
     print(f"  Organisation: {org_name}")
     print(f"  Source:      {source}")
@@ -104,5 +126,157 @@ def run(
     return out_path
 
 
+# ── BATCH MODE ────────────────────────────────────────────────
+
+def load_manifest(path: str) -> list:
+    """Read a CSV / JSON / JSONL manifest into a list of generate_rfp keyword dicts."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            rows = list(csv.DictReader(f))
+        elif ext == ".jsonl":
+            rows = [json.loads(line) for line in f if line.strip()]
+        elif ext == ".json":
+            rows = json.load(f)
+        else:
+            raise ValueError(f"Unsupported manifest type {ext!r} — use .csv, .json or .jsonl")
+
+    jobs = []
+    for i, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f"Manifest row {i}: expected an object, got {type(row).__name__}")
+        category = _as_text(row.get("category"))
+        org_name = _as_text(row.get("org_name"))
+        if not category or not org_name:
+            raise ValueError(f"Manifest row {i}: 'category' and 'org_name' are required")
+        criteria = row.get("criteria") or None
+        if isinstance(criteria, str):
+            try:
+                criteria = json.loads(criteria)
+            except ValueError as e:
+                raise ValueError(f"Manifest row {i}: 'criteria' is not valid JSON ({e})") from None
+        if criteria is not None and not isinstance(criteria, dict):
+            raise ValueError(f"Manifest row {i}: 'criteria' must be a JSON object")
+        jobs.append({
+            "category":       category,
+            "org_name":       org_name,
+            "top_vendors":    _as_list(row.get("vendors")),
+            "criteria":       criteria or DEFAULT_CRITERIA,
+            "restrictions":   _as_list(row.get("restrictions")) or DEFAULT_RESTRICTIONS,
+            "deadline_weeks": _as_text(row.get("deadline_weeks")) or "2-4",
+        })
+    return jobs
+
+
+def _as_text(value) -> str:
+    """Manifest cell → stripped string; JSON rows may hold numbers (deadline_weeks: 3)."""
+    return "" if value is None else str(value).strip()
+
+
+def _as_list(value) -> list:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def run_batch(jobs: list, output_dir: str = "generated/", workers: int = 4) -> dict:
+    """
+    Render every job in parallel. Templates are resolved once per distinct
+    (category, criteria, restrictions) before rendering, so jobs sharing a
+    template never trigger duplicate Claude calls. Returns the summary dict.
+    """
+    started = time.perf_counter()
+
+    # Phase 1 — one template per distinct request shape
+    shapes = {}
+    for job in jobs:
+        key = (job["category"], json.dumps(job["criteria"], sort_keys=True), json.dumps(job["restrictions"]))
+        shapes.setdefault(key, job)
+    template_errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(warm_template, j["category"], j["criteria"], j["restrictions"]): key
+                   for key, j in shapes.items()}
+        for fut in as_completed(futures):
+            try:
+                fut.result()
+            except Exception as e:
+                template_errors[futures[fut]] = f"Template generation failed: {e}"
+
+    # Phase 2 — render documents
+    def _one(index: int, job: dict) -> dict:
+        key = (job["category"], json.dumps(job["criteria"], sort_keys=True), json.dumps(job["restrictions"]))
+        result = {"row": index, "category": job["category"], "org_name": job["org_name"]}
+        t0 = time.perf_counter()
+        try:
+            if key in template_errors:
+                raise RuntimeError(template_errors[key])
+            result["path"]   = generate_rfp(output_dir=output_dir, **job)
+            result["status"] = "ok"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"]  = str(e)
+        result["seconds"] = round(time.perf_counter() - t0, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda ij: _one(*ij), enumerate(jobs, 1)))
+
+    ok = [r for r in results if r["status"] == "ok"]
+    return {
+        "generated":     datetime.now().isoformat(timespec="seconds"),
+        "workers":       workers,
+        "total":         len(results),
+        "succeeded":     len(ok),
+        "failed":        len(results) - len(ok),
+        "templates":     len(shapes),
+        "wall_seconds":  round(time.perf_counter() - started, 3),
+        "mean_seconds":  round(sum(r["seconds"] for r in ok) / len(ok), 3) if ok else None,
+        "results":       results,
+    }
+
+
+def print_summary(summary: dict):
+    print("\n" + "═"*55)
+    print("  📋 BATCH SUMMARY")
+    print("═"*55)
+    for r in summary["results"]:
+        mark = "✅" if r["status"] == "ok" else "❌"
+        print(f"  {mark} [{r['row']:>3}] {r['org_name'][:24]:<24} {r['category'][:28]:<28} {r['seconds']:>7.2f}s")
+        if r["status"] != "ok":
+            print(f"          {r['error'].splitlines()[0] if r['error'] else ''}")
+    print("─"*55)
+    print(f"  {summary['succeeded']}/{summary['total']} succeeded · {summary['templates']} distinct templates"
+          f" · {summary['wall_seconds']}s wall time with {summary['workers']} workers")
+    print("═"*55 + "\n")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate healthcare RFP Word documents.")
+    parser.add_argument("--batch",      metavar="MANIFEST", help="CSV, JSON or JSONL manifest of RFPs to generate")
+    parser.add_argument("--workers",    type=int, default=4, help="parallel workers in batch mode (default 4)")
+    parser.add_argument("--output-dir", default="generated/", help="where documents are written")
+    parser.add_argument("--summary",    help="summary JSON path (default <output-dir>/batch_summary_<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        run(output_dir=args.output_dir)
+        return 0
+
+    jobs    = load_manifest(args.batch)
+    print(f"\n  Generating {len(jobs)} RFPs with {args.workers} workers...\n")
+    summary = run_batch(jobs, output_dir=args.output_dir, workers=max(args.workers, 1))
+    print_summary(summary)
+
+    summary_path = args.summary or os.path.join(
+        args.output_dir, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"  Summary written to {summary_path}\n")
+    return 0 if summary["failed"] == 0 else 1
+
+
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Node Worker Pool
+=================
+Keeps a small pool of long-lived `node docx_worker.js` processes so each RFP
+render skips Node startup and the `require('docx')` load.
+
+Workers speak newline-delimited JSON over stdin/stdout (see docx_worker.js).
+A worker that crashes or stops answering is restarted on its next use, and
+idle workers are pinged before reuse once they have been idle for a while.
+
+Configuration (environment):
+    RFP_NODE_WORKERS   pool size — 0 disables the pool (default 2)
+    RFP_NODE_TIMEOUT   seconds allowed per render (default 60)
+
+Usage:
+    from node_pool import get_pool
+    docx_bytes = get_pool().render(template, context)
+"""
+
+import os
+import json
+import time
+import queue
+import base64
+import atexit
+import threading
+import subprocess
+from collections import deque
+
+from telemetry import span, count
+
+# ── CONFIG ────────────────────────────────────────────────────
+WORKER_JS       = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docx_worker.js")
+NODE_MODULES    = ["/home/claude/.npm-global/lib/node_modules"]
+POOL_SIZE       = int(os.environ.get("RFP_NODE_WORKERS", "2"))
+RENDER_TIMEOUT  = float(os.environ.get("RFP_NODE_TIMEOUT", "60"))
+STARTUP_TIMEOUT = 15.0
+PING_TIMEOUT    = 5.0
+HEALTH_INTERVAL = 30.0    # idle seconds before a worker is pinged on reuse
+RETRY_COOLDOWN  = 60.0    # seconds to stop spawning after a worker fails to start
+
+
+class WorkerError(RuntimeError):
+    """A worker could not be started, crashed, or timed out."""
+
+
+def node_env() -> dict:
+    """Process environment with the global docx-js install on NODE_PATH."""
+    env = dict(os.environ)
+    paths = [p for p in env.get("NODE_PATH", "").split(os.pathsep) if p]
+    env["NODE_PATH"] = os.pathsep.join(paths + [p for p in NODE_MODULES if p not in paths])
+    return env
+
+
+# ── SINGLE WORKER ─────────────────────────────────────────────
+
+class NodeWorker:
+    """One `node docx_worker.js` process and its stdout/stderr reader threads."""
+
+    def __init__(self):
+        self.proc      = None
+        self._lines    = None
+        self._stderr   = deque(maxlen=40)
+        self._next_id  = 0
+        self.last_used = 0.0
+        self.renders   = 0
+        self.restarts  = 0
+
+    # ── lifecycle ─────────────────────────────────────────────
+    def start(self):
+        with span("node_worker_start"):
+            self._start()
+
+    def _start(self):
+        try:
+            self.proc = subprocess.Popen(
+                ["node", WORKER_JS],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, bufsize=1, env=node_env(),
+            )
+        except OSError as e:
+            raise WorkerError(f"Could not start node: {e}") from e
+
+        self._lines = queue.Queue()
+        self._stderr.clear()
+        threading.Thread(target=self._pump_stdout, args=(self.proc, self._lines), daemon=True).start()
+        threading.Thread(target=self._pump_stderr, args=(self.proc,), daemon=True).start()
+
+        ready = self._read_reply(0, STARTUP_TIMEOUT)
+        if not ready.get("ready"):
+            self.stop()
+            raise WorkerError(f"Worker did not start:\n{self.stderr_tail()}")
+        self.last_used = time.monotonic()
+
+    def stop(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+            proc.wait()
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        count("node_worker_restarts_total")
+        self.start()
+
+    def is_alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr)
+
+    # ── requests ──────────────────────────────────────────────
+    def request(self, op: str, timeout: float, **payload) -> dict:
+        if not self.is_alive():
+            raise WorkerError("Worker is not running")
+        self._next_id += 1
+        msg = dict(payload, id=self._next_id, op=op)
+        try:
+            self.proc.stdin.write(json.dumps(msg) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"Worker pipe closed:\n{self.stderr_tail()}") from e
+
+        reply = self._read_reply(self._next_id, timeout)
+        self.last_used = time.monotonic()
+        if not reply.get("ok"):
+            raise RuntimeError(f"Node.js error:\n{reply.get('error', 'unknown error')}")
+        return reply
+
+    def ping(self) -> dict:
+        return self.request("ping", PING_TIMEOUT)
+
+    def render(self, template: dict, context: dict) -> bytes:
+        reply = self.request("render", RENDER_TIMEOUT, template=template, context=context)
+        self.renders += 1
+        return base64.b64decode(reply["docx"])
+
+    # ── plumbing ──────────────────────────────────────────────
+    def _read_reply(self, msg_id: int, timeout: float) -> dict:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                self.stop()
+                raise WorkerError(f"Worker timed out after {timeout:.0f}s")
+            if line is None:
+                self.stop()
+                raise WorkerError(f"Worker exited:\n{self.stderr_tail()}")
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue    # stray console output from a dependency
+            if reply.get("id") == msg_id:
+                return reply
+
+    @staticmethod
+    def _pump_stdout(proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _pump_stderr(self, proc):
+        for line in proc.stderr:
+            self._stderr.append(line.rstrip())
+
+
+# ── POOL ──────────────────────────────────────────────────────
+
+class WorkerPool:
+    """Fixed-size pool of NodeWorkers, created lazily and shared by all threads."""
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size            = size
+        self._idle           = queue.Queue()
+        self._workers        = []
+        self._lock           = threading.Lock()
+        self._disabled_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and time.monotonic() >= self._disabled_until
+
+    def render(self, template: dict, context: dict) -> bytes:
+        """Render one document. Retries once on a fresh process if the worker crashes."""
+        with span("node_pool_acquire"):
+            worker = self._acquire()
+        try:
+            try:
+                return worker.render(template, context)
+            except WorkerError as e:
+                print(f"[Node Pool] Worker failed ({str(e).splitlines()[0]}) — restarting")
+                self._restart(worker)
+                return worker.render(template, context)
+        finally:
+            self._idle.put(worker)
+
+    def health(self) -> list:
+        """Ping every idle worker, restarting any that fail. Returns per-worker status."""
+        status = []
+        for _ in range(self._idle.qsize()):
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._check(worker, force_ping=True)
+                status.append({"pid": worker.proc.pid, "alive": True,
+                               "renders": worker.renders, "restarts": worker.restarts})
+            except WorkerError as e:
+                status.append({"pid": None, "alive": False, "error": str(e)})
+            finally:
+                self._idle.put(worker)
+        return status
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    # ── internals ─────────────────────────────────────────────
+    def _acquire(self) -> NodeWorker:
+        if not self.enabled:
+            raise WorkerError("Worker pool is disabled")
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            worker = self._spawn()
+            if worker is None:
+                try:
+                    worker = self._idle.get(timeout=RENDER_TIMEOUT)
+                except queue.Empty:
+                    raise WorkerError("No worker became free in time") from None
+        try:
+            self._check(worker)
+        except WorkerError:
+            self._idle.put(worker)
+            raise
+        return worker
+
+    def _spawn(self):
+        with self._lock:
+            if len(self._workers) >= self.size:
+                return None
+            worker = NodeWorker()
+            try:
+                worker.start()
+            except WorkerError:
+                self._disabled_until = time.monotonic() + RETRY_COOLDOWN
+                raise
+            self._workers.append(worker)
+            return worker
+
+    def _check(self, worker: NodeWorker, force_ping: bool = False):
+        """Make sure `worker` is usable: restart dead ones, ping long-idle ones."""
+        if not worker.is_alive():
+            self._restart(worker)
+        elif force_ping or time.monotonic() - worker.last_used > HEALTH_INTERVAL:
+            try:
+                worker.ping()
+            except (WorkerError, RuntimeError):
+                self._restart(worker)
+
+    def _restart(self, worker: NodeWorker):
+        try:
+            worker.restart()
+        except WorkerError:
+            self._disabled_until = time.monotonic() + RETRY_COOLDOWN
+            raise
+
+
+# ── SHARED INSTANCE ───────────────────────────────────────────
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> WorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -5,7 +5,8 @@ Generates category-aware RFP Word documents.
 
 Priority:
   1. Load from /templates/<category_key>.json  (Option 2 — pre-built template)
-  2. Generate via Claude API                   (Option 3 — AI fallback)
+  2. Reuse a cached Claude-generated template  (see template_cache.py)
+  3. Generate via Claude API                   (Option 3 — AI fallback)
 
 Usage:
     from rfp_engine import generate_rfp
@@ -17,14 +18,28 @@ Usage:
         restrictions   = ["Must be HIPAA compliant", ...],
         output_dir     = "generated/"
     )
+
+Or without blocking the caller:
+    job_id = submit_rfp_job(category=..., org_name=..., ...)   # same arguments
+    job    = get_rfp_job(job_id)    # {"status": "queued" | "running" | "done" | "failed", ...}
 """
 
 import os
+import copy
 import json
 import re
-import anthropic
+import time
+import uuid
+import threading
 from datetime import datetime
-from docx_builder import build_rfp_docx   # see docx_builder.py
+from concurrent.futures import ThreadPoolExecutor
+from docx_builder import build_rfp_docx, resolve_backend   # see docx_builder.py
+from doc_cache import DocumentCache, document_key
+from template_cache import TemplateCache
+from template_registry import TemplateRegistry, validate_template
+from section_stream import SectionStreamParser
+from telemetry import span, traced, count, observe
+from claude_client import get_client
 
 # ── PATHS ─────────────────────────────────────────────────────
 TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
@@ -38,8 +53,12 @@ CATEGORY_KEYS = {
     "Medical Device Software":               "medical_device_software",
 }
 
+_template_cache = TemplateCache()
+_registry       = TemplateRegistry()
+
 # ── PUBLIC ENTRY POINT ────────────────────────────────────────
 
+@traced("generate_rfp")
 def generate_rfp(
     category: str,
     org_name: str,
@@ -47,24 +66,45 @@ def generate_rfp(
     criteria: dict,
     restrictions: list,
     output_dir: str = "generated/",
-    deadline_weeks: str = "2-4"
+    deadline_weeks: str = "2-4",
+    use_cache: bool = True,
+    on_section = None
 ) -> str:
     """
     Generate an RFP Word document for the given category.
     Returns the path to the generated .docx file.
+
+    Documents are cached in `output_dir` by content: an identical request
+    returns the existing file instead of rendering it again.
+
+    If `on_section` is given and the template has to come from Claude, the
+    response is streamed and on_section(section) is called as each section
+    arrives.
     """
     print(f"\n[RFP Engine] Category: {category}")
 
     # Step 1 — Try to load pre-built template
-    template = _load_template(category)
-
-    if template:
-        print(f"[RFP Engine] ✅ Template found: {_template_path(category)}")
-        source = "template"
-    else:
-        print(f"[RFP Engine] ⚠️  No template found. Generating via Claude API...")
-        template = _generate_via_claude(category, criteria, restrictions)
-        source = "ai_generated"
+    with span("template_load") as sp:
+        template = _load_template(category)
+
+        if template:
+            print(f"[RFP Engine] ✅ Template found: {_template_path(category)}")
+            source = "template"
+            sp.label(source="template")
+        else:
+            template = _template_cache.get(category, criteria, restrictions)
+            if template:
+                print(f"[RFP Engine] ♻️  Cached AI template reused for {category}")
+                sp.label(source="cached")
+            else:
+                print(f"[RFP Engine] ⚠️  No template found. Generating via Claude API...")
+                sp.label(source="ai")
+                if on_section:
+                    template = _stream_via_claude(category, criteria, restrictions, on_section)
+                else:
+                    template = _generate_via_claude(category, criteria, restrictions)
+                _template_cache.put(category, criteria, restrictions, template)
+            source = "ai_generated"
 
     # Step 2 — Merge runtime context into template
     context = {
@@ -80,35 +120,156 @@ def generate_rfp(
     }
     template["context"] = context
 
-    # Step 3 — Build the Word document
-    os.makedirs(output_dir, exist_ok=True)
-    safe_name = re.sub(r'[^a-zA-Z0-9]', '_', category)
-    filename  = f"RFP_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-    out_path  = os.path.join(output_dir, filename)
-
-    build_rfp_docx(template, context, out_path)
+    # Step 3 — Build the Word document (or reuse an identical one)
+    cache    = DocumentCache(output_dir)
+    backend  = resolve_backend()
+    out_path = cache.path_for(category, document_key(template, context, backend))
+
+    if use_cache and cache.hit(out_path):
+        print(f"[RFP Engine] ♻️  Cached document reused: {out_path}")
+        count("rfp_documents_total", cache="hit")
+        return out_path
+
+    count("rfp_documents_total", cache="miss")
+    try:
+        with span("docx_build", backend=backend):
+            build_rfp_docx(template, context, cache.staging_path(out_path), backend=backend)
+        cache.commit(out_path)
+    except BaseException:
+        cache.discard(out_path)
+        raise
     print(f"[RFP Engine] 📄 Document saved: {out_path}")
     return out_path
 
 
+# ── BACKGROUND JOBS ───────────────────────────────────────────
+# A bounded pool of worker threads shared by every session in the process.
+# Jobs are kept in memory for JOB_RETENTION seconds after they finish.
+
+JOB_WORKERS     = int(os.environ.get("RFP_JOB_WORKERS", "4"))
+MAX_QUEUED_JOBS = int(os.environ.get("RFP_MAX_QUEUED_JOBS", "32"))
+JOB_RETENTION   = 3600
+
+_executor  = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="rfp-job")
+_jobs      = {}
+_jobs_lock = threading.Lock()
+
+
+def submit_rfp_job(**kwargs) -> str:
+    """
+    Queue generate_rfp(**kwargs) on the background pool and return a job id.
+    Raises RuntimeError if MAX_QUEUED_JOBS jobs are already waiting or running.
+    """
+    # The caller's criteria dict is live session state that sidebar sliders
+    # rewrite in place; the job works on its own copy so the template key,
+    # document key and weights table all see one weight vector.
+    kwargs = copy.deepcopy(kwargs)
+    with _jobs_lock:
+        _prune_jobs()
+        active = sum(1 for j in _jobs.values() if j["status"] in ("queued", "running"))
+        if active >= MAX_QUEUED_JOBS:
+            raise RuntimeError("Too many RFP documents are being generated — please try again shortly.")
+        job_id = uuid.uuid4().hex[:12]
+        _jobs[job_id] = {
+            "id":        job_id,
+            "status":    "queued",
+            "category":  kwargs.get("category"),
+            "submitted": time.time(),
+            "started":   None,
+            "finished":  None,
+            "path":      None,
+            "error":     None,
+            "sections":  [],
+        }
+    _executor.submit(_run_job, job_id, kwargs)
+    print(f"[RFP Engine] 🕒 Job {job_id} queued ({active + 1} active)")
+    return job_id
+
+
+def get_rfp_job(job_id: str) -> dict:
+    """A snapshot of the job's state, or None if the id is unknown or expired."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job, sections=list(job["sections"])) if job else None
+
+
+def _run_job(job_id: str, kwargs: dict):
+    job = _jobs[job_id]
+    with _jobs_lock:
+        job["status"], job["started"] = "running", time.time()
+    observe("rfp_job_wait_seconds", job["started"] - job["submitted"])
+    try:
+        path = generate_rfp(**kwargs, on_section=job["sections"].append)
+    except Exception as e:
+        with _jobs_lock:
+            job.update(status="failed", error=str(e), finished=time.time())
+        print(f"[RFP Engine] ❌ Job {job_id} failed: {e}")
+    else:
+        with _jobs_lock:
+            job.update(status="done", path=path, finished=time.time())
+
+
+def _prune_jobs():
+    cutoff = time.time() - JOB_RETENTION
+    for job_id in [j["id"] for j in _jobs.values() if j["finished"] and j["finished"] < cutoff]:
+        del _jobs[job_id]
+
+
 # ── TEMPLATE LOADER ───────────────────────────────────────────
 
 def _template_path(category: str) -> str:
-    key = CATEGORY_KEYS.get(category)
+    key = CATEGORY_KEYS.get(category) or re.sub(r'[^a-z0-9]+', '_', category.lower()).strip('_')
     if not key:
         return None
     return os.path.join(TEMPLATES_DIR, f"{key}.json")
 
 def _load_template(category: str) -> dict:
+    """A private copy of the pre-built template, served from the in-memory registry."""
     path = _template_path(category)
-    if path and os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return None
+    return _registry.get(path) if path else None
 
-def template_exists(category: str) -> bool:
-    path = _template_path(category)
-    return bool(path and os.path.exists(path))
+def template_source(category: str, criteria: dict = None, restrictions: list = None) -> str:
+    """
+    Where generate_rfp would get the template from:
+    "template" (pre-built), "cached" (earlier Claude result) or "ai" (new Claude call).
+    The cache is only consulted when criteria and restrictions are given.
+    """
+    if _registry.exists(_template_path(category)):
+        return "template"
+    if criteria is not None and restrictions is not None \
+            and _template_cache.contains(category, criteria, restrictions):
+        return "cached"
+    return "ai"
+
+def template_exists(category: str, criteria: dict = None, restrictions: list = None) -> bool:
+    """True if no Claude call is needed — a pre-built or cached template is available."""
+    return template_source(category, criteria, restrictions) != "ai"
+
+def warm_template(category: str, criteria: dict, restrictions: list) -> str:
+    """
+    Make sure a later generate_rfp call for this request needs no Claude call,
+    generating and caching the template now if necessary.
+    Returns the template_source as it was before warming.
+    """
+    source = template_source(category, criteria, restrictions)
+    if source == "ai":
+        print(f"[RFP Engine] ⚠️  No template found for {category}. Generating via Claude API...")
+        template = _generate_via_claude(category, criteria, restrictions)
+        _template_cache.put(category, criteria, restrictions, template)
+    return source
+
+def promote_cached_template(category: str, criteria: dict, restrictions: list) -> str:
+    """
+    Save the cached Claude template for this request as the pre-built template
+    for `category`. Returns the new template path.
+    """
+    path = _template_cache.promote(category, criteria, restrictions, _template_path(category))
+    _registry.invalidate(path)
+    print(f"[RFP Engine] ⬆️  Promoted cached template to {path}")
+    return path
+
+
+_registry.preload(_template_path(c) for c in CATEGORY_KEYS)
 
 
 # ── AI FALLBACK (Option 3) ────────────────────────────────────
@@ -118,14 +279,58 @@ def _generate_via_claude(category: str, criteria: dict, restrictions: list) -> d
     Use Claude API to generate a full RFP template structure
     for any category that doesn't have a pre-built template.
     """
-    client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    response = get_client().messages.create(
+        model="claude-sonnet-4-6",
+        max_tokens=4096,
+        messages=[{"role": "user", "content": _template_prompt(category, criteria, restrictions)}]
+    )
+
+    raw = response.content[0].text.strip()
+    # Strip markdown code fences if present
+    raw = re.sub(r'^```json\s*', '', raw)
+    raw = re.sub(r'^```\s*',     '', raw)
+    raw = re.sub(r'\s*```$',     '', raw)
+
+    template = validate_template(json.loads(raw))
+    print(f"[RFP Engine] ✅ Claude generated template with {len(template.get('sections', []))} sections")
+    return template
+
+
+def _stream_via_claude(category: str, criteria: dict, restrictions: list, on_section) -> dict:
+    """
+    Streaming variant of _generate_via_claude. Calls on_section(section) for
+    each section as soon as it has fully arrived, and returns once the
+    sections array closes rather than waiting for the end of the message.
+    """
+    parser = SectionStreamParser()
+
+    started = time.perf_counter()
+    with get_client().messages.stream(
+        model="claude-sonnet-4-6",
+        max_tokens=4096,
+        messages=[{"role": "user", "content": _template_prompt(category, criteria, restrictions)}]
+    ) as stream:
+        for text in stream.text_stream:
+            if started is not None:
+                observe("claude_first_text_seconds", time.perf_counter() - started)
+                started = None
+            for section in parser.feed(text):
+                on_section(section)
+            if parser.sections_closed:
+                break
+
+    template = validate_template(parser.result())
+    print(f"[RFP Engine] ✅ Claude streamed template with {len(template.get('sections', []))} sections")
+    return template
 
+
+def _template_prompt(category: str, criteria: dict, restrictions: list) -> str:
     criteria_list = "\n".join(
         f"- {k} (weight: {v.get('weight', '?')}%)" for k, v in criteria.items()
     )
     restrictions_list = "\n".join(f"- {r}" for r in restrictions)
 
-    prompt = f"""You are a healthcare procurement expert. Generate a comprehensive RFP template 
+    return f"""You are a healthcare procurement expert. Generate a comprehensive RFP template 
 for the vendor category: "{category}"
 
 Evaluation criteria being used:
@@ -166,22 +371,6 @@ Include these 7 sections in order:
 Make all questions highly specific to "{category}" — not generic.
 Return ONLY the JSON. No preamble, no explanation, no markdown backticks."""
 
-    response = client.messages.create(
-        model="claude-sonnet-4-6",
-        max_tokens=4096,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    raw = response.content[0].text.strip()
-    # Strip markdown code fences if present
-    raw = re.sub(r'^```json\s*', '', raw)
-    raw = re.sub(r'^```\s*',     '', raw)
-    raw = re.sub(r'\s*```$',     '', raw)
-
-    template = json.loads(raw)
-    print(f"[RFP Engine] ✅ Claude generated template with {len(template.get('sections', []))} sections")
-    return template
-
 
 # ── HELPERS ───────────────────────────────────────────────────
 
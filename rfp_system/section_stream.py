@@ -0,0 +1,103 @@
+"""
+Section Stream Parser
+======================
+Incremental parser for a streamed RFP template. Feed it text as tokens arrive
+and it returns each entry of the top-level "sections" array as soon as that
+entry's closing brace has been received.
+
+    parser = SectionStreamParser()
+    for chunk in stream:
+        for section in parser.feed(chunk):
+            show(section)
+        if parser.sections_closed:
+            break                      # nothing after the sections matters
+    template = parser.result()
+
+Markdown code fences around the JSON are tolerated.
+"""
+
+import re
+import json
+
+
+class SectionStreamParser:
+    """Tracks JSON nesting across chunks; each character is scanned once."""
+
+    def __init__(self):
+        self._text           = ""
+        self._pos            = 0
+        self._stack          = []       # open '{' / '[' characters
+        self._in_str         = False
+        self._esc            = False
+        self._str_start      = 0
+        self._last_key       = None     # last string seen directly inside the root object
+        self._sections_depth = None     # stack depth inside the "sections" array
+        self._sec_start      = None
+        self._sections_end   = None
+        self.sections        = []
+
+    @property
+    def sections_closed(self) -> bool:
+        return self._sections_end is not None
+
+    def feed(self, chunk: str) -> list:
+        """Consume `chunk`; return the sections completed by it."""
+        self._text += chunk
+        text, done = self._text, []
+
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+                    if self._stack == ["{"]:
+                        self._last_key = text[self._str_start + 1:pos]
+                continue
+
+            if ch == '"':
+                self._in_str, self._str_start = True, pos
+            elif ch in "{[":
+                if (ch == "{" and self._sections_depth is not None
+                        and len(self._stack) == self._sections_depth and self._sec_start is None):
+                    self._sec_start = pos
+                self._stack.append(ch)
+                if ch == "[" and self._stack == ["{", "["] and self._last_key == "sections" \
+                        and self._sections_end is None:
+                    self._sections_depth = len(self._stack)
+            elif ch in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if self._sections_depth is None:
+                    continue
+                if ch == "}" and self._sec_start is not None and len(self._stack) == self._sections_depth:
+                    section = json.loads(text[self._sec_start:pos + 1])
+                    self.sections.append(section)
+                    done.append(section)
+                    self._sec_start = None
+                elif ch == "]" and len(self._stack) == self._sections_depth - 1:
+                    self._sections_end   = pos
+                    self._sections_depth = None
+
+        self._pos = len(text)
+        return done
+
+    def result(self) -> dict:
+        """
+        Parse the template received so far. Once the sections array has closed
+        this succeeds even if the closing brace of the root object is missing.
+        """
+        raw = re.sub(r'^\s*```(?:json)?\s*', '', self._text)
+        raw = re.sub(r'\s*```\s*$', '', raw)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            if not self.sections_closed:
+                raise
+        head = self._text[:self._sections_end + 1]
+        head = re.sub(r'^\s*```(?:json)?\s*', '', head)
+        return json.loads(head + "}")
@@ -0,0 +1,382 @@
+"""
+Telemetry
+==========
+Lightweight spans, latency histograms and counters for the app, the RFP
+engine and the DOCX builder — enough to tell whether a slow RFP is waiting
+on Claude, on Node or on disk.
+
+    with span("claude_request", mode="stream"):
+        ...
+    @traced("generate_rfp")
+    def generate_rfp(...): ...
+    count("rfp_documents_total", cache="hit")
+    record("get_scores", seconds, provider="catalogue")   # a span timed elsewhere
+
+Every finished span feeds the histogram vendoriq_span_seconds{span="…", …}
+(fixed latency buckets) and, if it raised, vendoriq_span_errors_total.
+Spans nest through a context variable, so the recent-span buffer keeps
+trace/parent ids for reconstructing one request. Recording a span is a
+perf_counter pair, one bisect and a short locked update (~10 µs) — cheap enough to
+leave on in production.
+
+Export (environment):
+    RFP_TELEMETRY          0 disables recording (default 1)
+    RFP_METRICS_FILE       write Prometheus text here every interval and at exit
+    RFP_TRACE_FILE         append finished spans as JSON lines
+    RFP_METRICS_INTERVAL   export interval in seconds (default 15)
+    RFP_METRICS_PORT       serve Prometheus text on http://<host>:<port>/metrics
+    RFP_METRICS_HOST       bind address for the endpoint (default 127.0.0.1)
+"""
+
+import os
+import json
+import time
+import random
+import atexit
+import bisect
+import tempfile
+import threading
+import functools
+import contextvars
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ── CONFIG ────────────────────────────────────────────────────
+ENABLED         = os.environ.get("RFP_TELEMETRY", "1") != "0"
+METRICS_FILE    = os.environ.get("RFP_METRICS_FILE")
+TRACE_FILE      = os.environ.get("RFP_TRACE_FILE")
+EXPORT_INTERVAL = float(os.environ.get("RFP_METRICS_INTERVAL", "15"))
+METRICS_PORT    = int(os.environ.get("RFP_METRICS_PORT", "0"))
+METRICS_HOST    = os.environ.get("RFP_METRICS_HOST", "127.0.0.1")
+
+PREFIX          = "vendoriq_"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+RECENT_SPANS    = 1000
+
+_current = contextvars.ContextVar("telemetry_span", default=None)
+
+
+# ── METRICS ───────────────────────────────────────────────────
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds values <= bounds[i], the last slot +Inf."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum    = 0.0
+        self.count  = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum   += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (inf if past the last bound)."""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Span:
+    """One timed operation. Use as a context manager, or start()/end() by hand."""
+
+    __slots__ = ("_telemetry", "name", "labels", "attrs", "trace_id", "span_id",
+                 "parent_id", "started", "duration", "_t0", "_token")
+
+    def __init__(self, telemetry, name: str, labels: dict):
+        self._telemetry = telemetry
+        self.name       = name
+        self.labels     = labels
+        self.attrs      = {}
+        self.duration   = None
+        self._token     = None
+
+    def start(self) -> "Span":
+        parent         = _current.get()
+        self.trace_id  = parent.trace_id if parent else _new_id(64)
+        self.parent_id = parent.span_id if parent else None
+        self.span_id   = _new_id(32)
+        self.started   = time.time()
+        self._token    = _current.set(self)
+        self._t0       = time.perf_counter()
+        return self
+
+    def end(self, error: str = None):
+        """Record the span. Later calls are ignored."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._t0
+        try:
+            _current.reset(self._token)
+        except ValueError:          # ended from another context
+            pass
+        self._telemetry._finish(self, error)
+
+    def label(self, **labels):
+        """Set metric labels that are only known part-way through, e.g. a cache outcome."""
+        self.labels.update({k: str(v) for k, v in labels.items()})
+
+    def note(self, **attrs):
+        """Attach detail to the trace record only (not a metric label)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc_type.__name__ if exc_type else None)
+        return False
+
+
+class _NullSpan:
+    """Stand-in returned while telemetry is disabled."""
+
+    def start(self): return self
+    def end(self, error=None): pass
+    def label(self, **labels): pass
+    def note(self, **attrs): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# ── REGISTRY ──────────────────────────────────────────────────
+
+class Telemetry:
+    """Process-wide span histograms, counters and a buffer of recent spans."""
+
+    def __init__(self, enabled: bool = ENABLED, buckets=LATENCY_BUCKETS):
+        self.enabled    = enabled
+        self.buckets    = tuple(buckets)
+        self._lock      = threading.Lock()
+        self._hists     = {}                # (metric, labels) -> Histogram
+        self._counters  = {}                # (metric, labels) -> float
+        self._recent    = deque(maxlen=RECENT_SPANS)
+        self._unwritten = deque(maxlen=50 * RECENT_SPANS)   # not yet in TRACE_FILE
+        self._exporting = False
+
+    # ── recording ─────────────────────────────────────────────
+    def span(self, name: str, **labels):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, {k: str(v) for k, v in labels.items()})
+
+    def traced(self, name: str = None, **labels):
+        """Decorator: run the function inside a span (named after it by default)."""
+        def wrap(fn):
+            span_name = name or fn.__name__
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                with self.span(span_name, **labels):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def record(self, name: str, seconds: float, error: str = None, **labels):
+        """Record a span whose duration was measured elsewhere (e.g. in a worker thread)."""
+        if not self.enabled:
+            return
+        span = Span(self, name, {k: str(v) for k, v in labels.items()})
+        parent = _current.get()
+        span.trace_id  = parent.trace_id if parent else _new_id(64)
+        span.parent_id = parent.span_id if parent else None
+        span.span_id   = _new_id(32)
+        span.started   = time.time() - seconds
+        span.duration  = seconds
+        self._finish(span, error)
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Add a value to a histogram other than span_seconds, e.g. a queue wait."""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = Histogram(self.buckets)
+            hist.observe(value)
+
+    def _finish(self, span: Span, error: str):
+        labels = _label_key(dict(span.labels, span=span.name))
+        record = {"trace": span.trace_id, "id": span.span_id, "parent": span.parent_id,
+                  "name": span.name, "start": round(span.started, 6),
+                  "ms": round(span.duration * 1000, 3), **span.labels}
+        if span.attrs:
+            record["attrs"] = span.attrs
+        if error:
+            record["error"] = error
+        with self._lock:
+            hist = self._hists.get(("span_seconds", labels))
+            if hist is None:
+                hist = self._hists[("span_seconds", labels)] = Histogram(self.buckets)
+            hist.observe(span.duration)
+            if error:
+                key = ("span_errors_total", _label_key({"span": span.name, "error": error}))
+                self._counters[key] = self._counters.get(key, 0) + 1
+            self._recent.append(record)
+            if TRACE_FILE:
+                self._unwritten.append(record)
+
+    # ── reading ───────────────────────────────────────────────
+    def recent(self, limit: int = 100, name: str = None) -> list:
+        """The most recent finished spans, newest last."""
+        with self._lock:
+            spans = [s for s in self._recent if name is None or s["name"] == name]
+        return spans[-limit:]
+
+    def summary(self) -> list:
+        """[{metric, labels, count, mean_ms, p50_ms, p95_ms}], slowest mean first. Percentiles are bucket bounds."""
+        with self._lock:
+            items = [(k, h.count, h.sum, h.quantile(0.5), h.quantile(0.95)) for k, h in self._hists.items()]
+        rows = [{"metric": metric, "labels": dict(labels), "count": n,
+                 "mean_ms": round(total / n * 1000, 2) if n else 0.0,
+                 "p50_ms": p50 * 1000, "p95_ms": p95 * 1000}
+                for (metric, labels), n, total, p50, p95 in items]
+        return sorted(rows, key=lambda r: -r["mean_ms"])
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            hists    = {k: (list(h.counts), h.sum, h.count) for k, h in self._hists.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        for metric in sorted({m for m, _ in hists}):
+            lines.append(f"# TYPE {PREFIX}{metric} histogram")
+            for (m, labels), (counts, total, n) in sorted(hists.items()):
+                if m != metric:
+                    continue
+                cumulative = 0
+                for bound, c in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += c
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{PREFIX}{metric}_bucket{_fmt_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{PREFIX}{metric}_sum{_fmt_labels(labels)} {total:.6f}")
+                lines.append(f"{PREFIX}{metric}_count{_fmt_labels(labels)} {n}")
+        for metric in sorted({m for m, _ in counters}):
+            lines.append(f"# TYPE {PREFIX}{metric} counter")
+            for (m, labels), value in sorted(counters.items()):
+                if m == metric:
+                    lines.append(f"{PREFIX}{metric}{_fmt_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+            self._recent.clear()
+            self._unwritten.clear()
+
+    # ── export ────────────────────────────────────────────────
+    def export(self, metrics_file: str = None, trace_file: str = None):
+        """Write Prometheus text (atomically) and append pending spans as JSON lines."""
+        metrics_file = metrics_file or METRICS_FILE
+        trace_file   = trace_file or TRACE_FILE
+        if metrics_file:
+            directory = os.path.dirname(os.path.abspath(metrics_file))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+            with os.fdopen(fd, "w") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp, metrics_file)
+        if trace_file:
+            with self._lock:
+                pending = list(self._unwritten)
+                self._unwritten.clear()
+            if pending:
+                with open(trace_file, "a") as f:
+                    f.writelines(json.dumps(r) + "\n" for r in pending)
+
+    def serve(self, port: int = METRICS_PORT, host: str = METRICS_HOST) -> ThreadingHTTPServer:
+        """Serve /metrics from a daemon thread. Returns the server."""
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = telemetry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+        print(f"[Telemetry] Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+    def start_exporters(self):
+        """Start the file exporter and HTTP endpoint configured in the environment, once."""
+        if self._exporting or not self.enabled:
+            return
+        self._exporting = True
+        if METRICS_FILE or TRACE_FILE:
+            threading.Thread(target=self._export_loop, daemon=True, name="metrics-export").start()
+            atexit.register(self._export_quietly)
+        if METRICS_PORT:
+            try:
+                self.serve(METRICS_PORT)
+            except OSError as e:
+                print(f"[Telemetry] ⚠️  Could not serve metrics on port {METRICS_PORT}: {e}")
+
+    def _export_loop(self):
+        while True:
+            time.sleep(EXPORT_INTERVAL)
+            self._export_quietly()
+
+    def _export_quietly(self):
+        try:
+            self.export()
+        except OSError as e:
+            print(f"[Telemetry] ⚠️  Metrics export failed: {e}")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+# ── SHARED INSTANCE ───────────────────────────────────────────
+
+TELEMETRY = Telemetry()
+span      = TELEMETRY.span
+traced    = TELEMETRY.traced
+record    = TELEMETRY.record
+count     = TELEMETRY.count
+observe   = TELEMETRY.observe
+
+TELEMETRY.start_exporters()
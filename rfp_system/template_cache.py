@@ -0,0 +1,136 @@
+"""
+Template Cache
+===============
+On-disk cache of Claude-generated RFP templates, so a category without a
+pre-built template only pays for the Claude call once.
+
+Entries are keyed on the category plus fingerprints of the criteria (name and
+weight — what the prompt uses) and the restrictions, and bounded by:
+    RFP_TEMPLATE_CACHE_DIR        location   (default <tmp>/rfp_template_cache)
+    RFP_TEMPLATE_CACHE_TTL_DAYS   days an entry stays valid after generation (default 30)
+    RFP_TEMPLATE_CACHE_MAX        entries kept, least recently used evicted first (default 200)
+
+A cached template can be promoted into TEMPLATES_DIR, after which it is
+served as a pre-built template for every criteria/restrictions combination.
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+CACHE_DIR   = os.environ.get("RFP_TEMPLATE_CACHE_DIR",
+                             os.path.join(tempfile.gettempdir(), "rfp_template_cache"))
+TTL         = float(os.environ.get("RFP_TEMPLATE_CACHE_TTL_DAYS", "30")) * 86400
+MAX_ENTRIES = int(os.environ.get("RFP_TEMPLATE_CACHE_MAX", "200"))
+
+
+def _fingerprint(obj) -> str:
+    blob = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def criteria_fingerprint(criteria: dict) -> str:
+    return _fingerprint({k: v.get("weight") for k, v in (criteria or {}).items()})
+
+
+def restrictions_fingerprint(restrictions: list) -> str:
+    return _fingerprint([r.strip() for r in (restrictions or []) if r.strip()])
+
+
+class TemplateCache:
+    """TTL- and size-bounded store of generated templates, one JSON file per entry."""
+
+    def __init__(self, root: str = CACHE_DIR, ttl: float = TTL, max_entries: int = MAX_ENTRIES):
+        self.root        = root
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+
+    def path_for(self, category: str, criteria: dict, restrictions: list) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '_', category.lower()).strip('_')
+        cfp, rfp = criteria_fingerprint(criteria), restrictions_fingerprint(restrictions)
+        return os.path.join(self.root, f"{slug}__{cfp}__{rfp}.json")
+
+    def get(self, category: str, criteria: dict, restrictions: list) -> dict:
+        """The cached template, or None on a miss or an expired entry."""
+        entry = self._read(self.path_for(category, criteria, restrictions), touch=True)
+        return entry["template"] if entry else None
+
+    def contains(self, category: str, criteria: dict, restrictions: list) -> bool:
+        return self._read(self.path_for(category, criteria, restrictions)) is not None
+
+    def put(self, category: str, criteria: dict, restrictions: list, template: dict):
+        path  = self.path_for(category, criteria, restrictions)
+        entry = {
+            "category":     category,
+            "criteria":     criteria_fingerprint(criteria),
+            "restrictions": restrictions_fingerprint(restrictions),
+            "created":      time.time(),
+            "template":     {k: v for k, v in template.items() if k != "context"},
+        }
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.prune()
+
+    def promote(self, category: str, criteria: dict, restrictions: list, dest_path: str) -> str:
+        """Copy a cached template to `dest_path` as a pre-built template."""
+        template = self.get(category, criteria, restrictions)
+        if template is None:
+            raise KeyError(f"No cached template for {category!r} with these criteria and restrictions")
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path, "w") as f:
+            json.dump(template, f, indent=2, ensure_ascii=False)
+        return dest_path
+
+    def prune(self) -> int:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        with self._lock:
+            entries = []
+            for path in glob.glob(os.path.join(self.root, "*.json")):
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            evicted = 0
+            live = []
+            for mtime, path in entries:
+                if self._read(path) is None:
+                    evicted += 1        # _read removes expired / corrupt entries
+                else:
+                    live.append((mtime, path))
+            for _, path in sorted(live)[:max(len(live) - self.max_entries, 0)]:
+                evicted += self._remove(path)
+            return evicted
+
+    # ── internals ─────────────────────────────────────────────
+    def _read(self, path: str, touch: bool = False) -> dict:
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError):
+            self._remove(path)
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            self._remove(path)
+            return None
+        if touch:
+            os.utime(path)      # mtime records last use, for LRU eviction
+        return entry
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.unlink(path)
+            return 1
+        except FileNotFoundError:
+            return 0
@@ -0,0 +1,98 @@
+"""
+Template Registry
+==================
+Process-wide, in-memory registry of pre-built RFP templates.
+
+Templates are parsed and validated once and served from memory. Each entry
+remembers its file's mtime and is re-read only when that changes; the file is
+stat'ed at most once every RFP_TEMPLATE_CHECK_SECONDS (default 2) per entry,
+so Streamlit reruns do no disk I/O at all in between.
+
+Lookups return deep copies — callers such as generate_rfp attach runtime
+data to the template and must not mutate the shared entry.
+"""
+
+import os
+import copy
+import json
+import time
+import threading
+
+CHECK_INTERVAL = float(os.environ.get("RFP_TEMPLATE_CHECK_SECONDS", "2"))
+
+
+def validate_template(template) -> dict:
+    """Check the structure build_rfp_docx relies on. Returns the template or raises ValueError."""
+    if not isinstance(template, dict):
+        raise ValueError("template must be a JSON object")
+    sections = template.get("sections")
+    if not isinstance(sections, list) or not sections:
+        raise ValueError("template needs a non-empty 'sections' list")
+    for i, sec in enumerate(sections, 1):
+        if not isinstance(sec, dict) or not sec.get("title"):
+            raise ValueError(f"section {i} needs a 'title'")
+        questions = sec.get("questions", [])
+        if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+            raise ValueError(f"section {i} 'questions' must be a list of strings")
+    if not isinstance(template.get("mandatory_requirements", []), list):
+        raise ValueError("'mandatory_requirements' must be a list")
+    return template
+
+
+class TemplateRegistry:
+    """Path → validated template, refreshed when the file's mtime changes."""
+
+    def __init__(self, check_interval: float = CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._entries = {}          # path -> {"mtime", "template", "checked"}
+        self._lock    = threading.Lock()
+
+    def preload(self, paths):
+        """Load and validate every template up front."""
+        for path in paths:
+            if path:
+                self._entry(path, force=True)
+
+    def get(self, path: str) -> dict:
+        """A private copy of the template at `path`, or None if missing or invalid."""
+        entry = self._entry(path)
+        return copy.deepcopy(entry["template"]) if entry["template"] is not None else None
+
+    def exists(self, path: str) -> bool:
+        return bool(path) and self._entry(path)["template"] is not None
+
+    def invalidate(self, path: str = None):
+        """Forget one entry (or all) so the next lookup goes back to disk."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    # ── internals ─────────────────────────────────────────────
+    def _entry(self, path: str, force: bool = False) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and not force and now - entry["checked"] < self.check_interval:
+                return entry
+
+            try:
+                mtime = os.stat(path).st_mtime if path else None
+            except FileNotFoundError:
+                mtime = None
+
+            if entry is None or entry["mtime"] != mtime:
+                entry = {"mtime": mtime, "template": self._load(path) if mtime else None}
+                self._entries[path] = entry
+            entry["checked"] = now
+            return entry
+
+    @staticmethod
+    def _load(path: str) -> dict:
+        try:
+            with open(path, "r") as f:
+                return validate_template(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"[Template Registry] ⚠️  Ignoring invalid template {path}: {e}")
+            return None
@@ -0,0 +1,341 @@
+"""
+Vendor Catalogue
+=================
+SQLite-backed store of vendors (by category) and their raw criterion scores.
+
+Tables:
+    vendors  (category, name, name_norm, desc, position)
+             unique on (category, name_norm); indexed on (category, position)
+             and name_norm
+    scores   (name_norm, criterion, raw) — one row per vendor × criterion;
+             the "__default__" vendor holds scores for unknown vendors
+    attributes (name_norm, attribute, value) — structured facts used by
+             restriction screening (hipaa_baa, healthcare_since, fhir, …);
+             values are JSON-encoded
+    meta     catalogue version (bumped on every import), content fingerprint
+             (a hash of every vendor, score and attribute row, recomputed on
+             every import) and seed fingerprint
+
+Vendor names are matched on a normalised form (lowercase, punctuation and
+repeated spaces removed), so "Epic Systems" and "epic  systems." are the
+same vendor.
+
+On first open — and whenever catalogue_seed.json changes — the seed is
+imported. Further vendors are added with bulk_import() or from the command
+line:
+
+    python catalogue.py import vendors.csv      # name,category,desc,<criterion>...,attr:<attribute>...
+    python catalogue.py import vendors.jsonl    # {"name", "category", "desc", "scores": {...}, "attributes": {...}}
+    python catalogue.py stats
+
+Environment:
+    VENDOR_CATALOGUE_DB     database path (default <tmp>/vendoriq_catalogue.db)
+    VENDOR_CATALOGUE_SEED   seed JSON     (default catalogue_seed.json next to this file)
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+import threading
+
+DB_PATH     = os.environ.get("VENDOR_CATALOGUE_DB",
+                             os.path.join(tempfile.gettempdir(), "vendoriq_catalogue.db"))
+SEED_PATH   = os.environ.get("VENDOR_CATALOGUE_SEED",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogue_seed.json"))
+DEFAULT_KEY = "__default__"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vendors (
+    id        INTEGER PRIMARY KEY,
+    category  TEXT    NOT NULL,
+    name      TEXT    NOT NULL,
+    name_norm TEXT    NOT NULL,
+    desc      TEXT    NOT NULL DEFAULT '',
+    position  INTEGER NOT NULL,
+    UNIQUE (category, name_norm)
+);
+CREATE INDEX IF NOT EXISTS idx_vendors_category  ON vendors (category, position);
+CREATE INDEX IF NOT EXISTS idx_vendors_name_norm ON vendors (name_norm);
+CREATE TABLE IF NOT EXISTS scores (
+    name_norm TEXT    NOT NULL,
+    criterion TEXT    NOT NULL,
+    raw       NUMERIC NOT NULL,
+    PRIMARY KEY (name_norm, criterion)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS attributes (
+    name_norm TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    PRIMARY KEY (name_norm, attribute)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def normalise_name(name: str) -> str:
+    """Lowercase, punctuation → space, whitespace collapsed."""
+    return " ".join(re.sub(r"[^\w\s]", " ", (name or "").lower()).split())
+
+
+class VendorCatalogue:
+    """One SQLite connection shared across threads, serialised by a lock."""
+
+    def __init__(self, path: str = DB_PATH, seed_path: str = SEED_PATH):
+        self.path        = path
+        self._lock       = threading.Lock()
+        self._categories = None
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        if seed_path and os.path.exists(seed_path):
+            self._seed(seed_path)
+
+    # ── reads ─────────────────────────────────────────────────
+    @property
+    def version(self) -> int:
+        """Incremented by every import; lets callers invalidate derived caches."""
+        return int(self._meta("version") or 0)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the catalogue's contents — equal for two databases only if they hold the same data."""
+        value = self._meta("fingerprint")
+        if value is None:
+            with self._lock, self._db:
+                value = self._store_fingerprint_unlocked()
+        return value
+
+    def categories(self) -> list:
+        if self._categories is None:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT category FROM vendors GROUP BY category ORDER BY MIN(id)").fetchall()
+            self._categories = [r["category"] for r in rows]
+        return list(self._categories)
+
+    def vendors(self, category: str) -> list:
+        """[{"name", "desc"}] for one category, in catalogue order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, desc FROM vendors WHERE category = ? ORDER BY position",
+                (category,)).fetchall()
+        return [{"name": r["name"], "desc": r["desc"]} for r in rows]
+
+    def names(self) -> list:
+        """Every distinct vendor name, in catalogue order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name FROM vendors GROUP BY name_norm ORDER BY MIN(id)").fetchall()
+        return [r["name"] for r in rows]
+
+    def lookup(self, name: str) -> dict:
+        """The catalogue entry for `name` (normalised match), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT name, category, desc FROM vendors WHERE name_norm = ? ORDER BY id LIMIT 1",
+                (normalise_name(name),)).fetchone()
+        return dict(row) if row else None
+
+    def scores(self, name: str) -> dict:
+        """{criterion: raw} for `name`, or None if the vendor has no scores."""
+        return self._scores(normalise_name(name)) or None
+
+    def default_scores(self) -> dict:
+        return self._scores(DEFAULT_KEY)
+
+    def attributes(self, names) -> dict:
+        """{name: {attribute: value}} for the given names; names with none are left out."""
+        by_norm = {}
+        for name in names:
+            by_norm.setdefault(normalise_name(name), []).append(name)
+        norms, result = list(by_norm), {}
+        with self._lock:
+            for i in range(0, len(norms), 500):
+                chunk = norms[i:i + 500]
+                rows  = self._db.execute(
+                    f"SELECT name_norm, attribute, value FROM attributes "
+                    f"WHERE name_norm IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+                for r in rows:
+                    for name in by_norm[r["name_norm"]]:
+                        result.setdefault(name, {})[r["attribute"]] = json.loads(r["value"])
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            vendors = self._db.execute("SELECT COUNT(*) FROM vendors").fetchone()[0]
+            scored  = self._db.execute("SELECT COUNT(DISTINCT name_norm) FROM scores").fetchone()[0]
+        return {"path": self.path, "version": self.version, "categories": len(self.categories()),
+                "vendors": vendors, "scored_vendors": scored}
+
+    # ── writes ────────────────────────────────────────────────
+    def bulk_import(self, vendors=(), scores: dict = None, default_scores: dict = None,
+                    attributes: dict = None) -> dict:
+        """
+        Upsert vendors, scores and attributes in one transaction.
+            vendors         iterable of {"name", "category", "desc"?, "scores"?, "attributes"?}
+            scores          {vendor_name: {criterion: raw}}
+            default_scores  {criterion: raw} for vendors with no scores
+            attributes      {vendor_name: {attribute: value}}; a value of None removes it
+        Returns {"vendors": n, "scores": n, "attributes": n}.
+        """
+        vendor_rows, score_rows, attr_rows = [], [], []
+        for v in vendors:
+            name, category = (v.get("name") or "").strip(), (v.get("category") or "").strip()
+            if not name or not category:
+                raise ValueError(f"Vendor record needs 'name' and 'category': {v!r}")
+            norm = normalise_name(name)
+            vendor_rows.append((category, name, norm, (v.get("desc") or "").strip(), category))
+            score_rows += [(norm, c, raw) for c, raw in (v.get("scores") or {}).items()]
+            attr_rows  += [(norm, a, value) for a, value in (v.get("attributes") or {}).items()]
+        for name, raw_scores in (scores or {}).items():
+            score_rows += [(normalise_name(name), c, raw) for c, raw in raw_scores.items()]
+        score_rows += [(DEFAULT_KEY, c, raw) for c, raw in (default_scores or {}).items()]
+        for name, attrs in (attributes or {}).items():
+            attr_rows += [(normalise_name(name), a, value) for a, value in attrs.items()]
+
+        with self._lock, self._db:
+            self._db.executemany(
+                """INSERT INTO vendors (category, name, name_norm, desc, position)
+                   VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(position) + 1, 0)
+                                        FROM vendors WHERE category = ?))
+                   ON CONFLICT (category, name_norm) DO UPDATE SET
+                       name = excluded.name, desc = excluded.desc""", vendor_rows)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (name_norm, criterion, raw) VALUES (?, ?, ?)",
+                score_rows)
+            self._db.executemany(
+                "DELETE FROM attributes WHERE name_norm = ? AND attribute = ?",
+                [(norm, a) for norm, a, value in attr_rows if value is None])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO attributes (name_norm, attribute, value) VALUES (?, ?, ?)",
+                [(norm, a, json.dumps(value)) for norm, a, value in attr_rows if value is not None])
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (str(self._version_unlocked() + 1),))
+            self._store_fingerprint_unlocked()
+        self._categories = None
+        return {"vendors": len(vendor_rows), "scores": len(score_rows), "attributes": len(attr_rows)}
+
+    def import_file(self, path: str) -> dict:
+        """Bulk-import a .csv, .json or .jsonl file (see module docstring)."""
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            if ext == ".csv":
+                return self.bulk_import(_csv_records(csv.DictReader(f)))
+            if ext == ".jsonl":
+                return self.bulk_import(json.loads(line) for line in f if line.strip())
+            if ext == ".json":
+                data = json.load(f)
+            else:
+                raise ValueError(f"Unsupported catalogue file {ext!r} — use .csv, .json or .jsonl")
+        if isinstance(data, list):
+            return self.bulk_import(data)
+        return self.bulk_import(
+            ({**v, "category": cat} for cat, vs in data.get("categories", {}).items() for v in vs),
+            scores=data.get("scores"), default_scores=data.get("default_scores"),
+            attributes=data.get("attributes"))
+
+    # ── internals ─────────────────────────────────────────────
+    def _scores(self, name_norm: str) -> dict:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT criterion, raw FROM scores WHERE name_norm = ?", (name_norm,)).fetchall()
+        return {r["criterion"]: r["raw"] for r in rows}
+
+    def _meta(self, key: str):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _version_unlocked(self) -> int:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def _store_fingerprint_unlocked(self) -> str:
+        digest = hashlib.sha256()
+        for query in ("SELECT category, name_norm, name, desc, position FROM vendors ORDER BY category, name_norm",
+                      "SELECT name_norm, criterion, raw FROM scores ORDER BY name_norm, criterion",
+                      "SELECT name_norm, attribute, value FROM attributes ORDER BY name_norm, attribute"):
+            for row in self._db.execute(query):
+                digest.update(json.dumps(tuple(row)).encode("utf-8"))
+            digest.update(b"\x00")
+        value = digest.hexdigest()[:16]
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (value,))
+        return value
+
+    def _seed(self, seed_path: str):
+        with open(seed_path, "rb") as f:
+            fingerprint = hashlib.sha256(f.read()).hexdigest()
+        if self._meta("seed") == fingerprint:
+            return
+        counts = self.import_file(seed_path)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seed', ?)", (fingerprint,))
+        print(f"[Catalogue] Seeded {counts['vendors']} vendors from {os.path.basename(seed_path)}")
+
+
+def _csv_records(rows):
+    """
+    CSV rows → vendor records. "attr:<attribute>" columns are attributes
+    (true/false, numbers or text); every other column besides
+    name/category/desc is a criterion score.
+    """
+    for row in rows:
+        scores, attributes = {}, {}
+        for col, value in row.items():
+            if col in ("name", "category", "desc") or value in (None, ""):
+                continue
+            if col.startswith("attr:"):
+                attributes[col[5:].strip()] = _csv_value(value)
+            else:
+                scores[col] = float(value) if "." in value else int(value)
+        yield {"name": row.get("name"), "category": row.get("category"),
+               "desc": row.get("desc"), "scores": scores, "attributes": attributes}
+
+
+def _csv_value(value: str):
+    lowered = value.strip().lower()
+    if lowered in ("true", "yes", "y"):
+        return True
+    if lowered in ("false", "no", "n"):
+        return False
+    try:
+        return int(lowered)
+    except ValueError:
+        return value.strip()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the VendorIQ vendor catalogue.")
+    parser.add_argument("--db", default=DB_PATH, help=f"catalogue database (default {DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="bulk-import vendors from .csv, .json or .jsonl")
+    imp.add_argument("files", nargs="+")
+    sub.add_parser("stats", help="show catalogue size")
+    args = parser.parse_args(argv)
+
+    catalogue = VendorCatalogue(args.db)
+    if args.command == "import":
+        for path in args.files:
+            counts = catalogue.import_file(path)
+            print(f"  ✅ {path}: {counts['vendors']} vendors, {counts['scores']} scores, "
+                  f"{counts['attributes']} attributes")
+    print(json.dumps(catalogue.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
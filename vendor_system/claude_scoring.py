@@ -0,0 +1,264 @@
+"""
+Claude Scoring
+===============
+ScoringProvider that asks Claude for raw criterion scores, many vendors per
+request.
+
+Each request carries:
+
+    system   the scoring preamble — rubric, criteria with descriptions and
+             the hard restrictions — marked for prompt caching, so every
+             chunk after the first in a 5-minute window reads it from cache
+    tools    one `record_scores` tool whose input schema has an integer 0–10
+             property per criterion; tool_choice forces Claude to call it,
+             which makes the answer structured JSON rather than prose
+    user     the chunk: numbered vendors with their catalogue descriptions
+
+The tool input is validated into the shape of the catalogue's score rows —
+{criterion: int 0–10} with every criterion present. Vendors missing from the
+answer or failing validation, or a whole chunk that comes back malformed or
+truncated, are re-asked one vendor per request. API errors are not retried
+here — the shared client retries 429/5xx — and whatever still fails surfaces
+through evaluate() as an error, so the app falls back to default scores.
+
+Weights are left out of the prompt: they don't change raw scores, and
+keeping them out means moving a slider never invalidates the cached prefix.
+Claude only caches prefixes above a model-specific minimum (about a thousand
+tokens), so short criteria lists may not be cached.
+
+With evaluate(), a 50-vendor longlist is 5 requests at the default chunk
+size of 10 instead of 50, and the preamble is paid for in full once.
+
+Environment:
+    VENDOR_SCORING_MODEL   model (default claude-sonnet-4-6)
+    VENDOR_SCORING_BATCH   vendors per request (default 10)
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+
+import anthropic
+
+from providers import ScoringProvider
+from catalogue import normalise_name
+
+MODEL      = os.environ.get("VENDOR_SCORING_MODEL", "claude-sonnet-4-6")
+BATCH_SIZE = int(os.environ.get("VENDOR_SCORING_BATCH", "10"))
+TOOL_NAME  = "record_scores"
+
+_client      = None
+_client_lock = threading.Lock()
+
+
+class MalformedScores(ValueError):
+    """Claude's answer for a chunk could not be read as scores."""
+
+
+def _default_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        return _client
+
+
+class ClaudeScoringProvider(ScoringProvider):
+    """
+    Batched Claude scoring.
+        restrictions  hard requirements, shown to Claude as context
+        describe      optional describe(vendor_name) -> str, e.g. a catalogue description
+        client        an anthropic.Anthropic-compatible client, normally the app's shared
+                      claude_client.get_client(); a plain module-level client if None
+    """
+
+    name       = "claude"
+    concurrent = True
+
+    def __init__(self, restrictions=(), describe=None, client=None,
+                 model: str = MODEL, batch_size: int = BATCH_SIZE):
+        self.restrictions = list(restrictions)
+        self.describe     = describe
+        self.client       = client
+        self.model        = model
+        self.batch_size   = max(1, batch_size)
+        self.usage        = {"requests": 0, "input_tokens": 0, "output_tokens": 0,
+                             "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+        self._lock        = threading.Lock()
+        material          = json.dumps([model, sorted(self.restrictions)])
+        self.fingerprint  = "claude:" + hashlib.sha256(material.encode("utf-8")).hexdigest()[:12]
+
+    def score(self, vendor_name: str, criteria: dict) -> dict:
+        results = self._request([vendor_name], criteria)
+        if vendor_name not in results:
+            raise MalformedScores(f"No valid scores returned for {vendor_name}")
+        return results[vendor_name]
+
+    def score_many(self, vendor_names: list, criteria: dict) -> dict:
+        try:
+            results = self._request(vendor_names, criteria)
+        except MalformedScores as e:
+            print(f"[Scoring] ⚠️  Claude chunk of {len(vendor_names)} malformed ({e}) — scoring individually")
+            results = {}
+
+        missing = [n for n in vendor_names if n not in results]
+        if missing and len(vendor_names) > 1:
+            if len(missing) < len(vendor_names):
+                print(f"[Scoring] ⚠️  Claude skipped {len(missing)} of {len(vendor_names)} vendors — scoring individually")
+            for name in missing:
+                try:
+                    results[name] = self.score(name, criteria)
+                except Exception as e:
+                    results[name] = e
+        return results
+
+    # ── request ───────────────────────────────────────────────
+    def _request(self, vendor_names: list, criteria: dict) -> dict:
+        """{vendor_name: scores} for the vendors Claude answered validly."""
+        client   = self.client or _default_client()
+        response = client.messages.create(
+            model=self.model,
+            max_tokens=min(8192, 256 + len(vendor_names) * (24 + 12 * len(criteria))),
+            system=[{"type": "text", "text": scoring_preamble(criteria, self.restrictions),
+                     "cache_control": {"type": "ephemeral"}}],
+            tools=[scores_tool(criteria)],
+            tool_choice={"type": "tool", "name": TOOL_NAME},
+            messages=[{"role": "user", "content": self._vendor_list(vendor_names)}],
+        )
+        self._count(getattr(response, "usage", None))
+        if response.stop_reason == "max_tokens":
+            raise MalformedScores("response was truncated")
+        return parse_scores(_answer(response), vendor_names, criteria)
+
+    def _vendor_list(self, vendor_names: list) -> str:
+        lines = []
+        for i, name in enumerate(vendor_names, 1):
+            desc = self.describe(name) if self.describe else ""
+            lines.append(f"V{i}. {name}" + (f" — {desc}" if desc else ""))
+        return (f"Score these {len(vendor_names)} vendors. Call {TOOL_NAME} once with an entry "
+                f"for every vendor, using its V-number as the id.\n\n" + "\n".join(lines))
+
+    def _count(self, usage):
+        if usage is None:
+            return
+        with self._lock:
+            self.usage["requests"] += 1
+            for key in ("input_tokens", "output_tokens",
+                        "cache_read_input_tokens", "cache_creation_input_tokens"):
+                self.usage[key] += getattr(usage, key, None) or 0
+
+
+# ── PROMPT ────────────────────────────────────────────────────
+
+def scoring_preamble(criteria: dict, restrictions) -> str:
+    """The cached system prompt. Depends on criteria names/descriptions and restrictions only."""
+    criteria_list = "\n".join(
+        f"- {name}: {(info or {}).get('desc', '')}".rstrip(": ") for name, info in criteria.items())
+    restrictions_list = "\n".join(f"- {r}" for r in restrictions) or "- (none)"
+    return f"""You are a healthcare procurement analyst scoring vendors for a hospital's vendor selection.
+
+Score each vendor from 0 to 10 on every criterion below, using what is publicly known about the
+vendor and its products:
+  10    best in class, well documented
+  7-9   strong, with minor gaps
+  4-6   adequate or mixed evidence
+  1-3   weak, or significant known problems
+  0     absent, or clearly disqualifying
+
+Criteria:
+{criteria_list}
+
+Hard restrictions the buyer applies separately. Do not score them directly, but let
+evidence about them inform the related criteria:
+{restrictions_list}
+
+Score vendors independently of each other. If you know little about a vendor, give
+middling scores (5-6) rather than guessing high or low. Always answer with the
+{TOOL_NAME} tool, never in prose."""
+
+
+def scores_tool(criteria: dict) -> dict:
+    """Tool whose input schema is {"vendors": [{"id": "V1", "scores": {criterion: 0-10}}]}."""
+    score_props = {name: {"type": "integer", "minimum": 0, "maximum": 10} for name in criteria}
+    return {
+        "name": TOOL_NAME,
+        "description": "Record 0-10 scores per criterion for every vendor in the request.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "vendors": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id":     {"type": "string", "description": "V-number from the request, e.g. V3"},
+                            "scores": {"type": "object", "properties": score_props,
+                                       "required": list(criteria)},
+                        },
+                        "required": ["id", "scores"],
+                    },
+                },
+            },
+            "required": ["vendors"],
+        },
+    }
+
+
+# ── VALIDATION ────────────────────────────────────────────────
+
+def _answer(response):
+    """The record_scores tool input, or JSON parsed from a text answer."""
+    for block in response.content:
+        if getattr(block, "type", None) == "tool_use" and block.name == TOOL_NAME:
+            return block.input
+    text = "".join(getattr(b, "text", "") for b in response.content).strip()
+    text = re.sub(r'^```(?:json)?\s*', '', text)
+    text = re.sub(r'\s*```$',          '', text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        raise MalformedScores("no tool call and no JSON in the answer") from None
+
+
+def parse_scores(answer, vendor_names: list, criteria: dict) -> dict:
+    """
+    Validate an answer into {vendor_name: {criterion: int}}. Entries are matched
+    by V-number, or by vendor name as a fallback; invalid entries are dropped.
+    Raises MalformedScores if the answer has no vendors list at all.
+    """
+    entries = answer.get("vendors") if isinstance(answer, dict) else answer
+    if not isinstance(entries, list):
+        raise MalformedScores("answer has no vendors list")
+
+    by_id   = {f"V{i}": name for i, name in enumerate(vendor_names, 1)}
+    by_name = {normalise_name(name): name for name in vendor_names}
+    results = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        ref  = str(entry.get("id") or "").strip().upper().rstrip(".")
+        name = by_id.get(ref) or by_name.get(normalise_name(str(entry.get("id") or entry.get("name") or "")))
+        scores = _valid_scores(entry.get("scores"), criteria)
+        if name and scores is not None and name not in results:
+            results[name] = scores
+    return results
+
+
+def _valid_scores(scores, criteria: dict):
+    """{criterion: int 0–10} for every criterion, or None."""
+    if not isinstance(scores, dict):
+        return None
+    valid = {}
+    for name in criteria:
+        value = scores.get(name)
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 10:
+            return None
+        valid[name] = int(round(value))
+    return valid
@@ -0,0 +1,108 @@
+"""
+Vendor Name Index
+==================
+Trigram postings index for resolving free-text vendor names ("Cerner",
+"Oracle Cerner", "epic") to catalogue entries.
+
+Every name is normalised and split into words; each word is padded ("  epic ")
+and cut into trigrams, so grams never straddle a word boundary. The index maps
+gram → list of entry ids and is built once. A query only touches the postings
+of its own grams:
+
+    1. count shared grams per entry through the postings (very common grams
+       are skipped for candidate generation once the query has rarer ones);
+    2. re-score the best candidates exactly:
+           containment = shared / query grams     — how much of the query matched
+           dice        = 2·shared / (query + entry grams)
+           score       = 0.7·containment + 0.3·dice
+       An exact normalised match always scores 1.0.
+
+Usage:
+    index = NameIndex(catalogue.names())      # build once per catalogue version
+    index.search("oracle cerner")   # [("Oracle Health (Cerner)", 0.83), ...]
+    index.resolve("Cerner")         # "Oracle Health (Cerner)" or None
+"""
+
+from collections import Counter
+
+from catalogue import normalise_name
+
+MIN_SCORE      = 0.35    # below this a candidate is not worth suggesting
+RESOLVE_SCORE  = 0.75    # auto-resolve only confident matches...
+RESOLVE_MARGIN = 0.1     # ...that clearly beat the runner-up
+CANDIDATES     = 50      # entries re-scored exactly per query
+
+
+def trigrams(name: str) -> set:
+    grams = set()
+    for word in normalise_name(name).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """Immutable trigram index over a list of display names."""
+
+    def __init__(self, names):
+        self.names    = []
+        self._grams   = []          # entry id -> set of grams
+        self._exact   = {}          # normalised name -> entry id
+        self.postings = {}          # gram -> [entry id, ...]
+        for name in names:
+            norm = normalise_name(name)
+            if not norm or norm in self._exact:
+                continue
+            entry = len(self.names)
+            grams = trigrams(name)
+            self.names.append(name)
+            self._grams.append(grams)
+            self._exact[norm] = entry
+            for g in grams:
+                self.postings.setdefault(g, []).append(entry)
+        self._common = max(1000, len(self.names) // 20)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, min_score: float = MIN_SCORE) -> list:
+        """Best matches for `query` as [(name, score)], highest score first."""
+        norm = normalise_name(query)
+        if not norm:
+            return []
+        qgrams = trigrams(query)
+        results = {}
+        exact = self._exact.get(norm)
+        if exact is not None:
+            results[exact] = 1.0
+
+        lists = sorted((self.postings[g] for g in qgrams if g in self.postings), key=len)
+        rare  = [p for p in lists if len(p) <= self._common] or lists[:1]
+        counts = Counter()
+        for posting in rare:
+            counts.update(posting)
+
+        for entry, _ in counts.most_common(CANDIDATES):
+            if entry in results:
+                continue
+            grams  = self._grams[entry]
+            shared = len(qgrams & grams)
+            score  = 0.7 * shared / len(qgrams) + 0.3 * 2 * shared / (len(qgrams) + len(grams))
+            if score >= min_score:
+                results[entry] = round(score, 3)
+
+        ranked = sorted(results.items(), key=lambda kv: (-kv[1], self.names[kv[0]]))
+        return [(self.names[entry], score) for entry, score in ranked[:limit]]
+
+    def resolve(self, query: str, min_score: float = RESOLVE_SCORE) -> str:
+        """
+        The single best catalogue name for `query`, or None if nothing is close
+        enough or two entries are too close to call ("Philips" → HealthSuite
+        or IntelliSpace?).
+        """
+        best = self.search(query, limit=2, min_score=min_score)
+        if not best:
+            return None
+        if best[0][1] < 1.0 and len(best) > 1 and best[0][1] - best[1][1] < RESOLVE_MARGIN:
+            return None
+        return best[0][0]
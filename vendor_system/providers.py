@@ -0,0 +1,129 @@
+"""
+Scoring Providers
+==================
+Pluggable sources of raw vendor scores (0–10 per criterion).
+
+A provider implements one method:
+
+    score(vendor_name, criteria) -> {criterion: raw}
+
+Criteria missing from the result count as the scoring engine's default.
+CatalogueScoringProvider reads the vendor catalogue; slower backends such as
+Claude (claude_scoring.py) subclass ScoringProvider and set `concurrent = True`.
+Backends that can score several vendors per request also set `batch_size`
+and implement
+
+    score_many(vendor_names, criteria) -> {vendor_name: scores | Exception}
+
+evaluate() runs a longlist through a provider on a bounded thread pool —
+one task per vendor, or per chunk of `batch_size` vendors — and yields each
+result as soon as it completes, so callers can drive a progress bar in
+completion order rather than list order. Pass on_timing to have each
+provider call timed (e.g. into telemetry) on the thread that made it.
+
+Environment:
+    VENDOR_SCORING_WORKERS   max concurrent evaluations (default 8)
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_WORKERS = int(os.environ.get("VENDOR_SCORING_WORKERS", "8"))
+
+
+class ScoringProvider:
+    """Base class. `concurrent` marks providers worth running on a thread pool."""
+
+    name        = "base"
+    concurrent  = False
+    batch_size  = 1
+    fingerprint = ""        # anything besides the criteria that changes the scores
+
+    def score(self, vendor_name: str, criteria: dict) -> dict:
+        raise NotImplementedError
+
+    def score_many(self, vendor_names: list, criteria: dict) -> dict:
+        """{vendor_name: scores}, or the exception for vendors that could not be scored."""
+        results = {}
+        for name in vendor_names:
+            try:
+                results[name] = self.score(name, criteria)
+            except Exception as e:
+                results[name] = e
+        return results
+
+
+class CatalogueScoringProvider(ScoringProvider):
+    """
+    Scores from the vendor catalogue, matched on normalised vendor name. With a
+    NameIndex, names that miss ("Cerner") are fuzzy-resolved to a catalogue
+    entry before falling back to the default scores.
+    """
+
+    name = "catalogue"
+
+    def __init__(self, catalogue, index=None):
+        self.catalogue = catalogue
+        self.index     = index
+
+    def score(self, vendor_name: str, criteria: dict) -> dict:
+        scores = self.catalogue.scores(vendor_name)
+        if scores is None and self.index is not None:
+            match = self.index.resolve(vendor_name)
+            if match:
+                scores = self.catalogue.scores(match)
+                if scores:
+                    print(f"[Scoring] Matched {vendor_name!r} → {match!r}")
+        return scores or self.catalogue.default_scores()
+
+
+def evaluate(provider: ScoringProvider, vendor_names: list, criteria: dict,
+             max_workers: int = MAX_WORKERS, on_timing=None):
+    """
+    Score every vendor, yielding (vendor_name, scores, error) in completion order.
+    A failed evaluation yields scores={} and the exception, and never stops the
+    run; callers substitute their own defaults (the app uses the catalogue's).
+    on_timing(vendor_names, seconds, error), if given, is called after each
+    score() or score_many() call with the list of vendors it covered.
+    """
+    vendor_names = list(vendor_names)
+    size   = max(1, provider.batch_size)
+    chunks = [vendor_names[i:i + size] for i in range(0, len(vendor_names), size)]
+    if not provider.concurrent or max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _score_chunk(provider, chunk, criteria, on_timing)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                            thread_name_prefix="vendor-score") as pool:
+        futures = [pool.submit(_score_chunk, provider, chunk, criteria, on_timing) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def _score_chunk(provider, vendor_names, criteria, on_timing=None) -> list:
+    """[(vendor_name, scores, error)] for one score() or score_many() call."""
+    started = time.perf_counter()
+    error   = None
+    try:
+        if len(vendor_names) == 1 and provider.batch_size <= 1:
+            results = {vendor_names[0]: provider.score(vendor_names[0], criteria)}
+        else:
+            results = provider.score_many(vendor_names, criteria)
+    except Exception as e:
+        print(f"[Scoring] ⚠️  {provider.name} provider failed for {', '.join(vendor_names)}: {e}")
+        results, error = {}, e
+    if on_timing:
+        on_timing(vendor_names, time.perf_counter() - started, error)
+
+    rows = []
+    for name in vendor_names:
+        scores = results.get(name, error or KeyError(name))
+        if isinstance(scores, Exception):
+            if error is None:
+                print(f"[Scoring] ⚠️  {provider.name} provider failed for {name}: {scores}")
+            rows.append((name, {}, scores))
+        else:
+            rows.append((name, scores, None))
+    return rows
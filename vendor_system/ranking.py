@@ -0,0 +1,219 @@
+"""
+Incremental Ranking
+====================
+Keeps a ScoreMatrix ranked under a weight vector that changes one slider at
+a time.
+
+The unrounded weighted sums are cached. Changing one criterion's weight
+applies an O(n) delta — that criterion's raw column times the weight
+difference — instead of re-multiplying the whole matrix.
+
+Only the shortlist is kept sorted. After each change, a partial selection
+(np.partition) finds the top k rows (7 by default) in O(n) and sorts just
+those. The rest of the order is materialised lazily, as far as a page of the
+step 4 or step 5 grid reaches. Each extension partially selects the next
+chunk from the remaining rows, at least doubling what is already sorted.
+Only a caller that wants everything (order(), filtering, sorting by name)
+pays for a full sort. Rows are ordered
+by (total descending, longlist position), the same order a stable argsort
+gives, so ties are deterministic and identical on every rerun.
+
+With whole-number scores and weights the cached sums are exact integers, so
+totals after any number of deltas equal a fresh ScoreMatrix.totals(). With
+fractional inputs the totals are recomputed from the matrix after each
+change so rounding still matches exactly.
+
+Promoted vendors are pinned above the score order, most recent first. A
+promotion only moves a name within the pinned list. The shortlist then
+reads one row deeper into the sorted prefix, so no re-sort is needed.
+
+Usage:
+    ranking = Ranking(matrix, criteria)
+    ranking.update(criteria)        # after slider changes → changed criterion names
+    ranking.top()                   # shortlist names, best first
+    ranking.rows(start=7)           # lazy [{"name", "total", "rank"}] for everything after it
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from scoring import ScoreMatrix, whole_numbers
+
+SHORTLIST = 7
+
+
+class Ranking:
+    """Ranked view over a ScoreMatrix with O(n) per-criterion weight updates."""
+
+    def __init__(self, matrix: ScoreMatrix, weights, k: int = SHORTLIST):
+        self.matrix  = matrix
+        self.weights = self._aligned(weights)
+        self.k       = k
+        self.pinned  = []
+        self._sums   = matrix.raw @ np.array(self.weights, dtype=float)
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    # ── weights ───────────────────────────────────────────────
+    def update(self, weights) -> list:
+        """Apply a new weight vector (dict or aligned sequence). Returns changed criteria."""
+        changed = []
+        for j, new in enumerate(self._aligned(weights)):
+            old = self.weights[j]
+            if new != old:
+                self._sums += self.matrix.raw[:, j] * (new - old)
+                self.weights[j] = new
+                changed.append(self.matrix.criteria[j])
+        if changed:
+            self._refresh()
+        return changed
+
+    def set_weight(self, criterion: str, weight) -> bool:
+        weights = list(self.weights)
+        weights[self.matrix.criteria.index(criterion)] = weight
+        return bool(self.update(weights))
+
+    # ── overrides ─────────────────────────────────────────────
+    def promote(self, name: str):
+        """Pin `name` to the top of the ranking, above earlier promotions."""
+        if name in self.pinned:
+            self.pinned.remove(name)
+        self.pinned.insert(0, name)
+
+    # ── views ─────────────────────────────────────────────────
+    def totals(self) -> np.ndarray:
+        """Rounded totals by matrix row."""
+        return self._totals
+
+    def total(self, name: str) -> float:
+        return float(self._totals[self.matrix.index(name)])
+
+    def breakdown(self, name: str) -> dict:
+        return self.matrix.breakdown(name, self.weights)
+
+    def names(self, stop: int) -> list:
+        """The first `stop` vendor names, with pinned vendors ahead of the score order."""
+        pinned  = [n for n in self.pinned if n in self.matrix]
+        skip    = {self.matrix.index(n) for n in pinned}
+        vendors = self.matrix.vendors
+        rows    = self._score_rows(stop - len(pinned) + len(skip)) if stop > len(pinned) else []
+        return (pinned + [vendors[row] for row in rows if row not in skip])[:stop]
+
+    def top(self, k: int = None) -> list:
+        """The shortlist: the first k (default self.k) names."""
+        return self.names(self.k if k is None else k)
+
+    def order(self) -> list:
+        """Every vendor name, best first — materialises the whole order."""
+        return self.names(len(self))
+
+    def rows(self, start: int = 0) -> "RankedRows":
+        """Lazy [{"name", "total", "rank"}] from position `start` on."""
+        return RankedRows(self, start)
+
+    def ranked(self) -> list:
+        """Fresh [{"name", "total"}] rows in ranking order."""
+        return [{"name": name, "total": self.total(name)} for name in self.order()]
+
+    # ── pickling ──────────────────────────────────────────────
+    def __getstate__(self):
+        # The selection is a cache — leave it out so saved sessions stay small
+        # and unchanged by browsing the tail
+        state = dict(self.__dict__)
+        for key in ("_neg", "_prefix", "_rest"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._select()
+
+    # ── internals ─────────────────────────────────────────────
+    def _aligned(self, weights) -> list:
+        if isinstance(weights, dict):
+            return [weights[c]["weight"] if isinstance(weights[c], dict) else weights[c]
+                    for c in self.matrix.criteria]
+        return list(weights)
+
+    def _refresh(self):
+        if self.matrix.integral and whole_numbers(self.weights):
+            self._totals = np.round(self._sums / 10, 1)
+        else:
+            # Deltas on fractional sums drift; resync and replay the exact path
+            self._sums   = self.matrix.raw @ np.array(self.weights, dtype=float)
+            self._totals = self.matrix.totals(self.weights)
+        self._select()
+
+    def _select(self):
+        """Partial selection: the top k rows sorted, every other row left unordered."""
+        self._neg    = -self._totals
+        self._prefix = []
+        self._rest   = np.arange(len(self._neg))
+        self._score_rows(self.k)
+
+    def _score_rows(self, stop: int) -> list:
+        """Rows in score order, materialised at least `stop` deep."""
+        prefix = self._prefix
+        if stop > len(prefix) and len(self._rest):
+            want = max(stop - len(prefix), len(prefix), self.k, 1)
+            rows, self._rest = _top_rows(self._neg, self._rest, want)
+            prefix += rows
+        return prefix
+
+
+def _top_rows(neg: np.ndarray, rows: np.ndarray, m: int):
+    """
+    The m best of `rows` (ascending row numbers) sorted by (total desc, row),
+    and the remaining rows, still ascending. O(len(rows) + m log m).
+    """
+    if m >= len(rows):
+        return rows[np.lexsort((rows, neg[rows]))].tolist(), rows[:0]
+    values = neg[rows]
+    kth    = np.partition(values, m - 1)[m - 1]
+    above  = np.flatnonzero(values < kth)
+    ties   = np.flatnonzero(values == kth)[:m - len(above)]     # lowest rows win ties
+    keep   = np.concatenate([above, ties])
+    rest   = np.ones(len(rows), dtype=bool)
+    rest[keep] = False
+    top    = rows[keep]
+    return top[np.lexsort((top, neg[top]))].tolist(), rows[rest]
+
+
+class RankedRows(Sequence):
+    """
+    Read-only rows of a Ranking from position `start` on, for vendor_grid.
+    Indexing or slicing materialises the order only as deep as it reaches.
+    """
+
+    __slots__ = ("ranking", "start")
+
+    def __init__(self, ranking: Ranking, start: int = 0):
+        self.ranking = ranking
+        self.start   = start
+
+    def __len__(self) -> int:
+        return max(0, len(self.ranking) - self.start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(len(self))[index]
+            if not positions:
+                return []
+            stop = max(positions[0], positions[-1]) + 1
+            return [self._row(self.ranking.names(self.start + stop), p) for p in positions]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._row(self.ranking.names(self.start + index + 1), index)
+
+    def __iter__(self):
+        names = self.ranking.names(len(self.ranking))
+        return (self._row(names, p) for p in range(len(self)))
+
+    def _row(self, names: list, position: int) -> dict:
+        name = names[self.start + position]
+        return {"name": name, "total": self.ranking.total(name), "rank": self.start + position + 1}
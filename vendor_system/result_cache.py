@@ -0,0 +1,138 @@
+"""
+Result Cache
+=============
+Process-wide caches shared by every session:
+
+    discovery   category → discovered vendor list
+    scores      (vendor, criteria fingerprint, provider fingerprint) → raw scores
+
+Both behave like st.cache_data: values are copied on the way in and out, so
+a session appending to its discovered list never touches the shared entry.
+Entries expire after a TTL, the least recently used are evicted beyond a
+size bound, and everything tagged with an older catalogue version is
+dropped as soon as sync() sees the catalogue change.
+
+The scores key uses the criterion names and descriptions — not the weights,
+which only matter after scoring — so moving a slider reuses every cached
+score, while adding or renaming a criterion evaluates vendors afresh. The
+provider fingerprint keeps scores from different backends (or, for Claude,
+different restrictions) apart.
+
+Environment:
+    VENDORIQ_CACHE_TTL_SECONDS   entry lifetime (default 3600)
+    VENDORIQ_CACHE_MAX_SCORES    cached vendor score sets (default 50000)
+    VENDORIQ_CACHE_MAX_CATEGORIES  cached discovery lists (default 256)
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from catalogue import normalise_name
+
+TTL            = float(os.environ.get("VENDORIQ_CACHE_TTL_SECONDS", "3600"))
+MAX_SCORES     = int(os.environ.get("VENDORIQ_CACHE_MAX_SCORES", "50000"))
+MAX_CATEGORIES = int(os.environ.get("VENDORIQ_CACHE_MAX_CATEGORIES", "256"))
+
+
+def criteria_fingerprint(criteria: dict) -> str:
+    """Names and descriptions of the criteria, ignoring weights."""
+    material = sorted((name, (info or {}).get("desc", "")) for name, info in criteria.items())
+    return hashlib.sha256(json.dumps(material).encode("utf-8")).hexdigest()[:16]
+
+
+class TTLCache:
+    """Thread-safe LRU with a TTL, versioned so a catalogue change empties it."""
+
+    def __init__(self, max_entries: int, ttl: float = TTL):
+        self.max_entries = max_entries
+        self.ttl         = ttl
+        self.version     = None
+        self.hits        = 0
+        self.misses      = 0
+        self._entries    = OrderedDict()       # key -> (expires, value)
+        self._lock       = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, version) -> bool:
+        """Drop everything if the source version changed. True if it was invalidated."""
+        with self._lock:
+            if version == self.version:
+                return False
+            self.version = version
+            self._entries.clear()
+            return True
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class ResultCache:
+    """Discovery and score caches for one catalogue."""
+
+    def __init__(self, ttl: float = TTL, max_scores: int = MAX_SCORES,
+                 max_categories: int = MAX_CATEGORIES):
+        self.discovery = TTLCache(max_categories, ttl)
+        self.scores    = TTLCache(max_scores, ttl)
+
+    def sync(self, catalogue_version) -> bool:
+        invalidated = self.discovery.sync(catalogue_version)
+        return self.scores.sync(catalogue_version) or invalidated
+
+    # ── discovery ─────────────────────────────────────────────
+    def discover(self, category: str, fetch) -> list:
+        """Vendors for `category`, calling fetch(category) only on a miss."""
+        vendors = self.discovery.get(category)
+        if vendors is None:
+            vendors = fetch(category)
+            self.discovery.put(category, vendors)
+        return vendors
+
+    # ── scores ────────────────────────────────────────────────
+    def cached_scores(self, vendor_names, criteria: dict, provider: str = ""):
+        """Split a longlist into ({name: cached scores}, [names still to evaluate])."""
+        fingerprint = criteria_fingerprint(criteria)
+        hits, misses = {}, []
+        for name in vendor_names:
+            scores = self.scores.get((normalise_name(name), fingerprint, provider))
+            if scores is None:
+                misses.append(name)
+            else:
+                hits[name] = scores
+        return hits, misses
+
+    def store_scores(self, vendor_name: str, criteria: dict, scores: dict, provider: str = ""):
+        self.scores.put((normalise_name(vendor_name), criteria_fingerprint(criteria), provider), scores)
@@ -0,0 +1,121 @@
+"""
+Scored Results
+===============
+Column-oriented container for ranked vendor results.
+
+Instead of a list of dicts — each carrying a nested breakdown dict of dicts —
+a ScoredResults holds parallel columns:
+
+    names    list of vendor names, in ranking order
+    totals   float64 array of weighted totals
+    notes    {name: note} for the vendors that have one
+    weights  the weight vector the totals were computed with
+
+plus a reference to the shared ScoreMatrix, from which per-criterion
+breakdowns are derived on demand. Rows are read through VendorView, a
+two-slot read-only Mapping that behaves like the old dicts for rendering:
+v["name"], v["total"], v.get("note", ""), v["breakdown"]. Iterating a view
+(dict(v), {**v}) yields name, total and note only, so copying rows never
+builds breakdowns by accident.
+
+to_records() serialises the report column-wise for the JSON download.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+_FIELDS = ("name", "total", "note")     # "breakdown" is computed on access only
+
+
+class VendorView(Mapping):
+    """Read-only dict-like view of one row of a ScoredResults."""
+
+    __slots__ = ("_results", "_i")
+
+    def __init__(self, results: "ScoredResults", i: int):
+        self._results = results
+        self._i       = i
+
+    def __getitem__(self, field):
+        r, i = self._results, self._i
+        if field == "name":
+            return r.names[i]
+        if field == "total":
+            return float(r.totals[i])
+        if field == "note":
+            return r.notes.get(r.names[i], "")
+        if field == "breakdown":
+            return r.breakdown(i)
+        raise KeyError(field)
+
+    def __iter__(self):
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"VendorView({self['name']!r}, {self['total']})"
+
+
+class ScoredResults:
+    """Ranked vendors as parallel columns, with views instead of per-row dicts."""
+
+    __slots__ = ("names", "totals", "notes", "weights", "matrix")
+
+    def __init__(self, names, totals, matrix, weights, notes: dict = None):
+        self.names   = list(names)
+        self.totals  = np.asarray(totals, dtype=float)
+        self.matrix  = matrix
+        self.weights = tuple(weights)
+        self.notes   = dict(notes or {})
+
+    @classmethod
+    def from_ranking(cls, ranking, k: int = None) -> "ScoredResults":
+        """Snapshot of a Ranking — its first k rows (all by default), totals and weights."""
+        names = ranking.order() if k is None else ranking.top(k)
+        rows  = [ranking.matrix.index(n) for n in names]
+        return cls(names, ranking.totals()[rows], ranking.matrix, ranking.weights)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return (VendorView(self, i) for i in range(len(self.names)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(len(self.names))[index])
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError(index)
+        return VendorView(self, index)
+
+    def take(self, positions) -> "ScoredResults":
+        """A new ScoredResults with the rows at `positions`, sharing the matrix."""
+        positions = list(positions)
+        names = [self.names[p] for p in positions]
+        notes = {n: self.notes[n] for n in names if n in self.notes}
+        return ScoredResults(names, self.totals[positions], self.matrix, self.weights, notes)
+
+    def select(self, names, notes: dict = None) -> "ScoredResults":
+        """The rows for `names`, in that order, with notes attached (empty notes dropped)."""
+        index  = {n: i for i, n in enumerate(self.names)}
+        subset = self.take(index[n] for n in names)
+        chosen = set(subset.names)
+        subset.notes.update({n: note for n, note in (notes or {}).items() if note and n in chosen})
+        return subset
+
+    def breakdown(self, i: int) -> dict:
+        return self.matrix.breakdown(self.names[i], self.weights)
+
+    def to_records(self, breakdown: bool = True) -> list:
+        """Plain dicts for JSON: [{"name", "total", "note", "breakdown"}]."""
+        totals = self.totals.tolist()
+        return [
+            {"name": name, "total": total, "note": self.notes.get(name, ""),
+             **({"breakdown": self.breakdown(i)} if breakdown else {})}
+            for i, (name, total) in enumerate(zip(self.names, totals))
+        ]
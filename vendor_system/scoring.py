@@ -0,0 +1,137 @@
+"""
+Scoring Engine
+===============
+Holds raw vendor scores as a dense matrix — one row per vendor, one column
+per criterion — and computes every weighted total in a single NumPy
+matrix-vector product. Per-criterion breakdowns are built lazily, only for
+the vendors actually being displayed.
+
+Totals and breakdowns match the original per-vendor loop exactly:
+    weighted = (raw / 10) * weight        → breakdown rounded to 2 dp
+    total    = Σ weighted                 → rounded to 1 dp
+A criterion missing from a vendor's scores counts as DEFAULT_RAW.
+
+Usage:
+    matrix = ScoreMatrix(criteria.keys())
+    matrix.add("Epic Systems", {"HIPAA Compliance": 9, ...})
+    totals = matrix.totals(criteria)              # np.ndarray, one per vendor
+    detail = matrix.breakdown("Epic Systems", criteria)
+"""
+
+import numpy as np
+
+DEFAULT_RAW = 5
+
+# The app's starting criteria — weights are percentages totalling 100
+DEFAULT_CRITERIA = {
+    "HIPAA Compliance":     {"weight": 25, "desc": "Full HIPAA/HITECH compliance, BAA availability"},
+    "Data Security":        {"weight": 20, "desc": "Encryption, access controls, SOC2/ISO 27001"},
+    "EHR Integration":      {"weight": 15, "desc": "Epic, Cerner, Allscripts, HL7 FHIR"},
+    "Pricing & TCO":        {"weight": 15, "desc": "Transparent pricing, ROI potential"},
+    "Customer Support":     {"weight": 10, "desc": "24/7 healthcare-specific SLA"},
+    "Scalability":          {"weight": 10, "desc": "Growth & enterprise readiness"},
+    "Implementation Time":  {"weight": 5,  "desc": "Time to go-live & onboarding"},
+}
+
+
+class ScoreMatrix:
+    """Vendors × criteria raw-score matrix with vectorised weighted totals."""
+
+    def __init__(self, criteria):
+        self.criteria  = list(criteria)
+        self.vendors   = []
+        self._row      = {}
+        self._raw      = np.zeros((8, len(self.criteria)))
+        self._integral = True       # every raw score is a whole number
+
+    @classmethod
+    def from_scores(cls, criteria, scores: dict) -> "ScoreMatrix":
+        """Build from {vendor_name: {criterion: raw}}."""
+        matrix = cls(criteria)
+        for name, raw in scores.items():
+            matrix.add(name, raw)
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self.vendors)
+
+    def __contains__(self, name) -> bool:
+        return name in self._row
+
+    @property
+    def raw(self) -> np.ndarray:
+        """The live (n_vendors × n_criteria) block of the matrix."""
+        return self._raw[:len(self.vendors)]
+
+    def add(self, name: str, scores: dict) -> int:
+        """Insert or replace a vendor's raw scores. Returns its row index."""
+        row = self._row.get(name)
+        if row is None:
+            row = len(self.vendors)
+            if row == self._raw.shape[0]:
+                self._raw = np.concatenate([self._raw, np.zeros_like(self._raw)])
+            self.vendors.append(name)
+            self._row[name] = row
+        values = [scores.get(crit, DEFAULT_RAW) for crit in self.criteria]
+        self._raw[row] = values
+        self._integral = self._integral and all(float(v).is_integer() for v in values)
+        return row
+
+    @property
+    def integral(self) -> bool:
+        """True while every raw score is a whole number."""
+        return self._integral
+
+    def index(self, name: str) -> int:
+        return self._row[name]
+
+    # ── weighted scores ───────────────────────────────────────
+    def weights(self, criteria) -> np.ndarray:
+        """Weight vector aligned with self.criteria, from a criteria dict or a sequence."""
+        if isinstance(criteria, dict):
+            return np.array([criteria[c]["weight"] for c in self.criteria], dtype=float)
+        return np.asarray(criteria, dtype=float)
+
+    def totals(self, criteria) -> np.ndarray:
+        """Weighted total for every vendor, rounded to 1 dp."""
+        w = self.weights(criteria)
+        if self._integral and whole_numbers(w):
+            # Integer raw · weight products are exact, so D/10 rounds to the
+            # same double as the sequential Python sum did.
+            return np.round((self.raw @ w) / 10, 1)
+        # Fractional inputs: replay the original accumulation order exactly
+        total = np.zeros(len(self.vendors))
+        for j in range(len(self.criteria)):
+            total = total + (self.raw[:, j] / 10) * w[j]
+        return np.array([round(t, 1) for t in total.tolist()])
+
+    def total(self, name: str, criteria) -> float:
+        row = self._raw[self._row[name]]
+        total = 0
+        for j, w in enumerate(self._weight_list(criteria)):
+            total += (_num(row[j]) / 10) * w
+        return round(total, 1)
+
+    def breakdown(self, name: str, criteria) -> dict:
+        """{criterion: {"raw", "weight", "weighted"}} for one vendor."""
+        row = self._raw[self._row[name]]
+        out = {}
+        for j, (crit, w) in enumerate(zip(self.criteria, self._weight_list(criteria))):
+            raw = _num(row[j])
+            out[crit] = {"raw": raw, "weight": w, "weighted": round((raw / 10) * w, 2)}
+        return out
+
+    def _weight_list(self, criteria) -> list:
+        if isinstance(criteria, dict):
+            return [criteria[c]["weight"] for c in self.criteria]
+        return list(criteria)
+
+
+def _num(x):
+    """NumPy scalar → int when whole (so 9 displays as "9", not "9.0"), else float."""
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def whole_numbers(values) -> bool:
+    return all(float(x).is_integer() for x in values)
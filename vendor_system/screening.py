@@ -0,0 +1,184 @@
+"""
+Restriction Screening
+======================
+Turns the free-text hard restrictions from step 1 into predicates over
+structured vendor attributes, and screens a longlist before scoring.
+
+    result = screen(names, CATALOGUE.attributes(names), st.session_state.restrictions)
+    result.passed        vendors that go on to scoring
+    result.excluded      {vendor: [reason, ...]}
+    result.unverified    {vendor: [attribute label, ...]} — passed, but unknown
+    result.unparsed      restrictions no rule understood (review by hand)
+
+Restrictions are matched by regular expression, so "Must be HIPAA compliant
+with signed BAA" and "BAA required" both become hipaa_baa == True. One
+line can produce several requirements ("HIPAA and SOC 2"). Understood
+phrasings:
+
+    HIPAA / BAA / business associate      hipaa_baa is true
+    N+ years … experience / healthcare    healthcare_since at least N years ago
+    FHIR                                  fhir is true
+    FDA … warning                         fda_warning is false
+    SOC 2                                 soc2 is true
+    HITRUST                               hitrust is true
+    ONC certified / certified EHR         onc_certified is true
+
+Wording that waives or softens a requirement — "optional", "preferred",
+"not required" — is never compiled, and neither is any other negation
+("HIPAA not needed", "without SOC 2") unless the only rule it touches is
+the FDA one, which is negative by nature ("No vendors under active FDA
+warning letters"). Such lines land in `unparsed` for a person to read
+rather than turning a waiver into a disqualifier.
+
+A vendor with no value for an attribute is not excluded for it — it passes
+as unverified — unless `strict` is set, in which case unknown counts as a
+failure. Vendors added by hand have no attributes and so are only ever
+excluded in strict mode.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+
+class Requirement:
+    """One predicate over one attribute, derived from a restriction line."""
+
+    __slots__ = ("restriction", "attribute", "op", "value", "label")
+
+    def __init__(self, restriction: str, attribute: str, op: str, value, label: str):
+        self.restriction = restriction
+        self.attribute   = attribute
+        self.op          = op          # "is" or "years"
+        self.value       = value
+        self.label       = label
+
+    def check(self, attrs: dict, year: int):
+        """(True | False | None for unknown, reason when False)."""
+        actual = attrs.get(self.attribute)
+        if actual is None:
+            return None, None
+        if self.op == "years":
+            years = year - int(actual)
+            if years >= self.value:
+                return True, None
+            return False, f"{years} year{'s' if years != 1 else ''} in healthcare (needs {self.value}+)"
+        if bool(actual) == self.value:
+            return True, None
+        return False, _FAILURES[self.attribute]
+
+    def __repr__(self) -> str:
+        return f"Requirement({self.attribute} {self.op} {self.value!r})"
+
+
+# (pattern, attribute, op, value-or-group, label for unknowns)
+_RULES = [
+    (r"\bfda\b.*\bwarning|\bwarning letter",               "fda_warning",      "is",    False, "FDA warning status"),
+    (r"\bhipaa\b|\bbaa\b|business associate",              "hipaa_baa",        "is",    True,  "HIPAA BAA"),
+    (r"^(?=.*\b(?:experience|healthcare|health care|in business|track record)\b).*?"
+     r"(\d+)\s*\+?\s*(?:or more\s+)?(?:years?|yrs?)\b",
+                                                           "healthcare_since", "years", 1,     "years in healthcare"),
+    (r"\bfhir\b",                                          "fhir",             "is",    True,  "HL7 FHIR support"),
+    (r"\bsoc\s*-?\s*2\b",                                  "soc2",             "is",    True,  "SOC 2 report"),
+    (r"\bhitrust\b",                                       "hitrust",          "is",    True,  "HITRUST certification"),
+    (r"\bonc\b.*\bcertif|\bcertified (?:ehr|health it)\b", "onc_certified",    "is",    True,  "ONC certification"),
+]
+_COMPILED = [(re.compile(p, re.I), attr, op, value, label) for p, attr, op, value, label in _RULES]
+
+_SOFT     = re.compile(r"\b(?:optional|preferred|preferably|nice[- ]to[- ]have|desirable|ideally|"
+                       r"if possible|waived?|unnecessary|bonus)\b", re.I)
+_NEGATION = re.compile(r"\b(?:not|no|never|without|except|unless)\b|n't\b", re.I)
+
+_FAILURES = {
+    "fda_warning":   "Under an active FDA warning letter",
+    "hipaa_baa":     "No signed HIPAA BAA",
+    "fhir":          "No HL7 FHIR support",
+    "soc2":          "No SOC 2 report",
+    "hitrust":       "Not HITRUST certified",
+    "onc_certified": "Not ONC certified",
+}
+
+# The app's starting restrictions
+DEFAULT_RESTRICTIONS = [
+    "Must be HIPAA compliant with signed BAA",
+    "Must have 3+ years healthcare experience",
+    "Must support HL7 FHIR standards",
+    "No vendors under active FDA warning letters",
+]
+
+ATTRIBUTES = sorted({attr for _, attr, _, _, _ in _RULES})
+
+
+@lru_cache(maxsize=256)
+def _compile_line(line: str) -> tuple:
+    """Requirements for one line; () if none apply or the wording is soft or negated."""
+    if _SOFT.search(line):
+        return ()
+    found = {}
+    for pattern, attr, op, value, label in _COMPILED:
+        m = pattern.search(line)
+        if m and attr not in found:
+            found[attr] = Requirement(line, attr, op, int(m.group(1)) if op == "years" else value, label)
+    if _NEGATION.search(line) and set(found) - {"fda_warning"}:
+        return ()
+    return tuple(found.values())
+
+
+def compile_restrictions(restrictions) -> tuple:
+    """(requirements, unparsed restriction lines)."""
+    requirements, unparsed = [], []
+    for line in restrictions:
+        line = (line or "").strip()
+        if not line:
+            continue
+        found = _compile_line(line)
+        if found:
+            requirements += found
+        else:
+            unparsed.append(line)
+    return requirements, unparsed
+
+
+class ScreeningResult:
+    """Outcome of screening one longlist."""
+
+    __slots__ = ("passed", "excluded", "unverified", "unparsed")
+
+    def __init__(self, passed, excluded, unverified, unparsed):
+        self.passed     = passed
+        self.excluded   = excluded
+        self.unverified = unverified
+        self.unparsed   = unparsed
+
+    def excluded_records(self) -> list:
+        """[{"name", "reasons"}] — the shape kept in st.session_state.excluded."""
+        return [{"name": name, "reasons": reasons} for name, reasons in self.excluded.items()]
+
+
+def screen(vendor_names, attributes: dict, restrictions, strict: bool = False,
+           year: int = None) -> ScreeningResult:
+    """
+    Screen `vendor_names` against restriction lines. `attributes` maps vendor
+    name → {attribute: value}; vendors missing from it have no known attributes.
+    """
+    requirements, unparsed = compile_restrictions(restrictions)
+    year = year or date.today().year
+
+    passed, excluded, unverified = [], {}, {}
+    for name in vendor_names:
+        attrs, reasons, unknown = attributes.get(name) or {}, [], []
+        for req in requirements:
+            ok, reason = req.check(attrs, year)
+            if ok is None:
+                unknown.append(req.label)
+                if strict:
+                    reasons.append(f"Unknown {req.label} (strict screening)")
+            elif not ok:
+                reasons.append(reason)
+        if reasons:
+            excluded[name] = reasons
+        else:
+            passed.append(name)
+            if unknown:
+                unverified[name] = unknown
+    return ScreeningResult(passed, excluded, unverified, unparsed)
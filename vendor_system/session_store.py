@@ -0,0 +1,165 @@
+"""
+Session Store
+==============
+Server-side snapshots of the six-step workflow, so a session survives a
+reconnect or a pod restart and can be resumed by ID without re-running
+discovery or scoring.
+
+Each workflow key is stored as its own row — zlib-compressed pickle plus a
+digest of that blob. save() pickles the keys it is given, compares digests
+with what the store already holds for the session, and writes only the
+keys whose content changed; a step transition that only moves `step`
+writes one small row.
+
+Tables:
+    sessions       (id, created, updated, step)
+    session_keys   (session_id, key, digest, blob)  — primary key (session_id, key)
+
+Snapshots are pickles, and unpickling runs code, so the database must only
+be writable by the app's own user. The default location is a per-user
+directory in the system temp folder, created with mode 0700; the store
+refuses to use it if it is a symlink or belongs to another user. The
+database file itself is created with mode 0600 wherever it lives.
+
+Environment:
+    VENDORIQ_SESSION_DB         database path (default <tmp>/vendoriq-<uid>/sessions.db)
+    VENDORIQ_SESSION_TTL_DAYS   days an untouched session is kept (default 14)
+"""
+
+import os
+import re
+import stat
+import time
+import uuid
+import zlib
+import pickle
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+SESSION_DIR = os.path.join(tempfile.gettempdir(), f"vendoriq-{os.getuid() if hasattr(os, 'getuid') else 'user'}")
+DB_PATH     = os.environ.get("VENDORIQ_SESSION_DB", os.path.join(SESSION_DIR, "sessions.db"))
+TTL     = float(os.environ.get("VENDORIQ_SESSION_TTL_DAYS", "14")) * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id       TEXT    PRIMARY KEY,
+    created  REAL    NOT NULL,
+    updated  REAL    NOT NULL,
+    step     INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS session_keys (
+    session_id TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    digest     TEXT NOT NULL,
+    blob       BLOB NOT NULL,
+    PRIMARY KEY (session_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated);
+"""
+
+_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def valid_session_id(session_id) -> bool:
+    return isinstance(session_id, str) and bool(_ID_RE.match(session_id))
+
+
+def _private_dir(path: str):
+    """Create `path` readable by this user only; refuse it if someone else could have planted files."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+        raise RuntimeError(f"{path} is not a directory owned by this user — "
+                           "remove it or set VENDORIQ_SESSION_DB")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+
+
+def _encode(value) -> bytes:
+    return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+
+class SessionStore:
+    """Per-key, changed-only snapshots of session state in one SQLite file."""
+
+    def __init__(self, path: str = DB_PATH, ttl: float = TTL):
+        self.path  = path
+        self.ttl   = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory == SESSION_DIR:
+            _private_dir(directory)
+        elif directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not os.path.exists(path):
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def save(self, session_id: str, state, keys) -> int:
+        """Snapshot `keys` of `state` (any mapping). Returns the number of keys written."""
+        encoded = {}
+        for key in keys:
+            if key in state:
+                blob = _encode(state[key])
+                encoded[key] = (hashlib.blake2b(blob, digest_size=16).hexdigest(), blob)
+
+        now = time.time()
+        with self._lock, self._db:
+            stored = dict(self._db.execute(
+                "SELECT key, digest FROM session_keys WHERE session_id = ?", (session_id,)))
+            changed = [(session_id, k, d, b) for k, (d, b) in encoded.items() if stored.get(k) != d]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO session_keys (session_id, key, digest, blob) VALUES (?, ?, ?, ?)",
+                changed)
+            self._db.execute(
+                """INSERT INTO sessions (id, created, updated, step) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (id) DO UPDATE SET updated = excluded.updated, step = excluded.step""",
+                (session_id, now, now, int(state.get("step", 1))))
+        return len(changed)
+
+    def load(self, session_id: str) -> dict:
+        """{key: value} for a stored session, or None if unknown or expired."""
+        with self._lock:
+            row = self._db.execute("SELECT updated FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None or time.time() - row[0] > self.ttl:
+                return None
+            rows = self._db.execute(
+                "SELECT key, blob FROM session_keys WHERE session_id = ?", (session_id,)).fetchall()
+        state = {}
+        for key, blob in rows:
+            try:
+                state[key] = pickle.loads(zlib.decompress(blob))
+            except Exception as e:
+                print(f"[Session Store] ⚠️  Skipping unreadable key {key!r} in {session_id}: {e}")
+        return state
+
+    def exists(self, session_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT updated FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl
+
+    def delete(self, session_id: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM session_keys WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def prune(self) -> int:
+        """Drop sessions untouched for longer than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock, self._db:
+            expired = [r[0] for r in self._db.execute(
+                "SELECT id FROM sessions WHERE updated < ?", (cutoff,))]
+            self._db.executemany("DELETE FROM session_keys WHERE session_id = ?", [(i,) for i in expired])
+            self._db.executemany("DELETE FROM sessions WHERE id = ?", [(i,) for i in expired])
+        if expired:
+            print(f"[Session Store] Pruned {len(expired)} expired session(s)")
+        return len(expired)
@@ -0,0 +1,264 @@
+"""
+Ranking Snapshots
+==================
+Precomputed step-4 results for the configurations most sessions use.
+
+With the default criteria and restrictions, every session in a category
+screens and scores the same vendors and gets the same ranking. An offline
+job computes that once per category × weight vector × restriction set and
+writes all of them to one gzip-compressed JSON file:
+
+    python snapshots.py build                                   # defaults only
+    python snapshots.py build --weights heavy_security.json     # + another weight vector
+    python snapshots.py build --restrictions strict.txt --strict
+    python snapshots.py show "EHR / Electronic Health Records"
+
+Each snapshot records the configuration it was built for, the screened
+vendors in rank order with their totals, the raw score matrix (breakdowns
+are derived from it exactly as live scoring derives them) and the vendors
+screening excluded. The app loads the file once at startup and, in step 4,
+serves raw scores from a snapshot when the category, criteria, weights,
+restrictions, strict mode, scoring provider and catalogue contents all match,
+and every approved vendor is in it. Vendors the user unchecked in step 3 are
+simply left out, which leaves the rest in the same order. Anything else is
+scored live.
+
+Snapshots come from the catalogue scoring provider only. The file records
+the catalogue's content fingerprint (VendorCatalogue.fingerprint, a hash of
+every vendor, score and attribute), so snapshots are ignored by any app
+whose catalogue holds different data — after an import, or when built
+against another database.
+
+Environment:
+    VENDOR_SNAPSHOTS   snapshot file (default <tmp>/vendoriq_snapshots.json.gz)
+"""
+
+import os
+import sys
+import gzip
+import json
+import argparse
+import tempfile
+from datetime import datetime
+
+from scoring import ScoreMatrix, DEFAULT_CRITERIA
+from ranking import Ranking
+from catalogue import VendorCatalogue, DB_PATH
+from name_index import NameIndex
+from providers import CatalogueScoringProvider, evaluate
+from screening import screen, DEFAULT_RESTRICTIONS
+from result_cache import criteria_fingerprint
+
+SNAPSHOT_PATH = os.environ.get("VENDOR_SNAPSHOTS",
+                               os.path.join(tempfile.gettempdir(), "vendoriq_snapshots.json.gz"))
+FORMAT = 2
+
+
+def snapshot_key(category: str, criteria: dict, restrictions, strict: bool, provider: str) -> tuple:
+    """Everything that changes a ranking, as a hashable tuple."""
+    weights = tuple(sorted((name, float(info["weight"])) for name, info in criteria.items()))
+    return (category, criteria_fingerprint(criteria), weights,
+            tuple(sorted(r.strip() for r in restrictions if r.strip())), bool(strict), provider)
+
+
+class Snapshot:
+    """One precomputed ranking."""
+
+    __slots__ = ("category", "criteria", "restrictions", "strict", "provider",
+                 "vendors", "totals", "raw", "excluded", "_row")
+
+    def __init__(self, category, criteria, restrictions, strict, provider,
+                 vendors, totals, raw, excluded):
+        self.category     = category
+        self.criteria     = criteria
+        self.restrictions = list(restrictions)
+        self.strict       = strict
+        self.provider     = provider
+        self.vendors      = list(vendors)
+        self.totals       = list(totals)
+        self.raw          = raw
+        self.excluded     = excluded
+        self._row         = {name: i for i, name in enumerate(self.vendors)}
+
+    @property
+    def key(self) -> tuple:
+        return snapshot_key(self.category, self.criteria, self.restrictions, self.strict, self.provider)
+
+    def scores_for(self, vendor_names) -> dict:
+        """{name: {criterion: raw}} for `vendor_names`, or None if any is not in the snapshot."""
+        names = list(self.criteria)
+        scores = {}
+        for name in vendor_names:
+            row = self._row.get(name)
+            if row is None:
+                return None
+            scores[name] = dict(zip(names, self.raw[row]))
+        return scores
+
+    def to_json(self) -> dict:
+        return {"category": self.category, "criteria": self.criteria,
+                "restrictions": self.restrictions, "strict": self.strict, "provider": self.provider,
+                "vendors": self.vendors, "totals": self.totals, "raw": self.raw,
+                "excluded": self.excluded}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Snapshot":
+        return cls(data["category"], data["criteria"], data["restrictions"], data["strict"],
+                   data["provider"], data["vendors"], data["totals"], data["raw"], data["excluded"])
+
+
+class SnapshotStore:
+    """Every snapshot in one file, indexed by configuration."""
+
+    def __init__(self, snapshots=(), catalogue_fingerprint: str = None, created: str = ""):
+        self.catalogue_fingerprint = catalogue_fingerprint
+        self.created               = created
+        self._index                = {s.key: s for s in snapshots}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index.values())
+
+    def find(self, category: str, criteria: dict, restrictions, strict: bool,
+             provider: str, catalogue_fingerprint: str):
+        """The snapshot for this exact configuration and catalogue content, or None."""
+        if catalogue_fingerprint is None or catalogue_fingerprint != self.catalogue_fingerprint:
+            return None
+        return self._index.get(snapshot_key(category, criteria, restrictions, strict, provider))
+
+    # ── file ──────────────────────────────────────────────────
+    @classmethod
+    def load(cls, path: str = SNAPSHOT_PATH) -> "SnapshotStore":
+        """The snapshots in `path`; an empty store if it is missing or unreadable."""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != FORMAT:
+                raise ValueError(f"unknown snapshot format {data.get('format')!r}")
+            store = cls((Snapshot.from_json(s) for s in data["snapshots"]),
+                        data["catalogue_fingerprint"], data.get("created", ""))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Snapshots] ⚠️  Ignoring {path}: {e}")
+            return cls()
+        print(f"[Snapshots] Loaded {len(store)} ranking snapshots from {os.path.basename(path)}")
+        return store
+
+    def save(self, path: str = SNAPSHOT_PATH):
+        """Write atomically, so a running app never reads half a file."""
+        data = {"format": FORMAT, "catalogue_fingerprint": self.catalogue_fingerprint,
+                "created": self.created, "snapshots": [s.to_json() for s in self]}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+# ── BUILD ─────────────────────────────────────────────────────
+
+def build_snapshot(catalogue, provider, category: str, criteria: dict,
+                   restrictions, strict: bool = False) -> Snapshot:
+    """Discover, screen, score and rank one category the way steps 2–4 do."""
+    names  = [v["name"] for v in catalogue.vendors(category)]
+    result = screen(names, catalogue.attributes(names), restrictions, strict=strict)
+    raw    = {name: catalogue.default_scores() if error else scores
+              for name, scores, error in evaluate(provider, result.passed, criteria)}
+
+    matrix = ScoreMatrix(criteria)
+    for name in result.passed:
+        matrix.add(name, raw[name])
+    ranking = Ranking(matrix, criteria)
+    order   = ranking.order()
+    return Snapshot(category, criteria, restrictions, strict, provider.fingerprint or provider.name,
+                    order, [ranking.total(n) for n in order],
+                    [[_plain(x) for x in matrix.raw[matrix.index(n)]] for n in order],
+                    result.excluded_records())
+
+
+def build_snapshots(catalogue, weight_sets, restriction_sets, strict_modes=(False,),
+                    categories=None) -> SnapshotStore:
+    """Every category × weight vector × restriction set × strict mode."""
+    provider  = CatalogueScoringProvider(catalogue, NameIndex(catalogue.names()))
+    snapshots = [
+        build_snapshot(catalogue, provider, category, criteria, restrictions, strict)
+        for category in (categories or catalogue.categories())
+        for criteria in weight_sets
+        for restrictions in restriction_sets
+        for strict in strict_modes
+    ]
+    return SnapshotStore(snapshots, catalogue.fingerprint, datetime.now().isoformat(timespec="seconds"))
+
+
+def _plain(x):
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def _weight_set(path: str) -> dict:
+    """Default criteria with the weights from a {criterion: weight} JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        weights = json.load(f)
+    unknown = set(weights) - set(DEFAULT_CRITERIA)
+    if unknown:
+        raise ValueError(f"{path}: unknown criteria {', '.join(sorted(unknown))}")
+    criteria = {name: {**info, "weight": weights.get(name, info["weight"])}
+                for name, info in DEFAULT_CRITERIA.items()}
+    total = sum(info["weight"] for info in criteria.values())
+    if total != 100:
+        raise ValueError(f"{path}: weights total {total}, not 100")
+    return criteria
+
+
+def _restriction_set(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute VendorIQ ranking snapshots.")
+    parser.add_argument("--db",  default=DB_PATH,       help=f"catalogue database (default {DB_PATH})")
+    parser.add_argument("--out", default=SNAPSHOT_PATH, help=f"snapshot file (default {SNAPSHOT_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="rank every category under the default and given configurations")
+    build.add_argument("--weights", action="append", default=[], metavar="JSON",
+                       help="extra weight vector, {criterion: weight}; repeatable")
+    build.add_argument("--restrictions", action="append", default=[], metavar="TXT",
+                       help="extra restriction set, one per line; repeatable")
+    build.add_argument("--strict", action="store_true", help="also build strict-screening snapshots")
+    build.add_argument("--category", action="append", help="only these categories")
+    show = sub.add_parser("show", help="print the snapshots for a category")
+    show.add_argument("category")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        store = SnapshotStore.load(args.out)
+        for s in store:
+            if s.category != args.category:
+                continue
+            weights = ", ".join(f"{c} {info['weight']}" for c, info in s.criteria.items())
+            print(f"\n{s.category} — {weights}{' — strict' if s.strict else ''}")
+            for i, (name, total) in enumerate(zip(s.vendors, s.totals), 1):
+                print(f"  {i:>3}. {name:<40} {total}")
+            for e in s.excluded:
+                print(f"   ✗  {e['name']:<40} {'; '.join(e['reasons'])}")
+        return 0
+
+    catalogue = VendorCatalogue(args.db)
+    store = build_snapshots(
+        catalogue,
+        [DEFAULT_CRITERIA] + [_weight_set(p) for p in args.weights],
+        [DEFAULT_RESTRICTIONS] + [_restriction_set(p) for p in args.restrictions],
+        (False, True) if args.strict else (False,),
+        args.category)
+    store.save(args.out)
+    print(f"  ✅ {len(store)} snapshots for catalogue {store.catalogue_fingerprint} → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
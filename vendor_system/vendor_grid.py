@@ -0,0 +1,119 @@
+"""
+Vendor Grid
+============
+Paginated, filterable vendor list for the Streamlit steps.
+
+vendor_grid() runs as an st.fragment: typing a filter, changing the sort or
+turning a page reruns only the grid, not the whole script. Only the rows on
+the current page are handed to the caller's `render` function, so a
+longlist of hundreds of vendors still produces one page of elements.
+
+Selection lives in a Selection object — a set of names toggled away from a
+default — stored once in session_state, not in one widget key per vendor.
+Checkboxes are created only for visible rows and write back to the set.
+
+Usage:
+    sel = selection("longlist")
+    def render(rows, page_start):
+        for row in rows:
+            selection_checkbox(sel, row["name"], row["name"], key="longlist")
+    vendor_grid("longlist", rows, render, sorts={"Name": lambda r: r["name"].lower()})
+    approved = sel.selected(all_names)
+"""
+
+import streamlit as st
+
+PAGE_SIZE = 20
+
+
+class Selection:
+    """Membership = default, flipped for names in `toggled`."""
+
+    __slots__ = ("default", "toggled")
+
+    def __init__(self, default: bool = True):
+        self.default = default
+        self.toggled = set()
+
+    def __contains__(self, name) -> bool:
+        return (name in self.toggled) != self.default
+
+    def set(self, name: str, value: bool):
+        if value == self.default:
+            self.toggled.discard(name)
+        else:
+            self.toggled.add(name)
+
+    def selected(self, names) -> list:
+        return [n for n in names if n in self]
+
+    def count(self, names) -> int:
+        return sum(1 for n in names if n in self)
+
+
+def selection(key: str, default: bool = True) -> Selection:
+    """The Selection stored under `key`, created on first use."""
+    state_key = f"{key}_selection"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = Selection(default)
+    return st.session_state[state_key]
+
+
+def selection_checkbox(sel: Selection, name: str, label: str, key: str, **kwargs) -> bool:
+    """A checkbox for one visible row, bound to `sel` rather than to its own widget state."""
+    widget_key = f"{key}_chk_{name}"
+    return st.checkbox(label, value=name in sel, key=widget_key,
+                       on_change=lambda: sel.set(name, st.session_state[widget_key]), **kwargs)
+
+
+@st.fragment
+def vendor_grid(key: str, rows: list, render, sorts: dict = None,
+                page_size: int = PAGE_SIZE, fields=("name", "desc")):
+    """
+    Filter box, sort selector and pager around `render(page_rows, page_start)`.
+        rows    list of dicts; the filter matches any of `fields` case-insensitively
+        sorts   {label: key function}; the first entry is the default order,
+                None as a key function keeps the given row order
+    """
+    sorts = sorts or {"Default": None}
+    if len(rows) > page_size or len(sorts) > 1:
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            query = st.text_input("Filter vendors", key=f"{key}_query",
+                                  placeholder="Filter by name or description…",
+                                  label_visibility="collapsed")
+        with c2:
+            sort = st.selectbox("Sort", list(sorts), key=f"{key}_sort",
+                                label_visibility="collapsed")
+    else:
+        query, sort = "", next(iter(sorts))
+
+    visible = rows
+    needle  = query.strip().casefold()
+    if needle:
+        visible = [r for r in rows
+                   if any(needle in str(r.get(f, "")).casefold() for f in fields)]
+    if sorts.get(sort):
+        visible = sorted(visible, key=sorts[sort])
+
+    pages     = max(1, -(-len(visible) // page_size))
+    page_key  = f"{key}_page"
+    page      = min(st.session_state.get(page_key, 0), pages - 1)
+    start     = page * page_size
+    render(visible[start:start + page_size], start)
+
+    if pages > 1:
+        def turn(delta):
+            st.session_state[page_key] = page + delta
+
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c1:
+            st.button("‹ Prev", key=f"{key}_prev", disabled=page == 0, on_click=turn, args=(-1,))
+        with c2:
+            st.markdown(f"<div style='text-align:center; font-size:0.8rem; color:#6b7a87; padding-top:0.5rem;'>"
+                        f"Page {page + 1} of {pages} · {len(visible)} vendors</div>", unsafe_allow_html=True)
+        with c3:
+            st.button("Next ›", key=f"{key}_next", disabled=page >= pages - 1, on_click=turn, args=(1,))
+    elif needle:
+        st.markdown(f"<div style='font-size:0.8rem; color:#6b7a87;'>{len(visible)} of {len(rows)} vendors match</div>",
+                    unsafe_allow_html=True)